@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+CSV 파싱 처리량 벤치마크 (행/초): 관용 경로 vs 고속 경로
+    python benchmarks/bench_parse.py                # 합성 200,000행 × 포맷 3종
+    python benchmarks/bench_parse.py --rows 1000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from wholesale.data import read_one_csv_fast, read_one_csv_tolerant  # noqa: E402
+
+FORMATS = {
+    "일자/평균가 (YYYY-MM-DD, 정수)":   ("일자,평균가", "%Y-%m-%d", lambda v: f"{v}"),
+    "일자/평균가 (YYYY/MM/DD, 1,234원)": ("일자,평균가", "%Y/%m/%d", lambda v: f"\"{v:,}원\""),
+    "구분/평균 (YYYY.MM.DD, 정수)":     ("구분,평균",   "%Y.%m.%d", lambda v: f"{v}"),
+}
+
+
+def make_csv(path: Path, n_rows: int, header: str, date_fmt: str, fmt_val, seed=42):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("1990-01-01", periods=n_rows, freq="D").strftime(date_fmt)
+    vals = rng.integers(1_000, 80_000, size=n_rows)
+    with open(path, "w", encoding="utf-8-sig") as f:
+        f.write(header + "\n")
+        f.writelines(f"{d},{fmt_val(int(v))}\n" for d, v in zip(dates, vals))
+
+
+def best_of(fn, path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn(path)
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    print(f"{'포맷':<36}{'관용(행/초)':>14}{'고속(행/초)':>14}{'배율':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (header, date_fmt, fmt_val) in FORMATS.items():
+            path = Path(tmp) / "bench.csv"
+            make_csv(path, args.rows, header, date_fmt, fmt_val)
+            t_slow, ref = best_of(read_one_csv_tolerant, path, args.repeat)
+            t_fast, out = best_of(read_one_csv_fast, path, args.repeat)
+            if out is None:
+                raise SystemExit(f"[{name}] 고속 경로가 폴백했습니다.")
+            pd.testing.assert_frame_equal(out, ref)
+            print(f"{name:<36}{args.rows / t_slow:>14,.0f}{args.rows / t_fast:>14,.0f}{t_slow / t_fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
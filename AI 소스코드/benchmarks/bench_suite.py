@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 벤치마크 (수집 → 피처 → 학습 → 순차 예측 → 백테스트), asv 방식
+- 벤치마크 = setup(시간 제외) + 본체(best-of-repeat 측정) + 파라미터 목록
+- 입력: 합성 시계열 5/20/50년, 합성 시장 시계열 1~500개, (있으면) 동봉 품목 데이터
+- 결과: benchmarks/results/{커밋}.json → --compare 로 커밋 간 회귀 확인
+
+    python benchmarks/bench_suite.py                     # 전체
+    python benchmarks/bench_suite.py --quick -k features # 작은 파라미터만, 이름 필터
+    python benchmarks/bench_suite.py --compare results/abc1234.json results/def5678.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from wholesale.config import FORECAST_END, FORECAST_START, TARGET_COL, XGB_PARAMS  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+YEARS       = (5, 20, 50)
+MARKETS     = (1, 50, 500)
+FIT_ROUNDS  = 300      # fit 벤치마크는 조기종료 없이 고정 라운드 (시간 비교용)
+REGRESSION  = 1.2      # --compare: 이 배율 이상 느려지면 회귀로 표시
+
+
+# =======================
+# 합성 데이터
+# =======================
+def synthetic_series(years, seed=0, end=FORECAST_START - pd.Timedelta(days=1), gap=0.15) -> pd.DataFrame:
+    """end 까지 years 년 일별 가격 (연 계절성 + 추세 + 잡음, 휴장일 결측 gap 비율) → 연말까지 일 단위 달력."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end - pd.DateOffset(years=years) + pd.Timedelta(days=1), end, freq="D")
+    t = np.arange(len(dates))
+    y = 20_000 + 5*t + 4_000*np.sin(2*np.pi*t/365.25 + rng.uniform(0, 6)) + rng.normal(0, 800, len(t)).cumsum()*0.05
+    y = np.maximum(y + rng.normal(0, 500, len(t)), 1_000).round()
+    y[rng.random(len(t)) < gap] = np.nan
+    cal = pd.date_range(dates[0], FORECAST_END, freq="D")
+    return pd.DataFrame({"date": cal, TARGET_COL: pd.Series(y, index=dates).reindex(cal).to_numpy()})
+
+
+def write_csv(path, raw: pd.DataFrame):
+    obs = raw.dropna()
+    with open(path, "w", encoding="utf-8-sig") as f:
+        f.write(f"일자,{TARGET_COL}\n")
+        f.writelines(f"{d},{int(v)}\n" for d, v in zip(obs["date"].dt.strftime("%Y-%m-%d"), obs[TARGET_COL]))
+
+
+# =======================
+# 벤치마크 정의: (이름, 파라미터, setup(p) → ctx, run(ctx))
+# =======================
+def _ingest_one(years):
+    tmp = Path(tempfile.mkdtemp())
+    path, raw = tmp / "series.csv", synthetic_series(years)
+    write_csv(path, raw)
+    return {"path": path, "rows": int(raw[TARGET_COL].notna().sum())}
+
+
+def _run_ingest_one(ctx):
+    from wholesale.data import read_one_csv
+    read_one_csv(ctx["path"])
+
+
+def _ingest_markets(n):
+    tmp = Path(tempfile.mkdtemp())
+    paths = []
+    for i in range(n):
+        p = tmp / f"market_{i:03d}.csv"
+        write_csv(p, synthetic_series(1, seed=i))
+        paths.append(p)
+    return {"paths": paths, "rows": 365 * n}
+
+
+def _run_ingest_markets(ctx):
+    from wholesale.data import read_csvs
+    read_csvs(ctx["paths"], TARGET_COL, cache_dir=None)
+
+
+def _run_merge_markets(ctx):
+    from wholesale.data import merge_frames, read_csvs
+    merge_frames(read_csvs(ctx["paths"], TARGET_COL, cache_dir=None))
+
+
+def _run_merge_markets_arrow(ctx):
+    from wholesale.arrow_engine import merge_tables, read_tables
+    merge_tables(read_tables(ctx["paths"], TARGET_COL))
+
+
+def _ingest_panel(n):
+    # 시장 n개 파일 × 등급 2개 (시장/품목/단위/등급 컬럼) → 시계열 2n개
+    tmp = Path(tempfile.mkdtemp())
+    paths, rows = [], 0
+    for i in range(n):
+        obs = [synthetic_series(1, seed=2 * i + g).dropna() for g in range(2)]
+        rows += sum(len(o) for o in obs)
+        p = tmp / f"market_{i:03d}.csv"
+        with open(p, "w", encoding="utf-8-sig") as f:
+            f.write(f"일자,시장,품목,단위,등급,{TARGET_COL}\n")
+            for g, o in zip("상중", obs):
+                f.writelines(f"{d},시장{i:03d},합성,20kg,{g},{int(v)}\n"
+                             for d, v in zip(o["date"].dt.strftime("%Y-%m-%d"), o[TARGET_COL]))
+        paths.append(p)
+    return {"paths": paths, "rows": rows}
+
+
+def _run_ingest_panel(ctx):
+    from wholesale.panel import merge_panel, read_panel_csv
+    merge_panel([read_panel_csv(p) for p in ctx["paths"]])
+
+
+def _run_ingest_panel_arrow(ctx):
+    from wholesale.arrow_engine import merge_panel_tables, read_tables
+    from wholesale.panel import PANEL_KEYS
+    merge_panel_tables(read_tables(ctx["paths"], TARGET_COL, list(PANEL_KEYS)))
+
+
+def _features(years):
+    raw = synthetic_series(years)
+    return {"raw": raw, "rows": len(raw)}
+
+
+def _run_features(ctx):
+    from wholesale.features import build_features
+    build_features(ctx["raw"], TARGET_COL)
+
+
+def _run_features_level(ctx):
+    # 가격 단위 그룹(랙/EMA/롤링/차분)만 — pandas 경로 (features.kernel 과 같은 출력)
+    from wholesale.features import _steps
+    s = pd.DataFrame(index=ctx["raw"].index)
+    for name, step in _steps(False, False)[3:]:
+        step(s, ctx["raw"][TARGET_COL])
+
+
+def _run_features_kernel(ctx):
+    from wholesale.feature_kernels import level_features
+    level_features(ctx["raw"][TARGET_COL].to_numpy())
+
+
+def _features_markets(n):
+    raws = [synthetic_series(2, seed=i) for i in range(n)]
+    return {"raws": raws, "rows": sum(len(r) for r in raws)}
+
+
+def _run_features_markets(ctx):
+    from wholesale.features import build_features
+    for raw in ctx["raws"]:
+        build_features(raw, TARGET_COL)
+
+
+def synthetic_panel(n, years=2):
+    """시장 n개 × 등급 2개 (n 은 시계열 수, 홀수면 마지막 시장은 1등급) → merge_panel 결과."""
+    from wholesale.panel import merge_panel
+    frames = []
+    for i in range(n):
+        obs = synthetic_series(years, seed=i).dropna()
+        frames.append(pd.DataFrame({"시장": f"시장{i // 2:04d}", "품목": "합성", "단위": "20kg",
+                                    "등급": "상" if i % 2 == 0 else "중", "date": obs["date"],
+                                    TARGET_COL: obs[TARGET_COL]}))
+    return merge_panel(frames)
+
+
+def _features_panel(n):
+    panel = synthetic_panel(n)
+    return {"panel": panel, "rows": len(panel.raw)}
+
+
+def _run_features_panel(ctx):
+    from wholesale.panel import panel_matrix
+    panel_matrix(ctx["panel"])
+
+
+def _forecast_panel(n):
+    import xgboost as xgb
+    from wholesale.panel import panel_matrix
+    panel = synthetic_panel(n)
+    fm = panel_matrix(panel)
+    model = xgb.XGBRegressor(**dict(XGB_PARAMS, n_estimators=50)).fit(fm.X, fm.y, verbose=False)
+    return {"panel": panel, "model": model, "cols": fm.cols, "fill": pd.Series(np.median(fm.X, axis=0), fm.cols),
+            "rows": panel.n * ((FORECAST_END - FORECAST_START).days + 1)}
+
+
+def _run_forecast_panel(ctx):
+    from wholesale.panel import panel_forecast
+    panel_forecast(ctx["model"], ctx["panel"], ctx["cols"], ctx["fill"])
+
+
+def _fit(years):
+    from wholesale.features import build_features, feature_columns
+
+    feat = build_features(synthetic_series(years), TARGET_COL)
+    cols = feature_columns(feat, TARGET_COL)
+    lab = feat[feat["y"].notna()].dropna(subset=cols)
+    return {"X": lab[cols], "y": lab["y"], "cols": cols, "feat": feat, "rows": len(lab)}
+
+
+def _run_fit(ctx):
+    import xgboost as xgb
+    params = dict(XGB_PARAMS, n_estimators=FIT_ROUNDS)
+    ctx["model"] = xgb.XGBRegressor(**params).fit(ctx["X"], ctx["y"], verbose=False)
+
+
+def _fit_matrix(years):
+    from wholesale.matrix import FeatureMatrix
+    ctx = _fit(years)
+    fm = FeatureMatrix.from_features(ctx["feat"], ctx["cols"])   # 저메모리 모드: float32 연속 행렬
+    return {"X": fm.X, "y": fm.y, "rows": len(fm.y)}
+
+
+def _forecast(years):
+    ctx = _fit(years)
+    _run_fit(ctx)
+    ctx["fill"] = ctx["X"].median()
+    ctx["raw"] = ctx["feat"][["date", "y"]].rename(columns={"y": TARGET_COL})
+    ctx["rows"] = (FORECAST_END - FORECAST_START).days + 1
+    return ctx
+
+
+def _run_forecast(ctx):
+    from wholesale.forecast import recursive_forecast_force
+    recursive_forecast_force(ctx["model"], ctx["raw"], FORECAST_START, FORECAST_END, ctx["cols"], ctx["fill"])
+
+
+def _backtest(years):
+    ctx = _fit(years)
+    ctx["out"] = Path(tempfile.mkdtemp())
+    return ctx
+
+
+def _run_backtest(ctx):
+    import matplotlib
+    matplotlib.use("Agg")
+    from wholesale.config import COMMODITIES
+    from wholesale.pipeline import backtest_21_23_to_24
+    backtest_21_23_to_24(ctx["feat"], ctx["cols"], COMMODITIES["양파"], ctx["out"], show=False)
+
+
+def _bundled(name):
+    from wholesale.config import ARCHIVE_DIR, get_commodity
+    cfg = get_commodity(name)
+    if not (ROOT / cfg.data_dir).is_dir() and not (ROOT / ARCHIVE_DIR / cfg.archive).exists():
+        return None   # 데이터 없음 → 건너뜀
+    return {"cfg": cfg}
+
+
+def _run_bundled(ctx):
+    from wholesale.archive import load_commodity_raw
+    from wholesale.config import ARCHIVE_DIR
+    raw = load_commodity_raw(ctx["cfg"], ROOT, ROOT / ARCHIVE_DIR, FORECAST_END, TARGET_COL, cache_dir=None)
+    ctx["rows"] = int(raw[TARGET_COL].notna().sum())
+
+
+BENCHMARKS = [
+    # 이름,                     파라미터,                   setup,              본체,                   repeat
+    ("ingest.read_one_csv",     YEARS,                      _ingest_one,        _run_ingest_one,        5),
+    ("ingest.read_csvs",        MARKETS,                    _ingest_markets,    _run_ingest_markets,    3),
+    ("ingest.merge",            MARKETS,                    _ingest_markets,    _run_merge_markets,     3),
+    ("ingest.merge_arrow",      MARKETS,                    _ingest_markets,    _run_merge_markets_arrow, 3),
+    ("ingest.panel",            MARKETS,                    _ingest_panel,      _run_ingest_panel,      3),
+    ("ingest.panel_arrow",      MARKETS,                    _ingest_panel,      _run_ingest_panel_arrow, 3),
+    ("ingest.bundled",          ("감자", "배추", "양파"),   _bundled,           _run_bundled,           3),
+    ("features.build_features", YEARS,                      _features,          _run_features,          5),
+    ("features.level",          YEARS,                      _features,          _run_features_level,    5),
+    ("features.kernel",         YEARS,                      _features,          _run_features_kernel,   5),
+    ("features.markets",        MARKETS,                    _features_markets,  _run_features_markets,  3),
+    ("features.panel",          MARKETS,                    _features_panel,    _run_features_panel,    3),
+    ("fit.xgb_regressor",       YEARS,                      _fit,               _run_fit,               2),
+    ("fit.xgb_matrix",          YEARS,                      _fit_matrix,        _run_fit,               2),
+    ("forecast.recursive",      YEARS,                      _forecast,          _run_forecast,          5),
+    ("forecast.panel",          MARKETS,                    _forecast_panel,    _run_forecast_panel,    2),
+    ("backtest.21_23_to_24",    (5,),                       _backtest,          _run_backtest,          1),
+]
+QUICK = {"ingest.read_one_csv": (5,), "ingest.read_csvs": (1, 50), "ingest.merge": (1, 50), "ingest.merge_arrow": (1, 50),
+         "ingest.panel": (1, 50), "ingest.panel_arrow": (1, 50), "ingest.bundled": ("양파",),
+         "features.build_features": (5,), "features.level": (5,), "features.kernel": (5,),
+         "features.markets": (1, 50), "features.panel": (1, 50), "fit.xgb_regressor": (5,), "fit.xgb_matrix": (5,),
+         "forecast.recursive": (5,), "forecast.panel": (1, 50)}
+
+
+# =======================
+# 실행/저장/비교
+# =======================
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _version(module):
+    try:
+        return __import__(module).__version__
+    except ImportError:
+        return None
+
+
+def environment() -> dict:
+    import xgboost as xgb
+    from wholesale.feature_kernels import backend_name
+    return {"commit": _commit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "numpy": np.__version__, "pandas": pd.__version__, "xgboost": xgb.__version__,
+            "feature_kernel": backend_name(), "pyarrow": _version("pyarrow"),
+            "machine": platform.machine(), "cpu_count": os.cpu_count()}
+
+
+def run(select=None, quick=False, repeat=None) -> list:
+    results = []
+    for name, params, setup, body, n_rep in BENCHMARKS:
+        if select and not any(s in name for s in select):
+            continue
+        for p in (QUICK.get(name, ()) if quick else params):
+            ctx = setup(p)
+            if ctx is None:
+                print(f"{name}[{p}]  (데이터 없음 → 건너뜀)")
+                continue
+            times = []
+            for _ in range(repeat or n_rep):
+                t0 = time.perf_counter()
+                body(ctx)
+                times.append(time.perf_counter() - t0)
+            rec = {"name": name, "param": p, "best": min(times), "mean": float(np.mean(times)),
+                   "repeat": len(times), "rows": ctx.get("rows")}
+            rate = f"  {rec['rows'] / rec['best']:>12,.0f} 행/s" if rec["rows"] else ""
+            print(f"{name}[{p}]".ljust(34) + f"{rec['best'] * 1e3:>10.1f} ms{rate}")
+            results.append(rec)
+    return results
+
+
+def compare(base_path, new_path, threshold=REGRESSION) -> int:
+    """두 결과 JSON 의 best 시간 비교. 회귀(threshold 배 이상 느려짐)가 있으면 1."""
+    base, new = (json.loads(Path(p).read_text(encoding="utf-8")) for p in (base_path, new_path))
+    old = {(r["name"], str(r["param"])): r for r in base["results"]}
+    print(f"기준 {base['env']['commit']} → 비교 {new['env']['commit']}")
+    bad = 0
+    for r in new["results"]:
+        o = old.get((r["name"], str(r["param"])))
+        if o is None:
+            continue
+        ratio = r["best"] / o["best"]
+        flag = "  ← 회귀" if ratio >= threshold else "  (개선)" if ratio <= 1 / threshold else ""
+        bad += ratio >= threshold
+        print(f"{r['name']}[{r['param']}]".ljust(34) + f"{o['best'] * 1e3:>10.1f} → {r['best'] * 1e3:>10.1f} ms"
+              f"  ×{ratio:.2f}{flag}")
+    return 1 if bad else 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="단계별 벤치마크")
+    ap.add_argument("-k", dest="select", action="append", help="이름에 포함된 벤치마크만 (여러 번 지정 가능)")
+    ap.add_argument("--quick", action="store_true", help="작은 파라미터만")
+    ap.add_argument("--repeat", type=int, default=None, help="반복 횟수 덮어쓰기")
+    ap.add_argument("--out", default=None, help="결과 JSON 경로 (기본: benchmarks/results/{커밋}.json)")
+    ap.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="결과 JSON 2개 비교")
+    args = ap.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare)
+    env = environment()
+    results = run(args.select, args.quick, args.repeat)
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{env['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"env": env, "results": results}, ensure_ascii=False, indent=1), encoding="utf-8")
+    print(f"[저장] {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+공용 픽스처
+- synthetic_raw: 결측 구간/0 가격/상수 구간이 섞인 일 단위 시계열 (merge_frames 결과와 같은 형태)
+- bundled_raw  : 동봉 원본(zip)의 양파 시계열 — 없으면 해당 테스트 건너뜀
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from wholesale.config import FORECAST_END, TARGET_COL  # noqa: E402
+
+
+def make_raw(n=900, seed=0, start="2021-01-01") -> pd.DataFrame:
+    """정수 가격 + 휴장일 결측 + 긴 결측 구간 + 0 가격 + 상수 구간."""
+    rng = np.random.default_rng(seed)
+    y = np.maximum(20_000 + np.cumsum(rng.normal(0, 300, n)), 1_000).round()
+    y[rng.random(n) < 0.2] = np.nan
+    y[:3] = np.nan
+    y[100:130] = np.nan          # 긴 결측 구간
+    y[200:203] = 0.0             # 0 가격 → 수익률 분모 0
+    y[300:320] = 18_000.0        # 상수 구간 → rstd 0
+    return pd.DataFrame({"date": pd.date_range(start, periods=n, freq="D"), TARGET_COL: y})
+
+
+@pytest.fixture
+def synthetic_raw():
+    return make_raw()
+
+
+@pytest.fixture(scope="session")
+def bundled_raw():
+    from wholesale.archive import load_commodity_raw
+    from wholesale.config import ARCHIVE_DIR, get_commodity
+    cfg = get_commodity("양파")
+    if not (ROOT / cfg.data_dir).is_dir() and not (ROOT / ARCHIVE_DIR / cfg.archive).exists():
+        pytest.skip("동봉 데이터 없음")
+    return load_commodity_raw(cfg, ROOT, ROOT / ARCHIVE_DIR, FORECAST_END, TARGET_COL)
+
+
+def assert_features_close(a: pd.DataFrame, b: pd.DataFrame, scale: float, rtol=1e-9):
+    """
+    같은 컬럼·결측 위치, 값은 rtol 이내.
+    rstd_* 만 상수 창에서 pandas 온라인 갱신 잔차를 허용 (가격 수준 × 1e-6)
+    """
+    assert list(a.columns) == list(b.columns)
+    for c in a.columns:
+        x, y = a[c].to_numpy(dtype=float), b[c].to_numpy(dtype=float)
+        np.testing.assert_array_equal(np.isnan(x), np.isnan(y), err_msg=c)
+        atol = 1e-6 * scale if c.startswith("rstd_") else 1e-9 * scale
+        np.testing.assert_allclose(x, y, rtol=rtol, atol=atol, equal_nan=True, err_msg=c)
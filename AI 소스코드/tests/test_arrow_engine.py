@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""arrow 실행 경로 == pandas 경로 (병합/패널 병합/피처) — 잘못된 날짜·가격, 빈 키, 키 없는 파일, 중복 포함."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from wholesale.arrow_engine import (_date_expr, _source_node, check_parity, merge_panel_tables,  # noqa: E402
+                                    merge_tables, read_table)
+from wholesale.config import TARGET_COL, get_commodity  # noqa: E402
+from wholesale.data import merge_frames, read_one_csv  # noqa: E402
+from wholesale.panel import PANEL_KEYS, merge_panel, read_panel_csv  # noqa: E402
+
+# 키 있는 파일: 없는 날짜(02-30, 13월), 숫자 아닌 가격, 빈 키, 같은 키·일자 중복(평균)
+KEYED = """시장,품목,단위,등급,일자,평균가
+가락,양파,kg,상,2024.01.02,"1,200원"
+가락,양파,kg,상,2024.01.02,1400
+가락,양파,kg,상,2024-01-03,1300
+가락,양파,kg,상,2024.02.30,99999
+가락,양파,kg,상,2024.13.01,99999
+가락,양파,kg,중,2024/01/02,900
+가락,양파,kg,중,2024.01.05,abc
+가락,양파,kg,중,2024.01.06,
+,양파,kg,상,2024.01.04,1100
+강서,양파, ,상,2024.02.28,1500
+강서,양파,망,상,2024.1.9,1600
+"""
+# 키 없는 파일: 앞 파일과 겹치는 일자(앞 파일 우선) + 2019(기간 밖)
+PLAIN = """일자,평균가
+2024.01.02,5000
+2024.01.10,1700
+2024.02.29,1800
+2024.03.01,
+2019.12.31,100
+"""
+
+
+@pytest.fixture
+def data_root(tmp_path):
+    d = tmp_path / get_commodity("양파").data_dir
+    d.mkdir(parents=True)
+    (d / "a.csv").write_text(KEYED, encoding="utf-8")
+    (d / "b.csv").write_text(PLAIN, encoding="utf-8")
+    return tmp_path
+
+
+def _paths(root):
+    return sorted((root / get_commodity("양파").data_dir).glob("*.csv"))
+
+
+def test_date_expr_rejects_rollover():
+    t = pa.table({"d": ["2024.02.30", "2024.1.5", "2024.13.01", "2023.02.29", "2024-02-29", "2024/04/31",
+                        " 2024.01.05 ", "", None]})
+    from pyarrow import acero as ac
+    out = ac.Declaration.from_sequence([_source_node(t), ac.Declaration(
+        "project", ac.ProjectNodeOptions([_date_expr()], ["date"]))]).to_table()["date"].to_pylist()
+    assert [str(v) if v else None for v in out] == [None, "2024-01-05", None, None, "2024-02-29", None,
+                                                     "2024-01-05", None, None]
+
+
+def test_merge_tables_matches_merge_frames(data_root):
+    paths = _paths(data_root)
+    a = merge_frames([read_one_csv(p) for p in paths])
+    b = merge_tables([read_table(p, TARGET_COL) for p in paths])
+    pd.testing.assert_frame_equal(a, b)
+    s = b.set_index("date")[TARGET_COL]
+    assert np.isnan(s["2024-03-01"]) and (s.dropna() < 99999).all()
+    assert s["2024-01-02"] == pytest.approx(3500 / 3)   # 앞 파일(a)의 같은 일자 평균, b 의 5000 은 버림
+
+
+def test_merge_panel_tables_matches_merge_panel(data_root):
+    paths = _paths(data_root)
+    a = merge_panel([read_panel_csv(p) for p in paths])
+    b = merge_panel_tables([read_table(p, TARGET_COL, list(PANEL_KEYS)) for p in paths])
+    pd.testing.assert_frame_equal(a.series, b.series)
+    pd.testing.assert_frame_equal(a.raw, b.raw)
+    assert len(a.series) == 6   # 빈 키 → "전체" (2개), 키 없는 파일 → 전체 시계열 1개
+
+
+@pytest.mark.parametrize("use_yoy", [False, True])
+def test_check_parity(data_root, use_yoy):
+    res = check_parity("양파", data_root=data_root, archive_dir=data_root, panel=True, use_yoy=use_yoy)
+    diffs = {k: v for k, v in res.items() if k not in ("name", "seconds", "ok")}
+    assert set(diffs) == {"raw", "features", "rstd", "panel_series", "panel_raw"}
+    assert res["ok"], diffs
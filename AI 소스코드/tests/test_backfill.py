@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""백필 기본 원점: last_label 산출물(학습 이후 실측 없음)은 검증 구간부터."""
+
+import pandas as pd
+import pytest
+from conftest import make_raw
+
+from wholesale import backfill
+from wholesale.artifacts import data_fingerprint, save_artifact
+from wholesale.config import TARGET_COL, get_commodity
+from wholesale.features import build_features, feature_columns
+from wholesale.pipeline import compute_fill_values, fit_model, sample_weights, split_train_valid, training_window
+
+
+@pytest.fixture
+def last_label_artifact(tmp_path, monkeypatch):
+    cfg = get_commodity("양파")
+    assert cfg.split == "last_label"
+    raw = make_raw()
+    raw[TARGET_COL] = raw[TARGET_COL].replace(0.0, float("nan"))   # 0 가격 → ret inf 는 학습 입력에서 제외
+    feat = build_features(raw, TARGET_COL, ffill=cfg.ffill)
+    cols = feature_columns(feat, TARGET_COL)
+    train, valid = split_train_valid(feat, cols, cfg)
+    model = fit_model(train[cols], train["y"], sample_weights(train["date"], cfg.dw_periods), valid[cols], valid["y"],
+                      try_gpu=False, n_jobs=1, params={"n_estimators": 20})
+    window = training_window(train["date"], valid["date"])
+    save_artifact(tmp_path, cfg, model, cols, compute_fill_values(train[cols], cols), data_fingerprint(raw, TARGET_COL),
+                  residuals=valid["y"].to_numpy() - model.predict(valid[cols]),
+                  data_end=str(raw.loc[raw[TARGET_COL].notna(), "date"].max().date()), **window)
+    monkeypatch.setattr(backfill, "load_commodity_raw", lambda *a, **k: raw)
+    return cfg, raw, window
+
+
+def test_default_window_falls_back_to_validation(last_label_artifact, tmp_path, capsys):
+    cfg, raw, window = last_label_artifact
+    assert pd.Timestamp(window["train_end"]) < pd.Timestamp(window["valid_start"])
+    curve = backfill.run_backfill(cfg, out_dir=tmp_path, model_dir=tmp_path, horizon=14, plot=False)
+    assert not curve.empty and curve["horizon"].max() == 14
+    preds = pd.read_csv(tmp_path / f"backfill_{cfg.pref}_preds.csv", parse_dates=["origin"])
+    assert preds["origin"].min() == pd.Timestamp(window["valid_start"])
+    assert preds["origin"].max() == raw.loc[raw[TARGET_COL].notna(), "date"].max()
+    assert "검증 구간" in capsys.readouterr().out
+
+
+def test_default_window_after_update(last_label_artifact, tmp_path):
+    # 증분 갱신 후: train_end = 마지막 실측일 → 검증 구간부터
+    import json
+    cfg, raw, window = last_label_artifact
+    meta_path = tmp_path / cfg.pref / "meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["train_end"] = meta["data_end"]
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    backfill.run_backfill(cfg, out_dir=tmp_path, model_dir=tmp_path, horizon=7, plot=False)
+    preds = pd.read_csv(tmp_path / f"backfill_{cfg.pref}_preds.csv", parse_dates=["origin"])
+    assert preds["origin"].min() == pd.Timestamp(window["valid_start"])
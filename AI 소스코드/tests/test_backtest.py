@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""워크포워드: 폴드별 예측 == 같은 모델의 recursive_forecast_force (1스텝은 실측 입력 예측과 같음)."""
+
+import numpy as np
+import pandas as pd
+from conftest import make_raw
+
+import wholesale.pipeline as pipeline
+from wholesale import backtest
+from wholesale.config import TARGET_COL, get_commodity
+from wholesale.features import build_features, feature_columns
+from wholesale.forecast import recursive_forecast_force
+
+
+def test_walk_forward_is_recursive(monkeypatch):
+    raw = make_raw()
+    feat = build_features(raw, TARGET_COL, backend="pandas")
+    cols = feature_columns(feat, TARGET_COL)
+    cfg = get_commodity("양파")
+    models = []
+    fit = pipeline.fit_model
+    monkeypatch.setattr(pipeline, "fit_model", lambda *a, **k: models.append(fit(*a, **k)) or models[-1])
+
+    origins, horizon = pd.DatetimeIndex(["2023-02-01", "2023-04-01"]), 21
+    table, folds, preds = backtest.walk_forward(feat, cols, cfg, origins=origins, horizon=horizon,
+                                                workers=1, threads=1, params={"n_estimators": 20})
+    assert len(folds) == 2 and table["horizon"].iloc[-1] == "전체"
+
+    first = preds[preds["horizon"] == 1]
+    np.testing.assert_allclose(first["pred"], first["pred_onestep"], rtol=1e-6)
+
+    lab = feat[feat["y"].notna()].dropna(subset=cols + ["y"]).reset_index(drop=True)
+    for model, fold in zip(models, backtest.make_folds(lab["date"], origins, horizon)):
+        o = fold["origin"]
+        fill = pipeline.compute_fill_values(lab.loc[fold["train"], cols], cols)
+        ref = recursive_forecast_force(model, raw, o, o + pd.Timedelta(days=horizon - 1), cols, fill,
+                                       use_yoy=False, ffill=cfg.ffill).set_index("date")["pred"]
+        g = preds[preds["origin"] == o]
+        np.testing.assert_allclose(g["pred"].to_numpy(), ref.reindex(g["date"]).to_numpy(), rtol=1e-6)
+        assert not np.allclose(g["pred"], g["pred_onestep"])
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""CSV 파싱: 고속 경로 == 관용 경로 (스키마/날짜 구분자/가격 표기/잘못된 행), 폴백 조건."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from wholesale.config import TARGET_COL
+from wholesale.data import (merge_frames, parse_dates_fast, parse_dates_tolerant, parse_prices_fast,
+                            parse_prices_tolerant, read_one_csv, read_one_csv_fast, read_one_csv_tolerant)
+
+CSV_BASIC = (
+    "﻿일자,평균가\n"
+    "2024.01.02,\"1,234원\"\n"
+    "2024-01-03,1500\n"
+    "2024/01/04,1600원\n"
+    "2024.01.04,1800\n"          # 같은 일자 → 평균
+    "2024.02.30,999\n"           # 없는 날짜 → NaT
+    ",\n"
+    "2024.01.05,\n"
+)
+CSV_OLD = "구분,평균\n2023.12.30,2000\n2023.12.31,\"2,100\"\n"
+
+
+def _bytes(text):
+    return text.encode("utf-8")
+
+
+@pytest.mark.parametrize("text", [CSV_BASIC, CSV_OLD])
+def test_fast_matches_tolerant(text):
+    fast = read_one_csv_fast(_bytes(text))
+    assert fast is not None
+    pd.testing.assert_frame_equal(fast, read_one_csv_tolerant(_bytes(text)))
+
+
+def test_basic_values():
+    out = read_one_csv(_bytes(CSV_BASIC))
+    assert out["date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert out[TARGET_COL].tolist() == [1234.0, 1500.0, 1700.0]
+
+
+@pytest.mark.parametrize("text", [
+    "일자,평균가\n2024.1.5,1000\n2024.01.06,1100\n",      # 10자가 아닌 날짜
+    "일자,평균가\n2024.01.05,1000.5\n2024.01.06,1100\n",  # 소수점 가격
+    "일자,평균가\n2024년01월05일,1000\n",                 # 구분자 아닌 문자
+])
+def test_fast_falls_back(text):
+    assert read_one_csv_fast(_bytes(text)) is None
+    pd.testing.assert_frame_equal(read_one_csv(_bytes(text)), read_one_csv_tolerant(_bytes(text)))
+
+
+def test_parsers_elementwise():
+    dates = pd.Series(["2024.01.31", "2024-02-29", "2023/02/29", "2024.13.01", "", None, "2024.04.31"])
+    fast = parse_dates_fast(dates)
+    tol = parse_dates_tolerant(dates)
+    np.testing.assert_array_equal(pd.isna(fast), tol.isna().to_numpy())
+    np.testing.assert_array_equal(pd.Series(fast)[tol.notna().to_numpy()].to_numpy(), tol.dropna().to_numpy())
+
+    prices = pd.Series(["1,234", "1234원", "", None, "0", "12,345,678원"])
+    np.testing.assert_array_equal(parse_prices_fast(prices), parse_prices_tolerant(prices).to_numpy())
+    assert parse_prices_fast(pd.Series(["12.5"])) is None
+
+
+def test_merge_frames_calendar():
+    a = read_one_csv(_bytes("일자,평균가\n2020.01.01,100\n2020.01.03,300\n"))
+    b = read_one_csv(_bytes("일자,평균가\n2020.01.03,999\n2019.12.31,50\n"))   # 중복은 앞 파일, 2019 는 제외
+    out = merge_frames([a, b], end_date=pd.Timestamp("2020-01-05"))
+    assert len(out) == 5
+    np.testing.assert_array_equal(out[TARGET_COL].to_numpy(), [100, np.nan, 300, np.nan, np.nan])
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""가격 단위 커널 (NumPy / 루프 / numba JIT) == pandas 경로 — 결측 구간, 0 가격(수익률 분모 0 → inf/NaN) 포함."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import assert_features_close, make_raw
+
+from wholesale import feature_kernels as fk
+from wholesale.config import TARGET_COL
+from wholesale.feature_state import EMA_SPANS, LAGS, WINDOWS, YOY_LAGS
+from wholesale.features import build_features
+
+
+def _raw():
+    raw = make_raw()
+    raw.loc[203, TARGET_COL] = 19_000.0   # 0 다음 양수 → ret_1 = +inf
+    raw.loc[566, TARGET_COL] = 19_000.0   # 366일 전이 0 → yoy_ratio = +inf
+    return raw
+
+
+def _run(kind, y, use_yoy):
+    out = np.empty((len(y), len(fk.kernel_columns(use_yoy))))
+    if kind == "numpy":
+        fk._fused_numpy(y, out, use_yoy)
+    else:
+        loop = fk._fused_loop if kind == "loop" else fk._fused_jit
+        loop(y, out, np.array(LAGS), np.array(WINDOWS), np.array(EMA_SPANS, dtype=float), np.array(YOY_LAGS), use_yoy)
+    return out
+
+
+KINDS = ["numpy", "loop", pytest.param("numba", marks=pytest.mark.skipif(fk.numba is None, reason="numba 없음"))]
+
+
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.parametrize("ffill", [False, True])
+@pytest.mark.parametrize("use_yoy", [False, True])
+def test_kernel_matches_pandas(kind, use_yoy, ffill):
+    raw = _raw()
+    ref = build_features(raw, TARGET_COL, use_yoy=use_yoy, ffill=ffill, backend="pandas")
+    cols = fk.kernel_columns(use_yoy)
+    y = raw[TARGET_COL].to_numpy(dtype=float)
+    got = _run(kind, fk._ffill(y) if ffill else y, use_yoy)
+
+    exp = ref[cols].astype(float)
+    assert_features_close(exp, pd.DataFrame(got, columns=cols), scale=20_000)
+    if not ffill:   # 분모 0 분기가 실제로 검사됐는지
+        assert np.isposinf(exp["ret_1"]).any() and exp["ret_1"].isna().any()
+        if use_yoy:
+            assert np.isposinf(exp["yoy_ratio"]).any()
+
+
+@pytest.mark.parametrize("use_yoy", [False, True])
+def test_numpy_backend_matches_pandas(use_yoy):
+    raw = _raw()
+    a = build_features(raw, TARGET_COL, use_yoy=use_yoy, ffill=True, backend="pandas")
+    b = build_features(raw, TARGET_COL, use_yoy=use_yoy, ffill=True, backend="numpy")
+    assert list(a.columns) == list(b.columns)
+    num = [c for c in a.columns if c != "date"]
+    assert_features_close(a[num].astype(float), b[num].astype(float), scale=20_000)
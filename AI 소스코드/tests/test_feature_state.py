@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""FeatureState 의 행 == build_features 의 같은 일자 행 (결측/ffill/YoY 포함)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import assert_features_close
+
+from wholesale.config import TARGET_COL
+from wholesale.feature_state import FeatureState
+from wholesale.features import build_features, feature_columns
+
+
+def _state_rows(raw, cols, use_yoy, ffill) -> pd.DataFrame:
+    """첫 일자부터 하루씩 push 하며 매일의 피처 행을 모음."""
+    st = FeatureState(raw["date"].iloc[0], raw["date"].iloc[0], use_yoy=use_yoy, ffill=ffill)
+    rows = []
+    for v in raw[TARGET_COL].to_numpy(dtype=float):
+        rows.append(st.matrix(cols)[0])
+        st.push(v)
+    return pd.DataFrame(np.vstack(rows), columns=cols)
+
+
+@pytest.mark.parametrize("ffill", [False, True])
+@pytest.mark.parametrize("use_yoy", [False, True])
+def test_state_matches_build_features(synthetic_raw, use_yoy, ffill):
+    feat = build_features(synthetic_raw, TARGET_COL, use_yoy=use_yoy, ffill=ffill, backend="pandas")
+    cols = feature_columns(feat, TARGET_COL)
+    got = _state_rows(synthetic_raw, cols, use_yoy, ffill)
+    assert_features_close(feat[cols].astype(float), got, scale=20_000)
+
+
+@pytest.mark.parametrize("ffill", [False, True])
+def test_state_matches_build_features_bundled(bundled_raw, ffill):
+    raw = bundled_raw[bundled_raw["date"] < "2025-09-13"].reset_index(drop=True)
+    feat = build_features(raw, TARGET_COL, ffill=ffill, backend="pandas")
+    cols = feature_columns(feat, TARGET_COL)
+    got = _state_rows(raw, cols, False, ffill)
+    assert_features_close(feat[cols].astype(float), got, scale=float(np.nanmax(raw[TARGET_COL])))
+
+
+def test_from_history_continues_series(synthetic_raw):
+    # 앞부분으로 만든 상태의 다음 행 == 전체 피처의 해당 행
+    feat = build_features(synthetic_raw, TARGET_COL, ffill=True, backend="pandas")
+    cols = feature_columns(feat, TARGET_COL)
+    p = 500
+    st = FeatureState.from_history(synthetic_raw["date"].iloc[:p], synthetic_raw[TARGET_COL].iloc[:p], ffill=True)
+    np.testing.assert_allclose(st.matrix(cols)[0], feat[cols].iloc[p].to_numpy(dtype=float), rtol=1e-9, atol=1e-5)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""패널: 그룹 피처 == 시계열별 build_features, 예측 시작 후에 시작한 시계열은 제외."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import assert_features_close, make_raw
+
+from wholesale.config import TARGET_COL
+from wholesale.features import build_features, feature_columns
+from wholesale.forecast import history_state
+from wholesale.panel import PANEL_KEYS, active_series, build_panel_features, merge_panel, panel_forecast, panel_state
+
+# (시장, 품목, 단위, 등급, 시작일, 일수)
+SERIES = [("가락", "양파", "kg", "상", "2021-01-01", 900),
+          ("가락", "양파", "kg", "중", "2021-03-15", 800),
+          ("강서", "양파", "망", "상", "2022-02-01", 500),
+          ("강서", "양파", "망", "중", "2023-06-10", 40)]   # 예측 시작(2023-05-01) 이후 시작
+END = pd.Timestamp("2023-07-19")
+
+
+def _panel():
+    frames = []
+    for i, (*keys, start, n) in enumerate(SERIES):
+        raw = make_raw(n=n, seed=i, start=start).dropna(subset=[TARGET_COL])
+        frames.append(raw.assign(**dict(zip(PANEL_KEYS, keys))))
+    return merge_panel(frames, end_date=END)
+
+
+def _series_raw(panel, sid):
+    return panel.raw.loc[panel.raw["sid"] == sid, ["date", TARGET_COL]].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("ffill", [False, True])
+@pytest.mark.parametrize("use_yoy", [False, True])
+def test_panel_features_match_per_series(use_yoy, ffill):
+    panel = _panel()
+    feat = build_panel_features(panel, TARGET_COL, use_yoy, ffill)
+    assert set(PANEL_KEYS[k] for k in panel.id_keys) == {"market_id", "unit_id", "grade_id"}
+    for sid in range(panel.n):
+        one = build_features(_series_raw(panel, sid), TARGET_COL, use_yoy=use_yoy, ffill=ffill, backend="pandas")
+        cols = feature_columns(one, TARGET_COL)
+        got = feat.loc[feat["sid"] == sid, cols].reset_index(drop=True)
+        assert_features_close(one[cols].astype(float), got.astype(float), scale=20_000)
+
+
+def test_panel_state_skips_late_series():
+    panel = _panel()
+    start = pd.Timestamp("2023-05-01")
+    sids = active_series(panel, start)
+    assert list(sids) == [0, 1, 2]
+
+    state = panel_state(panel, start, TARGET_COL, False, True)
+    cols = feature_columns(build_features(_series_raw(panel, 0), TARGET_COL, ffill=True), TARGET_COL)
+    for j, sid in enumerate(sids):
+        ref = history_state(_series_raw(panel, sid), start, TARGET_COL, False, True)
+        np.testing.assert_allclose(state.matrix(cols)[j], ref.matrix(cols)[0], rtol=1e-9, atol=1e-4)
+
+    class _Mean:
+        def predict(self, X):
+            return np.full(len(X), 20_000.0)
+
+    out = panel_forecast(_Mean(), panel, cols + [PANEL_KEYS[k] for k in panel.id_keys], None, start,
+                         start + pd.Timedelta(days=9), TARGET_COL, False, True)
+    assert len(out) == 10 * 3
+    assert set(out["등급"] + out["시장"]) == {"상가락", "중가락", "상강서"}
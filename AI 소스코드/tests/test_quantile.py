@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""분위 구간: 표본 외 잔차 분위 부스터가 점 예측 경로를 감싸는지, 산출물 왕복, 구간 이탈 집계."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import make_raw
+
+from wholesale.artifacts import data_fingerprint, load_artifact, save_artifact
+from wholesale.config import TARGET_COL, get_commodity
+from wholesale.features import build_features, feature_columns
+from wholesale.forecast import band_outside, history_state, quantile_columns, recursive_forecast_force
+from wholesale.pipeline import (compute_fill_values, fit_model, fit_quantile_model, interval_coverage, oof_residuals,
+                                sample_weights, split_train_valid)
+
+QS = (0.1, 0.5, 0.9)
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    cfg = get_commodity("양파")
+    raw = make_raw()
+    raw[TARGET_COL] = raw[TARGET_COL].replace(0.0, float("nan"))
+    feat = build_features(raw, TARGET_COL, ffill=cfg.ffill)
+    cols = feature_columns(feat, TARGET_COL)
+    train, valid = split_train_valid(feat, cols, cfg)
+    w = sample_weights(train["date"], cfg.dw_periods)
+    params = {"n_estimators": 200, "learning_rate": 0.1, "max_depth": 4}
+    model = fit_model(train[cols], train["y"], w, valid[cols], valid["y"], try_gpu=False, n_jobs=1, params=params)
+    qmodel = fit_quantile_model(model, train[cols], train["y"], w, valid[cols], valid["y"], QS, try_gpu=False,
+                                n_jobs=1, params=params)
+    return cfg, raw, train, valid, cols, model, qmodel
+
+
+def test_oof_residuals_out_of_sample(fitted):
+    cfg, raw, train, valid, cols, model, _ = fitted
+    r = oof_residuals(model, train[cols], train["y"], np.ones(len(train)), folds=4, n_jobs=1)
+    first = len(train) // 5
+    assert np.isnan(r[:first]).all() and not np.isnan(r[first + 1:]).any()
+    in_sample = train["y"].to_numpy() - model.predict(train[cols])
+    assert np.nanstd(r) > np.std(in_sample)      # 학습 잔차보다 넓음 → 구간이 퇴화하지 않음
+
+
+def test_band_brackets_point_path(fitted, tmp_path):
+    cfg, raw, train, valid, cols, model, qmodel = fitted
+    assert qmodel.residual_
+    cov, cov_pred = interval_coverage(qmodel, model, valid[cols], valid["y"], QS)
+    assert cov_pred == 1.0 and 0.0 < cov <= 1.0
+
+    fill = compute_fill_values(train[cols], cols)
+    base = raw[["date", TARGET_COL]]
+    start = raw["date"].max() + pd.Timedelta(days=1)
+    end = start + pd.Timedelta(days=29)
+
+    def _forecast(m, qm):
+        return recursive_forecast_force(m, base, start, end, cols, fill, ffill=cfg.ffill, quantile_model=qm,
+                                        quantiles=QS, state=history_state(base, start, TARGET_COL, ffill=cfg.ffill))
+
+    out = _forecast(model, qmodel)
+    lo, _, hi = quantile_columns(QS)
+    assert (out[lo] <= out["pred"]).all() and (out["pred"] <= out[hi]).all()
+    assert band_outside(out, QS) == 0
+    assert out[lo].std() > 0
+
+    # 산출물 왕복: residual_ 플래그 유지 → 같은 구간
+    save_artifact(tmp_path, cfg, model, cols, fill, data_fingerprint(raw, TARGET_COL), quantile_model=qmodel,
+                  quantiles=QS)
+    art = load_artifact(tmp_path, cfg)
+    assert art.meta["quantile_target"] == "residual" and art.quantile_model.residual_
+    pd.testing.assert_frame_equal(_forecast(art.model, art.quantile_model), out, rtol=1e-5)
+
+
+def test_band_outside_counts():
+    df = pd.DataFrame({"pred": [5.0, 1.0, 9.0], "pred_p10": [4.0, 2.0, 4.0], "pred_p50": [5.0, 3.0, 5.0],
+                       "pred_p90": [6.0, 4.0, 8.0]})
+    assert band_outside(df, QS) == 2
+    assert band_outside(df[["pred"]], QS) == 0
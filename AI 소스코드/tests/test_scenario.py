@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""시나리오 밴드: 부트스트랩 잔차 중심화 → 1스텝 분포가 순차 점 예측 주변."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import make_raw
+
+from wholesale.config import TARGET_COL, get_commodity
+from wholesale.features import build_features, feature_columns
+from wholesale.forecast import history_state, recursive_forecast_force
+from wholesale.pipeline import compute_fill_values, fit_model, sample_weights, split_train_valid
+from wholesale.scenario import simulate_paths
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    cfg = get_commodity("양파")
+    raw = make_raw()
+    raw[TARGET_COL] = raw[TARGET_COL].replace(0.0, float("nan"))
+    feat = build_features(raw, TARGET_COL, ffill=cfg.ffill)
+    cols = feature_columns(feat, TARGET_COL)
+    train, valid = split_train_valid(feat, cols, cfg)
+    model = fit_model(train[cols], train["y"], sample_weights(train["date"], cfg.dw_periods), valid[cols], valid["y"],
+                      try_gpu=False, n_jobs=1, params={"n_estimators": 100, "learning_rate": 0.1})
+    base = raw[["date", TARGET_COL]]
+    start = raw["date"].max() + pd.Timedelta(days=1)
+    return cfg, base, start, cols, compute_fill_values(train[cols], cols), model
+
+
+def _paths(fitted, residuals, days=3, n_paths=4000):
+    cfg, base, start, cols, fill, model = fitted
+    state = history_state(base, start, TARGET_COL, ffill=cfg.ffill)
+    return simulate_paths(model, state, start + pd.Timedelta(days=days - 1), cols, fill, residuals=residuals,
+                          n_paths=n_paths)[1]
+
+
+def test_step1_centered_on_point_forecast(fitted):
+    cfg, base, start, cols, fill, model = fitted
+    point = recursive_forecast_force(model, base, start, start, cols, fill, ffill=cfg.ffill)["pred"].iloc[0]
+    r = np.random.default_rng(0).normal(0.0, 300.0, 500)
+    r -= r.mean()
+    step1 = _paths(fitted, r)[0]
+    assert abs(step1.mean() - point) < 4 * 300.0 / np.sqrt(len(step1))
+    assert abs(np.median(step1) - point) < 60.0
+
+
+def test_biased_residuals_are_centered(fitted):
+    r = np.random.default_rng(1).normal(0.0, 300.0, 500)
+    np.testing.assert_allclose(_paths(fitted, r - 1600.0), _paths(fitted, r))   # 검증 편향은 밴드를 밀지 않음
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""예측 API: reload 와 겹친 캐시 저장, HEAD 헤더, 잘못된 Content-Length."""
+
+import asyncio
+
+from wholesale.serve import ForecastAPI, ForecastStore, ResponseCache, _handle
+
+
+class _Writer:
+    def __init__(self):
+        self.data = b""
+        self.closed = False
+
+    def write(self, b):
+        self.data += b
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _exchange(api, request: bytes) -> bytes:
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(request)
+        reader.feed_eof()
+        w = _Writer()
+        await _handle(api, reader, w)
+        return w.data
+    return asyncio.run(run())
+
+
+def _api():
+    store = ForecastStore(["양파"])
+    store.entries["양파"] = {"error": "산출물 없음"}
+    return ForecastAPI(store)
+
+
+def _split(resp: bytes):
+    head, _, body = resp.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    return lines[0], {k.lower(): v.strip() for k, _, v in (l.partition(":") for l in lines[1:])}, body
+
+
+def test_stale_put_after_clear_is_dropped():
+    cache = ResponseCache()
+    gen = cache.generation          # 요청이 보관소를 읽기 시작
+    cache.clear()                   # 그 사이 reload
+    etag, body = cache.put("k", b"old", gen)
+    assert body == b"old" and cache.get("k") is None
+    cache.put("k", b"new", cache.generation)
+    assert cache.get("k")[1] == b"new"
+
+
+def test_reload_during_get_does_not_cache_old_body(monkeypatch):
+    api = _api()
+    body = api.commodities_body
+
+    def slow_body():
+        out = body()
+        api.store.entries["양파"] = {"error": "다시 읽음"}
+        api.cache.clear()           # reload 가 본문 생성 중에 끝남
+        return out
+
+    monkeypatch.setattr(api, "commodities_body", slow_body)
+    api.get("/commodities", {})
+    assert api.cache.get("/commodities?") is None
+
+
+def test_head_matches_get_headers():
+    api = _api()
+    s_get, h_get, b_get = _split(_exchange(api, b"GET /commodities HTTP/1.1\r\nConnection: close\r\n\r\n"))
+    s_head, h_head, b_head = _split(_exchange(api, b"HEAD /commodities HTTP/1.1\r\nConnection: close\r\n\r\n"))
+    assert s_get == s_head == "HTTP/1.1 200 OK"
+    assert b_head == b"" and int(h_head["content-length"]) == len(b_get) > 0
+    assert h_head == h_get
+
+
+def test_bad_content_length_is_400():
+    api = _api()
+    for value in (b"abc", b"-5"):
+        resp = _exchange(api, b"POST /reload HTTP/1.1\r\nContent-Length: " + value + b"\r\n\r\n")
+        status, headers, _ = _split(resp)
+        assert status.startswith("HTTP/1.1 400") and headers["connection"] == "close"
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""탐색 입력: 파이프라인과 같은 피처 저장소 + 피처 사양 컬럼."""
+
+import json
+
+import pytest
+from conftest import make_raw
+
+from wholesale import tune
+from wholesale.config import TARGET_COL, get_commodity
+from wholesale.features import build_features, feature_columns
+
+
+class _Stop(Exception):
+    pass
+
+
+@pytest.mark.parametrize("pruned", [False, True])
+def test_tune_uses_store_and_spec(monkeypatch, tmp_path, pruned):
+    cfg = get_commodity("양파")
+    raw = make_raw()
+    keep = ["lag_1", "ema_7", "dow"]
+    (tmp_path / f"{cfg.pref}_features.json").write_text(json.dumps({"columns": keep}), encoding="utf-8")
+    seen = {}
+
+    def _capture(feat, cols, cfg):
+        seen.update(feat=feat, cols=cols)
+        raise _Stop
+
+    monkeypatch.setattr(tune, "load_commodity_raw", lambda *a, **k: raw)
+    monkeypatch.setattr(tune, "build_matrices", _capture)
+    with pytest.raises(_Stop):
+        tune.tune_commodity(cfg, tune_dir=tmp_path, store_dir=tmp_path / "store", pruned=pruned, spec_dir=tmp_path)
+
+    full = feature_columns(build_features(raw, TARGET_COL, ffill=cfg.ffill), TARGET_COL)
+    assert seen["cols"] == ([c for c in full if c in keep] if pruned else full)
+    assert any((tmp_path / "store").iterdir())   # 저장소에 기록됨
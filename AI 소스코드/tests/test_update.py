@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""증분 갱신: 저장 모델의 학습 설정(탐색 파라미터/pruned/tuned/low_memory/engine)을 이어받음."""
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from wholesale import update
+from wholesale.artifacts import Artifact
+from wholesale.config import get_commodity
+
+
+def test_continue_training_uses_tuned_params():
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(200, 3)), rng.normal(size=200)
+    base = xgb.XGBRegressor(n_estimators=5, max_depth=3).fit(X, y)
+    m = update.continue_training(base, X, y, np.ones(200), rounds=3, params={"max_depth": 2, "n_estimators": 999})
+    assert m.get_params()["max_depth"] == 2
+    assert m.get_booster().num_boosted_rounds() == 5 + 3
+
+
+def test_retrain_keeps_artifact_settings(monkeypatch, tmp_path):
+    meta = {"pruned": True, "tuned": True, "low_memory": True, "engine": "arrow"}   # data_end 없음 → 재학습
+    art = Artifact(model=None, feature_cols=[], fill_values=pd.Series(dtype=float), fingerprint="", meta=meta)
+    seen = {}
+    monkeypatch.setattr(update, "load_artifact", lambda *a, **k: art)
+    monkeypatch.setattr(update, "run_commodity", lambda cfg, **kw: seen.update(kw) or {"name": cfg.name})
+    out = update.update_commodity(get_commodity("양파"), out_dir=tmp_path)
+    assert out["update"]["action"] == "retrain"
+    assert {k: seen[k] for k in meta} == meta
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+도매가격 예측 패키지 (품목 공통 파이프라인)
+- config       : 품목별 설정(COMMODITIES) + 공통 설정
+- data         : CSV 로딩/병합
+- cache        : CSV 파싱 결과 캐시 (내용 해시 키)
+- archive      : 원본 zip 직접 수집 (중복 멤버 제거, 병렬 파싱)
+- features     : build_features
+- feature_kernels: 가격 단위 피처 융합 커널 (랙/EMA/롤링/차분 → 미리 할당한 n×K 배열, numba 선택 — backend="numpy")
+- arrow_engine : pyarrow 실행 경로 (수집 → 병합 → 달력 Acero 계획 + 커널 피처, engine="arrow") + pandas 경로 일치 확인
+- feature_state: 순차 예측용 증분 피처 상태 (경로 N개 배치)
+- feature_store: 품목별 피처 저장소 (materialize — 새 일자만 증분 계산 + 순차 예측 시작 상태 스냅샷)
+- matrix       : 저메모리 모드 피처 행렬 (품목별 연속 float32 1개 + 학습/검증/평가 슬라이스 뷰)
+- forecast     : 순차 예측 (recursive_forecast_force)
+- direct       : 직접 다중 horizon 예측 (horizon 구간별 모델 — 순차 예측의 대안, --strategy)
+- scenario     : 몬테카를로 시나리오 예측 (분위수 밴드)
+- artifacts    : 학습 산출물 저장/로드 (부스터, feature_cols, fill_values, 데이터 지문)
+- pipeline     : 품목 1개 실행 (run_commodity) / 저장 모델로 예측만 (forecast_only)
+- update       : 일일 증분 갱신 (update_commodity — 부스팅 이어 학습 + 드리프트 시 재학습)
+- backtest     : 워크포워드 백테스트 (원점별 병렬 재학습 → horizon 별 MAE/SMAPE 표)
+- backfill     : 원점별 순차 예측 백필 (원점 N개 스텝 동기 배치 → 경과 일수별 오차 곡선)
+- tune         : 하이퍼파라미터 탐색 (공유 QuantileDMatrix + 중앙값 가지치기)
+- panel        : 패널 모드 (시장×품목×단위×등급 시계열 전부, 그룹 연산 피처 + 전역 모델 1개 + 배치 예측)
+- global_model : 품목 공통 전역 모델 (피처 표 적재 + 스케일 정규화/품목 피처 + 부스터 1개, 한 루프 예측)
+- feature_profile: 피처 그룹 비용/효과 측정 → 가지치기 사양 (SPEC_DIR, --pruned)
+- profiling    : 단계별 계측 (벽시계/CPU/최대 RSS/행 수/best_iteration → run_report JSON, 선택 cProfile)
+- runner       : 전 품목 병렬 실행 (run_all, python -m wholesale)
+- bundle       : 모바일용 예측 번들 (전 품목 1파일, int32 델타 + 버전 헤더)
+- serve        : 로컬 예측 API (python -m wholesale.serve — 메모리 예측 + LRU/ETag, Flutter 앱용)
+
+pipeline/runner 는 xgboost·sklearn 을 끌어오므로 처음 사용할 때 import 한다.
+"""
+
+from .archive import load_archive, load_commodity_raw
+from .config import COMMODITIES, Commodity, get_commodity
+from .data import load_raw, read_one_csv
+from .feature_state import FeatureState
+from .feature_store import FeatureStore, materialize
+from .features import build_features, feature_columns
+from .matrix import FeatureMatrix
+from .forecast import history_state, origin_states, recursive_forecast_force
+from .scenario import predict_batch, quantile_bands, scenario_forecast, simulate_paths
+
+_LAZY = {
+    "run_commodity": "pipeline",
+    "forecast_only": "pipeline",
+    "update_commodity": "update",
+    "walk_forward": "backtest",
+    "run_walk_forward": "backtest",
+    "backfill": "backfill",
+    "run_backfill": "backfill",
+    "tune_commodity": "tune",
+    "profile_features": "feature_profile",
+    "load_panel": "panel",
+    "build_panel_features": "panel",
+    "panel_forecast": "panel",
+    "run_panel": "panel",
+    "run_global": "global_model",
+    "global_forecast": "global_model",
+    "fit_direct": "direct",
+    "direct_forecast": "direct",
+    "backtest_21_23_to_24": "pipeline",
+    "run_all": "runner",
+    "report": "metrics",
+    "smape": "metrics",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+전 품목 일괄 실행
+    python -m wholesale                 # 5개 품목 병렬
+    python -m wholesale 감자 양파 --workers 2 --threads 4
+    python -m wholesale --forecast-only        # 저장된 모델로 예측만 갱신 (재학습 없음)
+    python -m wholesale --update               # 새 레이블로 증분 라운드 추가 (드리프트 시 전체 재학습)
+    python -m wholesale 양파 --strategy both    # 순차 + 직접(horizon 구간별) 예측, 지연/정확도 비교 표
+    python -m wholesale --forecast-only --bundle   # 예측 후 모바일용 번들(forecast_bundle.bin) 내보내기
+    python -m wholesale --no-plots             # 그래프 없이 (matplotlib import 안 함, 서버/CI 용)
+    python -m wholesale --engine arrow         # 수집/병합/피처를 pyarrow 경로로 (결과 표는 pandas 경로와 같음)
+"""
+
+import argparse
+import sys
+
+from .config import (ARCHIVE_DIR, CACHE_DIR, COMMODITIES, DRIFT_THRESHOLD, ENGINE, ENGINES, MAX_UPDATES, MODEL_DIR,
+                     N_SCENARIOS, OUT_DIR, STORE_DIR, STRATEGIES, UPDATE_ROUNDS)
+from .runner import run_all
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale", description="도매가격 예측 (품목 병렬 실행)")
+    ap.add_argument("items", nargs="*", help=f"품목 (기본: 전체 — {', '.join(COMMODITIES)})")
+    ap.add_argument("--workers", type=int, default=None, help="동시 워커 프로세스 수")
+    ap.add_argument("--threads", type=int, default=None, help="워커당 XGBoost 스레드 수")
+    ap.add_argument("--data-root", default=".", help="품목 CSV 폴더들이 있는 위치")
+    ap.add_argument("--archive-dir", default=str(ARCHIVE_DIR), help="품목 폴더가 없을 때 읽을 원본 zip 위치")
+    ap.add_argument("--out-dir", default=str(OUT_DIR), help="출력 폴더")
+    ap.add_argument("--no-backtest", action="store_true", help="2021~23 → 2024 백테스트 생략")
+    ap.add_argument("--no-plots", action="store_true", help="그래프 생략 (matplotlib import 안 함)")
+    ap.add_argument("--cache-dir", default=str(CACHE_DIR), help="CSV 파싱 결과 캐시 위치")
+    ap.add_argument("--store-dir", default=str(STORE_DIR), help="품목별 피처 저장소 위치 (새 일자만 계산)")
+    ap.add_argument("--no-cache", action="store_true", help="캐시/피처 저장소 없이 매번 CSV 파싱 + 피처 계산")
+    ap.add_argument("--model-dir", default=str(MODEL_DIR), help="학습 산출물(부스터 + meta.json) 위치")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--forecast-only", action="store_true", help="학습 없이 저장된 모델로 순차 예측만")
+    mode.add_argument("--update", action="store_true", help="저장 모델에 새 레이블로 라운드 이어 붙이기")
+    ap.add_argument("--update-rounds", type=int, default=UPDATE_ROUNDS, help="증분 갱신 라운드 수")
+    ap.add_argument("--drift-threshold", type=float, default=DRIFT_THRESHOLD,
+                    help="새 레이블 RMSE / 학습 검증 RMSE 가 이 값을 넘으면 전체 재학습")
+    ap.add_argument("--max-updates", type=int, default=MAX_UPDATES, help="연속 증분 갱신 상한 (넘으면 전체 재학습)")
+    ap.add_argument("--tuned", action="store_true", help="python -m wholesale.tune 의 최적 파라미터로 학습")
+    ap.add_argument("--pruned", action="store_true",
+                    help="python -m wholesale.feature_profile 의 피처 사양(가지치기된 컬럼)으로 학습")
+    ap.add_argument("--low-memory", action="store_true",
+                    help="품목별 float32 피처 행렬 1개 + 학습/검증/평가 슬라이스 뷰로 학습 (최대 RSS 보고)")
+    ap.add_argument("--engine", choices=ENGINES, default=ENGINE,
+                    help="학습 시 수집/병합/피처 실행 경로: pandas / arrow (pyarrow Acero 계획, 멀티스레드)")
+    ap.add_argument("--strategy", choices=STRATEGIES, default="recursive",
+                    help="미래 예측 방식: recursive 순차 / direct horizon 구간별 직접 / both 둘 다 + 비교")
+    ap.add_argument("--profile", action="store_true", help="품목별 cProfile 덤프 (out-dir/profile_*.prof)")
+    ap.add_argument("--bundle", action="store_true", help="실행 후 전 품목 예측 번들(forecast_bundle.bin) 내보내기")
+    ap.add_argument("--scenarios", type=int, default=N_SCENARIOS, help="시나리오 경로 수 (0: 밴드 생략)")
+    args = ap.parse_args(argv)
+
+    results = run_all(args.items or None, workers=args.workers, threads=args.threads,
+                      data_root=args.data_root, out_dir=args.out_dir, backtest=not args.no_backtest,
+                      cache_dir=None if args.no_cache else args.cache_dir, archive_dir=args.archive_dir,
+                      model_dir=args.model_dir, n_scenarios=args.scenarios,
+                      mode="forecast" if args.forecast_only else "update" if args.update else "train",
+                      update_opts=dict(rounds=args.update_rounds, drift_threshold=args.drift_threshold,
+                                       max_updates=args.max_updates),
+                      tuned=args.tuned, strategy=args.strategy, profile=args.profile or None,
+                      plots=not args.no_plots, store_dir=None if args.no_cache else args.store_dir,
+                      pruned=args.pruned, low_memory=args.low_memory, engine=args.engine)
+    if args.bundle:
+        from .bundle import export_bundle
+        export_bundle(out_dir=args.out_dir)
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
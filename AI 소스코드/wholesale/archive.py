@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+zip 원본 직접 수집 (압축 해제 단계 없음)
+- '농산물 도매가격 데이터/*.zip' 멤버를 메모리로 읽어 바로 파싱 — 임시 파일을 쓰지 않음
+- 제외: 폴더 항목, .csv 외 파일, .ipynb_checkpoints/ · _tmp_xlsx/ 아래 파일, *-checkpoint.csv
+- 파싱 전에 내용 해시로 바이트 동일 멤버 제거 (같은 해시 = 파싱 1회)
+- 멤버 읽기/압축 해제와 파싱은 스레드 풀로 병렬 (zlib·해시·C 파서는 GIL 을 놓음)
+- 멤버 순서는 이름순 → 폴더로 풀었을 때의 glob 정렬과 같은 병합 결과
+"""
+
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from pathlib import Path, PurePosixPath
+
+import pandas as pd
+
+from .cache import cached_parse, content_key
+from .config import ARCHIVE_DIR, ENGINE, FORECAST_END, TARGET_COL
+from .data import load_raw, merge_frames, read_one_csv
+
+SKIP_DIRS = {".ipynb_checkpoints", "_tmp_xlsx", "__MACOSX"}
+
+
+def is_data_member(name: str) -> bool:
+    """zip 멤버 이름이 수집 대상 CSV 인지."""
+    p = PurePosixPath(name)
+    if name.endswith("/") or p.suffix.lower() != ".csv":
+        return False
+    if SKIP_DIRS.intersection(p.parts[:-1]):
+        return False
+    return not p.stem.endswith("-checkpoint")
+
+
+def list_members(zip_paths) -> list:
+    """수집 대상 (zip 경로, 멤버 이름) 목록 — 멤버 파일명 순."""
+    out = []
+    for zp in zip_paths:
+        with zipfile.ZipFile(zp) as zf:
+            out += [(str(zp), n) for n in zf.namelist() if is_data_member(n)]
+    return sorted(out, key=lambda m: (PurePosixPath(m[1]).name, m[0], m[1]))
+
+
+def _workers(workers):
+    return workers or min(8, os.cpu_count() or 1)
+
+
+def read_archive(zip_paths, target: str = TARGET_COL, cache_dir=None, workers=None, parse=None) -> list:
+    """
+    zip 들의 CSV 멤버 → 파일별 (date, 값) 목록 (중복 내용은 1개만)
+    - cache_dir 가 있으면 폴더 수집과 같은 내용 해시 캐시 사용
+    - parse(bytes, target): read_one_csv 대신 쓸 파서 (패널 수집 등 — 캐시 없음)
+    """
+    members = list_members(zip_paths)
+    if not members:
+        raise FileNotFoundError(f"zip 안에 CSV가 없습니다: {', '.join(map(str, zip_paths))}")
+    archives = {zp: zipfile.ZipFile(zp) for zp in {m[0] for m in members}}
+    try:
+        def _read(m):
+            data = archives[m[0]].read(m[1])
+            return data, content_key(data, target)
+
+        with ThreadPoolExecutor(_workers(workers)) as ex:
+            blobs = list(ex.map(_read, members))
+
+            # 바이트 동일 멤버 제거 (먼저 나온 것 유지)
+            unique, seen = [], set()
+            for m, (data, key) in zip(members, blobs):
+                if key not in seen:
+                    seen.add(key)
+                    unique.append((m, data, key))
+
+            def _parse(item):
+                (zp, name), data, key = item
+                try:
+                    if parse is not None:
+                        return parse(data, target), False
+                    if cache_dir is None:
+                        return read_one_csv(data, target), False
+                    return cached_parse(key, lambda: read_one_csv(data, target), target, cache_dir)
+                except ValueError as e:
+                    raise ValueError(f"{Path(zp).name}:{name} — {e}") from None
+
+            parsed = list(ex.map(_parse, unique))
+    finally:
+        for zf in archives.values():
+            zf.close()
+
+    hits = sum(hit for _, hit in parsed)
+    print(f"[zip] 멤버 {len(members)}개 · 중복 {len(members) - len(unique)}개 제외"
+          + (f" · 캐시 적중 {hits}개" if cache_dir is not None else ""))
+    return [df for df, _ in parsed]
+
+
+def load_archive(zip_paths, end_date=FORECAST_END, target: str = TARGET_COL, cache_dir=None,
+                 workers=None) -> pd.DataFrame:
+    """zip 멤버 병합 결과 (load_raw 와 같은 형태, 미래 구간은 NaN)."""
+    return merge_frames(read_archive(zip_paths, target, cache_dir, workers), end_date, target)
+
+
+def load_commodity_raw(cfg, data_root=".", archive_dir=ARCHIVE_DIR, end_date=FORECAST_END,
+                       target: str = TARGET_COL, cache_dir=None, workers=None, engine=None) -> pd.DataFrame:
+    """
+    품목 원천 선택
+    - data_root/cfg.data_dir 에 CSV 가 있으면 폴더 (기존 방식)
+    - 없으면 archive_dir/cfg.archive (zip 직접 수집)
+    - engine="arrow": 같은 원천을 pyarrow 경로로 (arrow_engine — 파싱 캐시 없음, 결과 표는 같음)
+    """
+    if (engine or ENGINE) == "arrow":
+        from .arrow_engine import load_commodity_raw_arrow
+        return load_commodity_raw_arrow(cfg, data_root, archive_dir, end_date, target, workers)
+    data_dir = Path(data_root) / cfg.data_dir
+    if glob(str(data_dir/"*.csv")):
+        return load_raw(data_dir, end_date, target, cache_dir=cache_dir)
+    zip_path = Path(archive_dir) / cfg.archive if cfg.archive else None
+    if zip_path is None or not zip_path.exists():
+        raise FileNotFoundError(f"{data_dir.resolve()} 에 CSV가 없고 zip 도 없습니다"
+                                + (f" ({zip_path.resolve()})" if zip_path else "") + ".")
+    print(f"[{cfg.name}] zip 직접 수집: {zip_path.name}")
+    return load_archive([zip_path], end_date, target, cache_dir, workers)
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""
+pyarrow 실행 경로 (수집 → 병합 → 달력 → 피처) — engine="arrow" / --engine arrow
+- 수집: pyarrow.csv 멀티스레드 리더로 필요한 컬럼만 문자열로 읽음 (파일/zip 멤버 bytes, 파일 단위 스레드 풀)
+- 병합: 파일 테이블을 이어 붙이고 Acero 계획으로 파싱(project) → 결측·기간 제한(filter) → (키, 파일, 일자) 평균
+  (aggregate) → 앞 파일 우선 중복 제거(일자별 최소 파일 aggregate + hashjoin) → 달력 뼈대와 left outer hashjoin
+  → order_by. 단계마다 선언(Declaration)을 엮은 뒤 to_table 한 번에 실행 (배치 스트리밍, use_threads)
+- 피처: 달력/주기/추세는 pyarrow.compute 시간 함수, 가격 단위 피처는 feature_kernels 커널 (build_features(backend="arrow"))
+- 결과는 pandas 경로(merge_frames/merge_panel/build_features)와 같은 표·dtype — check_parity 로 확인
+  (파싱 캐시는 pandas 경로 전용: arrow 경로는 항상 CSV 를 읽음)
+
+    python -m wholesale.arrow_engine                 # 전 품목 pandas ↔ arrow 일치 확인 + 소요 시간
+    python -m wholesale.arrow_engine 양파 --panel     # 패널 수집까지
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .archive import _workers, read_archive
+from .config import ARCHIVE_DIR, COMMODITIES, FORECAST_END, TARGET_COL, USE_YOY, get_commodity
+from .data import _DATE_DTYPE, _header, _name, _source, value_columns
+from .feature_kernels import level_features
+from .features import FEATURE_GROUPS, _steps
+
+try:
+    import pyarrow as pa
+    import pyarrow.acero as ac
+    import pyarrow.compute as pc
+    import pyarrow.csv as pcsv
+except ImportError:   # 선택 의존성 — engine="arrow" 에서만 필요
+    pa = None
+
+ALL_KEY = "전체"   # panel.ALL_KEY 와 같은 값 (panel 은 xgboost 를 끌어오므로 여기서는 import 하지 않음)
+
+
+def _require():
+    if pa is None:
+        raise ImportError("engine='arrow' 에는 pyarrow 가 필요합니다 (pip install pyarrow).")
+
+
+# =======================
+# 수집
+# =======================
+def read_table(src, target: str = TARGET_COL, keys=()) -> "pa.Table":
+    """CSV 1개(경로 또는 bytes) → 문자열 테이블 (keys..., d, v). 없는 키 컬럼은 ALL_KEY."""
+    _require()
+    header = _header(src)
+    cols = value_columns(header, target)
+    if cols is None:
+        raise ValueError(f"[{_name(src)}] '일자/평균가' 또는 '구분/평균' 컬럼이 필요합니다.")
+    use = [k for k in keys if k in header] + list(cols)
+    t = pcsv.read_csv(_source(src),
+                      read_options=pcsv.ReadOptions(column_names=header, skip_rows=1),
+                      parse_options=pcsv.ParseOptions(invalid_row_handler=lambda row: "skip"),
+                      convert_options=pcsv.ConvertOptions(column_types=dict.fromkeys(use, pa.string()),
+                                                          include_columns=use, strings_can_be_null=True))
+    arrays = [t[k] if k in header else pa.chunked_array([pa.array(np.full(len(t), ALL_KEY))], pa.string())
+              for k in keys]
+    return pa.table(arrays + [t[cols[0]], t[cols[1]]], names=list(keys) + ["d", "v"])
+
+
+def read_tables(paths, target: str = TARGET_COL, keys=(), workers=None) -> list:
+    """파일별 read_table (스레드 풀 — CSV 리더는 GIL 을 놓음)."""
+    with ThreadPoolExecutor(_workers(workers)) as ex:
+        return list(ex.map(lambda p: read_table(Path(p), target, keys), paths))
+
+
+def _source_tables(cfg, data_root, archive_dir, target, keys, workers) -> list:
+    """load_commodity_raw 와 같은 원천 선택 (폴더 CSV, 없으면 zip)."""
+    data_dir = Path(data_root) / cfg.data_dir
+    paths = sorted(glob(str(data_dir / "*.csv")))
+    if paths:
+        return read_tables(paths, target, keys, workers)
+    zip_path = Path(archive_dir) / cfg.archive if cfg.archive else None
+    if zip_path is None or not zip_path.exists():
+        raise FileNotFoundError(f"{data_dir.resolve()} 에 CSV가 없고 zip 도 없습니다"
+                                + (f" ({zip_path.resolve()})" if zip_path else "") + ".")
+    print(f"[{cfg.name}] zip 직접 수집 (arrow): {zip_path.name}")
+    return read_archive([zip_path], target, workers=workers, parse=lambda data, t: read_table(data, t, keys))
+
+
+# =======================
+# 병합 (Acero 계획)
+# =======================
+def _date_expr():
+    # parse_dates_tolerant 와 같은 규칙: 숫자/구분자 외 제거 → '/', '-' 를 '.' 로 → %Y.%m.%d (실패는 null)
+    d = pc.replace_substring_regex(pc.field("d"), pattern=r"[^0-9./\-]", replacement="")
+    d = pc.replace_substring(pc.replace_substring(d, pattern="/", replacement="."), pattern="-", replacement=".")
+    ts = pc.strptime(d, format="%Y.%m.%d", unit="s", error_is_null=True)
+    # strptime 은 없는 일자를 다음 달로 넘김 (2024.02.30 → 03-01) → 문자열의 일(day)과 다르면 null
+    day = pc.if_else(pc.is_valid(ts), pc.replace_substring_regex(d, pattern=r"^.*\.", replacement=""),
+                     pa.scalar(None, pa.string())).cast(pa.int64())
+    return pc.if_else(pc.equal(pc.day(ts), day), ts, pa.scalar(None, pa.timestamp("s"))).cast(pa.date32())
+
+
+def _value_expr():
+    # parse_prices_tolerant 와 같은 규칙: 쉼표/'원' 제거 + 공백 정리 → 숫자 형식만 float (그 외 null)
+    v = pc.utf8_trim_whitespace(pc.replace_substring(pc.replace_substring(pc.field("v"), pattern=",", replacement=""),
+                                                     pattern="원", replacement=""))
+    num = pc.match_substring_regex(v, pattern=r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+    return pc.if_else(num, v, pa.scalar(None, pa.string())).cast(pa.float64())
+
+
+def _key_expr(k):
+    v = pc.utf8_trim_whitespace(pc.field(k))
+    return pc.if_else(pc.or_kleene(pc.is_null(v), pc.equal(v, "")), pa.scalar(ALL_KEY), v)
+
+
+def _source_node(table):
+    return ac.Declaration("table_source", ac.TableSourceNodeOptions(table))
+
+
+def observations(tables, keys=(), end_date=FORECAST_END) -> "pa.Table":
+    """
+    파일별 문자열 테이블 → (keys..., date, v) 관측 (키·일자별 1행)
+    파일 안 같은 키·일자는 평균, 파일 간 중복은 앞 파일 값 (merge_frames/merge_panel 의 drop_duplicates)
+    """
+    _require()
+    keys = list(keys)
+    t = pa.concat_tables([tb.append_column("file", pa.array(np.full(len(tb), i, dtype=np.int32)))
+                          for i, tb in enumerate(tables)])
+    end = pa.scalar(pd.Timestamp(end_date).date(), pa.date32())
+    year = pc.year(pc.field("date"))
+    daily = ac.Declaration.from_sequence([
+        _source_node(t),
+        ac.Declaration("project", ac.ProjectNodeOptions([_key_expr(k) for k in keys]
+                                                        + [_date_expr(), _value_expr(), pc.field("file")],
+                                                        keys + ["date", "v", "file"])),
+        ac.Declaration("filter", ac.FilterNodeOptions(pc.is_valid(pc.field("date")) & pc.is_valid(pc.field("v"))
+                                                      & (year >= 2020) & (year <= 2025)
+                                                      & (pc.field("date") <= end))),
+        ac.Declaration("aggregate", ac.AggregateNodeOptions([("v", "hash_mean", None, "v")],
+                                                            keys=keys + ["file", "date"])),
+    ]).to_table(use_threads=True)
+
+    first = ac.Declaration.from_sequence([
+        _source_node(daily),
+        ac.Declaration("aggregate", ac.AggregateNodeOptions([("file", "hash_min", None, "first")],
+                                                            keys=keys + ["date"])),
+    ])
+    join = ac.Declaration("hashjoin", ac.HashJoinNodeOptions("inner", keys + ["date", "file"], keys + ["date", "first"],
+                                                             left_output=keys + ["date", "v"], right_output=[]),
+                          inputs=[_source_node(daily), first])
+    return join.to_table(use_threads=True)
+
+
+def _calendar_join(obs, calendar, keys, order):
+    """달력 뼈대(keys..., date, ...) ← 관측 left outer join → order 순."""
+    return ac.Declaration.from_sequence([
+        ac.Declaration("hashjoin", ac.HashJoinNodeOptions("left outer", keys + ["date"], keys + ["date"],
+                                                          left_output=calendar.column_names, right_output=["v"]),
+                       inputs=[_source_node(calendar), _source_node(obs)]),
+        ac.Declaration("order_by", ac.OrderByNodeOptions([(c, "ascending") for c in order])),
+    ]).to_table(use_threads=True)
+
+
+def _to_datetime(col) -> pd.Series:
+    return pd.Series(col.to_numpy().astype("datetime64[D]").astype(_DATE_DTYPE))
+
+
+def merge_tables(tables, end_date=FORECAST_END, target: str = TARGET_COL) -> pd.DataFrame:
+    """merge_frames 의 arrow 판: 파일별 테이블 → [date, target] (첫 실측일 ~ end_date 일 단위, 미래는 NaN)."""
+    obs = observations(tables, (), end_date)
+    if len(obs) == 0:
+        raise ValueError("merge_tables: 실측값이 없습니다.")
+    dates = np.arange(pc.min(obs["date"]).as_py(), pd.Timestamp(end_date).date() + pd.Timedelta(days=1),
+                      dtype="datetime64[D]")
+    out = _calendar_join(obs, pa.table({"date": pa.array(dates, pa.date32())}), [], ["date"])
+    return pd.DataFrame({"date": _to_datetime(out["date"]), target: out["v"].to_numpy(zero_copy_only=False)})
+
+
+def merge_panel_tables(tables, end_date=FORECAST_END, target: str = TARGET_COL):
+    """merge_panel 의 arrow 판: 시계열(키 조합)별 첫 실측일 ~ end_date 달력 → Panel (sid 는 키 정렬 순)."""
+    from .panel import PANEL_KEYS, Panel
+    keys = list(PANEL_KEYS)
+    obs = observations(tables, keys, end_date)
+    if len(obs) == 0:
+        raise ValueError("merge_panel: 실측값이 없습니다.")
+    series = ac.Declaration.from_sequence([
+        _source_node(obs),
+        ac.Declaration("aggregate", ac.AggregateNodeOptions([("date", "hash_min", None, "first"),
+                                                             ("v", "hash_count", None, "obs")], keys=keys)),
+        ac.Declaration("order_by", ac.OrderByNodeOptions([(k, "ascending") for k in keys])),
+    ]).to_table(use_threads=True)
+
+    # 시계열별 달력 (merge_panel 과 같은 오프셋 계산)
+    end = np.datetime64(pd.Timestamp(end_date), "D")
+    first = series["first"].to_numpy().astype("datetime64[D]")
+    days = (end - first).astype(int) + 1
+    start = np.concatenate([[0], np.cumsum(days)[:-1]])
+    rows = np.repeat(np.arange(len(series)), days)
+    dates = first[rows] + (np.arange(len(rows)) - start[rows]).astype("timedelta64[D]")
+    calendar = pa.table({**{k: pc.take(series[k], pa.array(rows)) for k in keys},
+                         "sid": pa.array(rows), "date": pa.array(dates, pa.date32())})
+    out = _calendar_join(obs, calendar, keys, ["sid", "date"])
+
+    info = pd.DataFrame({k: series[k].to_numpy(zero_copy_only=False) for k in keys})
+    info["first"] = _to_datetime(series["first"])
+    info["obs"] = series["obs"].to_numpy()
+    raw = pd.DataFrame({"sid": out["sid"].to_numpy(), "date": _to_datetime(out["date"]),
+                        target: out["v"].to_numpy(zero_copy_only=False)})
+    return Panel(info, raw)
+
+
+def load_commodity_raw_arrow(cfg, data_root=".", archive_dir=ARCHIVE_DIR, end_date=FORECAST_END,
+                             target: str = TARGET_COL, workers=None) -> pd.DataFrame:
+    """load_commodity_raw(engine="arrow") — 같은 원천·같은 표."""
+    return merge_tables(_source_tables(get_commodity(cfg), data_root, archive_dir, target, (), workers),
+                        end_date, target)
+
+
+def load_panel_arrow(cfg, data_root=".", archive_dir=ARCHIVE_DIR, end_date=FORECAST_END, target: str = TARGET_COL,
+                     workers=None):
+    """load_panel(engine="arrow") — 같은 원천·같은 Panel."""
+    from .panel import PANEL_KEYS
+    return merge_panel_tables(_source_tables(get_commodity(cfg), data_root, archive_dir, target, list(PANEL_KEYS),
+                                             workers), end_date, target)
+
+
+# =======================
+# 피처
+# =======================
+def calendar_columns(dates) -> dict:
+    """일자 → 달력/주기/추세 컬럼 (build_features 와 같은 값·dtype, pyarrow.compute 시간 함수)."""
+    _require()
+    d = pa.array(np.asarray(dates, dtype="datetime64[D]"), pa.date32())
+    month = pc.month(d).to_numpy().astype(np.int32)
+    doy = pc.day_of_year(d).to_numpy().astype(np.int32)
+    day = pc.day(d).to_numpy().astype(np.int32)
+    out = {"year": pc.year(d).to_numpy().astype(np.int32), "month": month, "day": day,
+           "dow": pc.day_of_week(d).to_numpy().astype(np.int32), "doy": doy,
+           "week": pc.iso_week(d).to_numpy().astype(np.int64),
+           "quarter": pc.quarter(d).to_numpy().astype(np.int32),
+           "is_harvest": ((month >= 9) & (month <= 11)).astype(np.int64)}
+    out["sin_year"] = np.sin(2*np.pi*doy/365.25)
+    out["cos_year"] = np.cos(2*np.pi*doy/365.25)
+    out["sin_month"] = np.sin(2*np.pi*day/31.0)
+    out["cos_month"] = np.cos(2*np.pi*day/31.0)
+    trend = pc.days_between(pc.min(d), d).to_numpy().astype(float) if len(d) else np.empty(0)
+    out["trend"] = trend
+    out["trend2"] = trend**2 / 1e6
+    return out
+
+
+def build_features_arrow(s: pd.DataFrame, target: str, use_yoy: bool = USE_YOY, ffill: bool = False,
+                         timings: dict = None) -> pd.DataFrame:
+    """build_features(backend="arrow") 본체. s: 일자 정렬 + y 컬럼이 붙은 표."""
+    t0 = time.perf_counter()
+    cols = calendar_columns(s["date"].to_numpy())
+    t1 = time.perf_counter()
+    names, X = level_features(s["y"].to_numpy(), use_yoy, ffill)
+    if timings is not None:
+        timings["calendar"] = timings.get("calendar", 0.0) + t1 - t0
+        timings["kernel"] = timings.get("kernel", 0.0) + time.perf_counter() - t1
+    cols.update(zip(names, X.T))
+    order = [c for name, _ in _steps(use_yoy, ffill) for c in FEATURE_GROUPS[name]]
+    base = {c: s[c].to_numpy() for c in s.columns if c != target}
+    return pd.DataFrame({**base, **{c: cols[c] for c in order}})
+
+
+# =======================
+# pandas ↔ arrow 일치 확인
+# =======================
+def check_parity(cfg, data_root=".", archive_dir=ARCHIVE_DIR, panel=False, use_yoy=USE_YOY, rtol=1e-9) -> dict:
+    """
+    같은 원천을 두 경로로 수집/피처 계산해 비교. 반환: {단계: 최대 상대 오차 또는 불일치 설명, 소요 시간}
+    - 병합 표(date/값)와 피처 표는 컬럼/dtype/결측 위치가 같아야 하고 값은 rtol 이내
+      (롤링 표준편차만 가격 수준 대비 1e-6 — feature_kernels 참고)
+    """
+    from .archive import load_commodity_raw
+    from .features import build_features
+    cfg = get_commodity(cfg)
+    res, t = {"name": cfg.name}, {}
+
+    t0 = time.perf_counter()
+    raw_pd = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL, engine="pandas")
+    t["load_pandas"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    raw_ar = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL, engine="arrow")
+    t["load_arrow"] = time.perf_counter() - t0
+    res["raw"] = _compare(raw_pd, raw_ar, rtol)
+
+    t0 = time.perf_counter()
+    f_pd = build_features(raw_pd, TARGET_COL, use_yoy=use_yoy, ffill=cfg.ffill, backend="pandas")
+    t["features_pandas"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    f_ar = build_features(raw_ar, TARGET_COL, use_yoy=use_yoy, ffill=cfg.ffill, backend="arrow")
+    t["features_arrow"] = time.perf_counter() - t0
+    std = [c for c in f_pd.columns if c.startswith("rstd_")]
+    res["features"] = _compare(f_pd.drop(columns=std), f_ar.drop(columns=std), rtol)
+    scale = float(np.nanmax(np.abs(raw_pd[TARGET_COL]))) if raw_pd[TARGET_COL].notna().any() else 1.0
+    res["rstd"] = _compare(f_pd[std] / scale, f_ar[std] / scale, 0.0, atol=1e-6)
+
+    if panel:
+        from .panel import load_panel
+        t0 = time.perf_counter()
+        p_pd = load_panel(cfg, data_root, archive_dir, engine="pandas")
+        t["panel_pandas"] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        p_ar = load_panel(cfg, data_root, archive_dir, engine="arrow")
+        t["panel_arrow"] = time.perf_counter() - t0
+        res["panel_series"] = _compare(p_pd.series, p_ar.series, rtol)
+        res["panel_raw"] = _compare(p_pd.raw, p_ar.raw, rtol)
+    res["seconds"] = {k: round(v, 3) for k, v in t.items()}
+    res["ok"] = all(isinstance(v, float) for k, v in res.items() if k not in ("name", "seconds"))
+    return res
+
+
+def _compare(a: pd.DataFrame, b: pd.DataFrame, rtol, atol=0.0):
+    """같으면 최대 오차(float — atol 이 있으면 절대, 없으면 상대), 다르면 설명(str)."""
+    if list(a.columns) != list(b.columns):
+        return f"컬럼 다름: {sorted(set(a.columns) ^ set(b.columns)) or '순서'}"
+    if len(a) != len(b):
+        return f"행 수 다름: {len(a)} ↔ {len(b)}"
+    worst = 0.0
+    for c in a.columns:
+        x, y = a[c].to_numpy(), b[c].to_numpy()
+        if x.dtype != y.dtype:
+            return f"{c}: dtype {x.dtype} ↔ {y.dtype}"
+        if x.dtype.kind != "f":
+            if not (x == y).all():
+                return f"{c}: 값 다름 ({int((x != y).sum())}행)"
+            continue
+        if not (np.isnan(x) == np.isnan(y)).all():
+            return f"{c}: 결측 위치 다름"
+        ok = np.isfinite(x)
+        if not (x[~ok & ~np.isnan(x)] == y[~ok & ~np.isnan(x)]).all():
+            return f"{c}: inf 다름"
+        err = np.abs(x[ok] - y[ok])
+        if (err > atol + rtol * np.abs(x[ok])).any():
+            return f"{c}: 오차 {err.max():.3g}"
+        if atol == 0.0:
+            err = err / np.maximum(np.abs(x[ok]), 1e-300)
+        worst = max(worst, float(err.max()) if len(err) else 0.0)
+    return worst
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale.arrow_engine",
+                                 description="pandas ↔ arrow 실행 경로 일치 확인 (수집/병합/달력/피처)")
+    ap.add_argument("items", nargs="*", help=f"품목 (기본: 전체 — {', '.join(COMMODITIES)})")
+    ap.add_argument("--panel", action="store_true", help="패널 수집(시장/품목/단위/등급 시계열)도 비교")
+    ap.add_argument("--yoy", action="store_true", help="YoY 피처 포함해 비교")
+    ap.add_argument("--data-root", default=".")
+    ap.add_argument("--archive-dir", default=str(ARCHIVE_DIR))
+    args = ap.parse_args(argv)
+
+    bad = 0
+    for name in args.items or COMMODITIES:
+        r = check_parity(name, args.data_root, args.archive_dir, panel=args.panel, use_yoy=args.yoy or USE_YOY)
+        bad += not r["ok"]
+        diffs = " · ".join(f"{k} {v:.1e}" if isinstance(v, float) else f"{k} ✗ {v}"
+                           for k, v in r.items() if k not in ("name", "seconds", "ok"))
+        secs = " · ".join(f"{k} {v:.2f}s" for k, v in r["seconds"].items())
+        print(f"[{'일치' if r['ok'] else '불일치'}] {name}: {diffs}\n        {secs}")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
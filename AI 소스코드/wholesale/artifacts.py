@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+학습 산출물 저장/로드 (재학습 없이 예측만 갱신)
+- 위치: MODEL_DIR/{pref}/  model.ubj (부스터) + meta.json (+ quantile.ubj: 다중 분위 부스터, 선택)
+- meta: 버전, feature_cols, fill_values, 검증 잔차(시나리오 밴드용), 학습 데이터 지문, best_iteration
+- 지문: 학습에 쓴 (date, 평균가) 배열의 해시 → 새 가격이 들어오면 달라짐
+- 탐색 결과: TUNE_DIR/{pref}_best.json (wholesale.tune) → tuned_params
+- 피처 사양: SPEC_DIR/{pref}_features.json (wholesale.feature_profile) → feature_spec
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import SPEC_DIR, TARGET_COL, TUNE_DIR
+
+ARTIFACT_VERSION = 1   # meta.json 구조가 바뀌면 올릴 것 (구버전은 로드 거부 → 재학습)
+
+
+def data_fingerprint(raw: pd.DataFrame, target: str = TARGET_COL) -> str:
+    """레이블이 있는 (date, 값) 행의 내용 해시."""
+    obs = raw[raw[target].notna()]
+    h = hashlib.blake2b(digest_size=16)
+    h.update(obs["date"].to_numpy(dtype="datetime64[D]").view("int64").tobytes())
+    h.update(obs[target].to_numpy(dtype=float).tobytes())
+    return h.hexdigest()
+
+
+@dataclass
+class Artifact:
+    model: object                       # xgb.XGBRegressor
+    feature_cols: list
+    fill_values: pd.Series
+    fingerprint: str
+    residuals: np.ndarray = field(default_factory=lambda: np.array([]))
+    meta: dict = field(default_factory=dict)
+    quantile_model: object = None       # 다중 분위 부스터 (meta["quantiles"] 순서)
+    quantiles: tuple = ()
+
+
+def artifact_dir(model_dir, cfg) -> Path:
+    return Path(model_dir) / cfg.pref
+
+
+def _write_atomic(path: Path, write):
+    # 확장자 유지 (xgboost 는 확장자로 저장 형식을 고름)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=f".tmp{path.suffix}")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def save_artifact(model_dir, cfg, model, feature_cols, fill_values: pd.Series, fingerprint: str,
+                  residuals=None, quantile_model=None, quantiles=(), **meta) -> Path:
+    """부스터 (+분위 부스터) + 메타 저장 (임시 파일 → 교체). 반환: 산출물 폴더"""
+    import xgboost as xgb
+
+    out = artifact_dir(model_dir, cfg)
+    out.mkdir(parents=True, exist_ok=True)
+    fill = pd.Series(fill_values).reindex(feature_cols)
+    doc = {
+        "version": ARTIFACT_VERSION,
+        "commodity": cfg.name,
+        "feature_cols": list(feature_cols),
+        "fill_values": [None if pd.isna(v) else float(v) for v in fill],
+        "residuals": [] if residuals is None else [float(r) for r in np.asarray(residuals, dtype=float)],
+        "fingerprint": fingerprint,
+        "best_iteration": getattr(model, "best_iteration", None),
+        "xgboost": xgb.__version__,
+        "ffill": cfg.ffill,
+        "quantiles": [float(q) for q in quantiles] if quantile_model is not None else [],
+        # residual: 점 예측 + 분위 (forecast.quantile_predict), 없으면 값 그대로인 예전 분위 부스터
+        "quantile_target": "residual" if getattr(quantile_model, "residual_", False) else None,
+        **meta,
+    }
+    # 부스터를 먼저 교체하고 meta 를 마지막에 → meta 가 있으면 짝이 맞는 부스터가 있음
+    _write_atomic(out/"model.ubj", model.save_model)
+    if quantile_model is not None:
+        _write_atomic(out/"quantile.ubj", quantile_model.save_model)
+    _write_atomic(out/"meta.json", lambda p: Path(p).write_text(json.dumps(doc, ensure_ascii=False, indent=1),
+                                                                encoding="utf-8"))
+    return out
+
+
+def load_artifact(model_dir, cfg) -> Artifact:
+    """저장된 산출물 로드. 없거나 버전이 다르면 FileNotFoundError / ValueError."""
+    import xgboost as xgb
+
+    src = artifact_dir(model_dir, cfg)
+    meta_path, model_path = src/"meta.json", src/"model.ubj"
+    if not meta_path.exists() or not model_path.exists():
+        raise FileNotFoundError(f"[{cfg.name}] 저장된 모델이 없습니다: {src.resolve()} (먼저 학습 실행)")
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    if meta.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"[{cfg.name}] 모델 산출물 버전 {meta.get('version')} ≠ {ARTIFACT_VERSION} (재학습 필요)")
+    model = xgb.XGBRegressor()
+    model.load_model(model_path)
+    cols = meta["feature_cols"]
+    fill = pd.Series([np.nan if v is None else v for v in meta["fill_values"]], index=cols, dtype=float)
+    qmodel, quantiles = None, tuple(meta.get("quantiles") or ())
+    if quantiles and (src/"quantile.ubj").exists():
+        qmodel = xgb.XGBRegressor()
+        qmodel.load_model(src/"quantile.ubj")
+        qmodel.residual_ = meta.get("quantile_target") == "residual"
+    return Artifact(model=model, feature_cols=cols, fill_values=fill, fingerprint=meta["fingerprint"],
+                    residuals=np.asarray(meta.get("residuals", []), dtype=float), meta=meta,
+                    quantile_model=qmodel, quantiles=quantiles if qmodel is not None else ())
+
+
+def tuned_params(cfg, tune_dir=TUNE_DIR):
+    """탐색 결과의 최적 파라미터 (XGB_PARAMS 덮어쓰기용). 없으면 None."""
+    path = Path(tune_dir) / f"{cfg.pref}_best.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))["params"]
+
+
+def feature_spec(cfg, spec_dir=SPEC_DIR):
+    """가지치기 사양의 모델 입력 컬럼 목록. 없으면 None."""
+    path = Path(spec_dir) / f"{cfg.pref}_features.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))["columns"]
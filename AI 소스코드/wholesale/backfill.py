@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+순차 예측 백필 (원점별 다단계 오차)
+- 과거의 모든 원점에서 recursive_forecast_force 와 같은 순차 예측을 실행해 경과 일수(h)별 오차 곡선을 만든다
+- 원점 N개를 경로 N개로 묶어 스텝 동기 진행: 스텝마다 N×F 행렬 1회 + predict 1회 (원점 수와 무관하게 horizon 번)
+- 모델: 저장 산출물(models/) — 기본 원점은 학습·검증 구간 이후(표본 외)만,
+  그 뒤 실측이 없으면(last_label 분할, --update 이후) 검증 구간부터 (표본 내 경고)
+
+    python -m wholesale.backfill 양파                     # 표본 외(없으면 검증 구간) ~ 마지막 실측일, 110일 horizon
+    python -m wholesale.backfill 배추 --start 2025-03-01 --horizon 56
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .archive import load_commodity_raw
+from .artifacts import load_artifact
+from .backtest import horizon_table
+from .config import (ARCHIVE_DIR, CACHE_DIR, FORECAST_END, FORECAST_START, MODEL_DIR, OUT_DIR, TARGET_COL,
+                     USE_YOY, get_commodity)
+from .forecast import origin_states
+from .metrics import scores
+
+BACKFILL_HORIZON = (FORECAST_END - FORECAST_START).days + 1   # 운영 예측(09/13~12/31)과 같은 길이
+
+
+def backfill(model, raw: pd.DataFrame, feature_cols, fill_values, origins, horizon=BACKFILL_HORIZON,
+             target: str = TARGET_COL, use_yoy: bool = USE_YOY, ffill: bool = False) -> pd.DataFrame:
+    """
+    원점별 순차 예측 (long 형식: origin, horizon, date, pred, actual — 실측 없으면 NaN).
+    각 원점의 결과는 recursive_forecast_force(start_date=origin) 와 같다.
+    """
+    origins = pd.DatetimeIndex(origins)
+    state = origin_states(raw[["date", target]], origins, target, use_yoy, ffill)
+    preds = np.empty((horizon, state.n))
+    for h in range(horizon):
+        preds[h] = model.predict(state.matrix(feature_cols, fill_values))
+        state.push(preds[h])
+
+    step = np.repeat(np.arange(1, horizon + 1), len(origins))
+    org = np.tile(origins.values, horizon)
+    dates = org + (step - 1).astype("timedelta64[D]")
+    actual = raw.set_index("date")[target].reindex(dates).to_numpy()
+    return pd.DataFrame({"origin": org, "horizon": step, "date": dates, "pred": preds.ravel(), "actual": actual})
+
+
+def error_curve(preds: pd.DataFrame) -> pd.DataFrame:
+    """h(1..horizon)별 n / MAE / RMSE / SMAPE (실측 있는 행만)."""
+    ok = preds.dropna(subset=["actual"])
+    rows = []
+    for h, g in ok.groupby("horizon"):
+        m = scores(g["actual"], g["pred"])
+        rows.append({"horizon": h, "n": len(g), "mae": m["mae"], "rmse": m["rmse"], "smape": m["smape"]})
+    return pd.DataFrame(rows)
+
+
+def run_backfill(cfg, data_root=".", out_dir=OUT_DIR, model_dir=MODEL_DIR, cache_dir=CACHE_DIR,
+                 archive_dir=ARCHIVE_DIR, start=None, end=None, horizon=BACKFILL_HORIZON, show=False,
+                 plot=True) -> pd.DataFrame:
+    """
+    저장 모델로 원점별 백필 → 오차 곡선 CSV(+그래프). 반환: 오차 곡선
+    - start: 첫 원점 (기본: 학습 행·검증 구간 이후 첫날 — 그 뒤 실측이 없으면 검증 구간 시작, 표본 내 경고)
+    - end  : 마지막 원점 (기본: 마지막 실측일)
+    """
+    cfg = get_commodity(cfg)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    tag = f"[{cfg.name}]"
+
+    art = load_artifact(model_dir, cfg)
+    raw = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL, cache_dir=cache_dir)
+    labeled = raw.loc[raw[TARGET_COL].notna(), "date"]
+    train_end = pd.Timestamp(art.meta.get("train_end") or art.meta.get("data_end") or labeled.min())
+    end = labeled.max() if end is None else pd.Timestamp(end)
+    if start is None:
+        # 표본 외 = 학습 행과 검증(조기종료) 구간 모두 이후
+        seen_end = max(train_end, pd.Timestamp(art.meta.get("valid_end") or train_end))
+        start = seen_end + pd.Timedelta(days=1)
+        if start > end:
+            # 마지막 레이블까지 학습/검증에 쓴 산출물(last_label 분할, --update 이후) → 검증 구간부터
+            valid_start = art.meta.get("valid_start")
+            start = pd.Timestamp(valid_start) if valid_start else end - pd.Timedelta(days=89)
+            print(f"{tag} [주의] 학습 이후 실측이 없어 검증 구간({start.date()}~)부터 백필 "
+                  f"→ 조기종료/증분 학습에 쓴 레이블이라 표본 내 오차에 가깝습니다.")
+    else:
+        start = pd.Timestamp(start)
+    if start <= train_end:
+        print(f"{tag} [주의] 원점 일부가 학습 구간(~{train_end.date()}) 안 → 표본 내 오차가 섞입니다.")
+    origins = pd.date_range(max(start, raw["date"].min() + pd.Timedelta(days=1)), end, freq="D")
+    if len(origins) == 0:
+        raise ValueError(f"{tag} 백필 원점이 없습니다 ({start.date()} ~ {end.date()}).")
+
+    t1 = time.perf_counter()
+    preds = backfill(art.model, raw, art.feature_cols, art.fill_values, origins, horizon,
+                     use_yoy=USE_YOY, ffill=cfg.ffill)
+    t_loop = time.perf_counter() - t1
+    curve = error_curve(preds)
+    print(f"{tag} 백필: 원점 {len(origins)}개 × {horizon}스텝 = 순차 예측 {len(origins)}회 "
+          f"(predict {horizon}회, {t_loop:.2f}s)")
+    table = horizon_table(preds.dropna(subset=["actual"]))
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+    csv_curve = out_dir / f"backfill_{cfg.pref}_error_by_horizon.csv"
+    csv_preds = out_dir / f"backfill_{cfg.pref}_preds.csv"
+    curve.to_csv(csv_curve, index=False, encoding="utf-8-sig")
+    preds.to_csv(csv_preds, index=False, encoding="utf-8-sig")
+    print(f"[저장] 오차 곡선 CSV: {csv_curve}")
+    print(f"[저장] 원점별 예측 : {csv_preds}")
+    if plot and not curve.empty:
+        from .plots import plot_error_curve
+        png = out_dir / f"backfill_{cfg.pref}_error_by_horizon.png"
+        plot_error_curve(cfg, curve, png, origins, show=show)
+        print(f"[저장] 오차 곡선 플롯: {png}")
+    print(f"{tag} 백필 전체 {time.perf_counter() - t0:.1f}s")
+    return curve
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale.backfill", description="원점별 순차 예측 백필")
+    ap.add_argument("item", help="품목")
+    ap.add_argument("--start", default=None, help="첫 원점 (기본: 학습 마지막 일자 다음 날)")
+    ap.add_argument("--end", default=None, help="마지막 원점 (기본: 마지막 실측일)")
+    ap.add_argument("--horizon", type=int, default=BACKFILL_HORIZON, help="원점마다 예측할 일수")
+    ap.add_argument("--data-root", default=".")
+    ap.add_argument("--out-dir", default=str(OUT_DIR))
+    ap.add_argument("--model-dir", default=str(MODEL_DIR))
+    ap.add_argument("--no-plot", action="store_true")
+    args = ap.parse_args(argv)
+    run_backfill(args.item, data_root=args.data_root, out_dir=args.out_dir, model_dir=args.model_dir,
+                 start=args.start, end=args.end, horizon=args.horizon, plot=not args.no_plot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
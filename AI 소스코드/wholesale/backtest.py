@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+워크포워드(롤링 원점) 백테스트
+- 원점(origin)마다: origin 이전 레이블로 학습 → origin 부터 horizon 일 순차 예측(예측값을 다음 입력으로, 운영 예측과 같음)
+  → [origin, origin + horizon) 레이블 평가 (비교용으로 실측 입력 1-step 예측도 pred_onestep 에 남김)
+    expanding: 처음부터 origin 전날까지 / sliding: origin 직전 train_days 일
+    검증(EarlyStopping)은 학습 구간의 마지막 90일 (split_train_valid 와 같은 규칙)
+- 피처는 1회만 계산 → 폴드는 날짜 마스크로 잘라 씀
+- 폴드는 프로세스 풀 병렬 (피처 행렬은 워커 초기화 때 1회 전달)
+- 결과: horizon(원점 후 경과 일수) 구간별 순차 예측 MAE/RMSE/SMAPE 한 표
+
+    python -m wholesale.backtest 양파                      # 2022~ 월별 원점, 28일 horizon
+    python -m wholesale.backtest 배추 --window sliding --train-days 730 --freq QS --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import ARCHIVE_DIR, CACHE_DIR, FORECAST_END, OUT_DIR, STORE_DIR, TARGET_COL, USE_YOY, get_commodity
+from .forecast import origin_states
+
+BACKTEST_START   = "2022-01-01"
+BACKTEST_HORIZON = 28
+HORIZON_BINS     = (1, 8, 15, 22, 29, 57, 113)   # 구간 시작일: 1-7, 8-14, 15-21, 22-28, 29-56, 57-112, 113+
+VALID_DAYS       = 90
+
+
+# =======================
+# 폴드 구성
+# =======================
+def fold_origins(dates, start=BACKTEST_START, end=None, freq="MS") -> pd.DatetimeIndex:
+    """레이블 일자 범위 안의 원점 목록 (기본: start 부터 월초마다)."""
+    dates = pd.DatetimeIndex(dates)
+    end = dates.max() if end is None else pd.Timestamp(end)
+    return pd.date_range(pd.Timestamp(start), end, freq=freq)
+
+
+def make_folds(dates, origins, horizon=BACKTEST_HORIZON, window="expanding", train_days=None,
+               valid_days=VALID_DAYS) -> list:
+    """
+    dates: 레이블 있는 행의 일자(오름차순). 반환: 폴드 dict 목록
+    (origin, train/valid/test 행 인덱스) — 학습 또는 평가가 빈 원점은 제외
+    """
+    if window not in ("expanding", "sliding"):
+        raise ValueError(f"window 는 expanding/sliding 중 하나: {window}")
+    if window == "sliding" and not train_days:
+        raise ValueError("sliding 창에는 train_days 가 필요합니다.")
+    d = np.asarray(pd.DatetimeIndex(dates).values.astype("datetime64[D]"))
+    folds = []
+    for origin in pd.DatetimeIndex(origins):
+        o = np.datetime64(origin.date(), "D")
+        lo = o - np.timedelta64(int(train_days), "D") if window == "sliding" else d.min()
+        fit = np.flatnonzero((d >= lo) & (d < o))
+        test = np.flatnonzero((d >= o) & (d < o + np.timedelta64(int(horizon), "D")))
+        if len(fit) == 0 or len(test) == 0:
+            continue
+        cut = d[fit].max() - np.timedelta64(valid_days - 1, "D")
+        train, valid = fit[d[fit] < cut], fit[d[fit] >= cut]
+        if len(train) == 0:
+            continue
+        folds.append({"origin": origin, "horizon": int(horizon), "train": train, "valid": valid, "test": test})
+    return folds
+
+
+# =======================
+# 폴드 실행 (워커)
+# =======================
+_DATA = {}
+
+
+def _init_fold_worker(X, y, w, dates, feature_cols, n_threads, series, use_yoy, ffill):
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(n_threads)
+    _DATA.update(X=X, y=y, w=w, dates=dates, feature_cols=feature_cols, n_threads=n_threads,
+                 series=series, use_yoy=use_yoy, ffill=ffill)
+
+
+def _recursive(model, origin, horizon, feature_cols, fill_values) -> np.ndarray:
+    """origin 부터 horizon 일 순차 예측 (recursive_forecast_force 와 같은 상태 갱신)."""
+    state = origin_states(_DATA["series"], [origin], "y", _DATA["use_yoy"], _DATA["ffill"])
+    preds = np.empty(horizon)
+    for h in range(horizon):
+        preds[h] = model.predict(state.matrix(feature_cols, fill_values))[0]
+        state.push(preds[h])
+    return preds
+
+
+def _fit_fold(fold, params=None):
+    from .pipeline import compute_fill_values, fit_model
+
+    t0 = time.perf_counter()
+    X, y, w, cols = _DATA["X"], _DATA["y"], _DATA["w"], _DATA["feature_cols"]
+    frame = lambda idx: pd.DataFrame(X[idx], columns=cols)   # noqa: E731
+    tr, va, te = fold["train"], fold["valid"], fold["test"]
+    model = fit_model(frame(tr), y[tr], w[tr], frame(va), y[va], try_gpu=False,
+                      n_jobs=_DATA["n_threads"], params=params)
+    dates = _DATA["dates"][te]
+    step = (dates - np.datetime64(fold["origin"].date(), "D")).astype(int) + 1
+    rec = _recursive(model, fold["origin"], fold["horizon"], cols, compute_fill_values(frame(tr), cols))
+    return {
+        "origin": fold["origin"],
+        "date": dates,
+        "horizon": step,
+        "actual": y[te],
+        "pred": rec[step - 1],
+        "pred_onestep": model.predict(frame(te)),
+        "train_rows": len(tr),
+        "best_iteration": getattr(model, "best_iteration", None) if len(va) else None,
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+# =======================
+# 집계
+# =======================
+def horizon_table(preds: pd.DataFrame, bins=HORIZON_BINS) -> pd.DataFrame:
+    """원점별 예측 → horizon 구간별 n / MAE / RMSE / SMAPE (+ 전체)."""
+    from .metrics import scores
+
+    edges = list(bins) + [np.inf]
+    labels = [f"{a}-{int(b) - 1}" if np.isfinite(b) else f"{a}+" for a, b in zip(edges[:-1], edges[1:])]
+    bucket = pd.cut(preds["horizon"], edges, right=False, labels=labels)
+    rows = []
+    for label, g in list(preds.groupby(bucket, observed=True)) + [("전체", preds)]:
+        m = scores(g["actual"], g["pred"])
+        rows.append({"horizon": label, "n": len(g), "origins": g["origin"].nunique(),
+                     "mae": m["mae"], "rmse": m["rmse"], "smape": m["smape"]})
+    return pd.DataFrame(rows)
+
+
+def walk_forward(feat: pd.DataFrame, feature_cols, cfg, origins=None, horizon=BACKTEST_HORIZON,
+                 window="expanding", train_days=None, workers=None, threads=None, params=None,
+                 start=BACKTEST_START, end=None, freq="MS", use_yoy=USE_YOY):
+    """
+    feat(build_features 결과)로 원점별 재학습 + 순차 예측 평가. 반환: (horizon 표, 폴드 표, 예측 행)
+    - 순차 예측 입력은 feat 의 date/y (원값, ffill 은 cfg.ffill) — feat 은 use_yoy 로 만든 피처여야 함
+    - origins: 원점 목록 (없으면 fold_origins(start, end, freq))
+    - workers: 동시 폴드 수 (기본: min(폴드 수, 코어 수)) / threads: 폴드당 XGBoost 스레드
+    - params : XGB_PARAMS 덮어쓰기 (예: {"n_estimators": 1000})
+    """
+    from .pipeline import sample_weights
+    from .runner import thread_budget
+
+    cfg = get_commodity(cfg)
+    lab = feat[feat["y"].notna()].dropna(subset=list(feature_cols) + ["y"]).reset_index(drop=True)
+    dates = lab["date"].to_numpy(dtype="datetime64[D]")
+    origins = fold_origins(lab["date"], start, end, freq) if origins is None else pd.DatetimeIndex(origins)
+    folds = make_folds(dates, origins, horizon, window, train_days)
+    if not folds:
+        raise ValueError(f"[{cfg.name}] 유효한 폴드가 없습니다 (원점/horizon 을 확인하세요).")
+
+    X = lab[list(feature_cols)].to_numpy(dtype=float)
+    y = lab["y"].to_numpy(dtype=float)
+    w = sample_weights(lab["date"], cfg.dw_periods)
+    workers = workers or min(len(folds), os.cpu_count() or 1)
+    n_threads = thread_budget(workers, threads)
+    init = (X, y, w, dates, list(feature_cols), n_threads, feat[["date", "y"]], use_yoy, cfg.ffill)
+    print(f"[{cfg.name}] 워크포워드 {window} · 폴드 {len(folds)}개 · horizon {horizon}일 · "
+          f"워커 {workers}개 × 스레드 {n_threads}")
+
+    if workers == 1:
+        _init_fold_worker(*init)
+        results = [_fit_fold(f, params) for f in folds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_fold_worker, initargs=init) as ex:
+            results = list(ex.map(_fit_fold, folds, [params] * len(folds)))
+
+    preds = pd.concat([pd.DataFrame({k: r[k] for k in ("origin", "date", "horizon", "actual", "pred", "pred_onestep")})
+                       for r in results], ignore_index=True)
+    fold_tab = pd.DataFrame([{k: r[k] for k in ("origin", "train_rows", "best_iteration", "seconds")}
+                             for r in results])
+    return horizon_table(preds), fold_tab, preds
+
+
+def run_walk_forward(cfg, data_root=".", out_dir=OUT_DIR, cache_dir=CACHE_DIR, archive_dir=ARCHIVE_DIR,
+                     store_dir=STORE_DIR, **kwargs) -> pd.DataFrame:
+    """품목 1개 워크포워드 → 표 출력 + CSV 저장. kwargs 는 walk_forward 인자."""
+    from .archive import load_commodity_raw
+    from .feature_store import materialize, store_path
+    from .features import feature_columns
+
+    cfg = get_commodity(cfg)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    raw = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL, cache_dir=cache_dir)
+    feat = materialize(raw, TARGET_COL, store_path(store_dir, cfg) if store_dir else None, USE_YOY, cfg.ffill).feat
+    table, folds, preds = walk_forward(feat, feature_columns(feat, TARGET_COL), cfg, **kwargs)
+
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    csv_table = out_dir / f"backtest_wf_{cfg.pref}_by_horizon.csv"
+    csv_preds = out_dir / f"backtest_wf_{cfg.pref}_preds.csv"
+    table.to_csv(csv_table, index=False, encoding="utf-8-sig")
+    preds.merge(folds, on="origin").to_csv(csv_preds, index=False, encoding="utf-8-sig")
+    print(f"[저장] horizon 표: {csv_table}")
+    print(f"[저장] 원점별 예측: {csv_preds}")
+    print(f"[{cfg.name}] 워크포워드 {time.perf_counter() - t0:.1f}s (폴드 학습 합 {folds['seconds'].sum():.1f}s)")
+    return table
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale.backtest", description="워크포워드 백테스트")
+    ap.add_argument("item", help="품목")
+    ap.add_argument("--start", default=BACKTEST_START, help="첫 원점")
+    ap.add_argument("--end", default=None, help="마지막 원점 (기본: 마지막 레이블 일자)")
+    ap.add_argument("--freq", default="MS", help="원점 간격 (pandas freq: MS 월초, QS 분기초, 14D ...)")
+    ap.add_argument("--horizon", type=int, default=BACKTEST_HORIZON, help="원점마다 평가할 일수")
+    ap.add_argument("--window", choices=("expanding", "sliding"), default="expanding")
+    ap.add_argument("--train-days", type=int, default=None, help="sliding 창 길이(일)")
+    ap.add_argument("--rounds", type=int, default=None, help="n_estimators 덮어쓰기 (기본: XGB_PARAMS)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--data-root", default=".")
+    ap.add_argument("--out-dir", default=str(OUT_DIR))
+    args = ap.parse_args(argv)
+
+    run_walk_forward(args.item, data_root=args.data_root, out_dir=args.out_dir,
+                     start=args.start, end=args.end, freq=args.freq, horizon=args.horizon, window=args.window, train_days=args.train_days,
+                     workers=args.workers, threads=args.threads,
+                     params={"n_estimators": args.rounds} if args.rounds else None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
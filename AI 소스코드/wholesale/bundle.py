@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+모바일용 예측 번들 (전 품목 1파일, 바이너리)
+- 예측 CSV(pred_2025_*_forecast_*.csv)들을 모아 공통 시작일 + 고정 일 간격 + int32 델타 열로 저장
+- 값은 원 단위 정수(반올림)로 바꾼 뒤 열마다 [첫 값, 차분, 차분, ...] → 복원은 누적합 1회
+- 리틀 엔디언, 헤더 24바이트 (버전 필드로 구조 변경 구분)
+
+    offset  형식   내용
+    0       4s     매직 b"WSFB"
+    4       u16    BUNDLE_VERSION
+    6       u16    플래그 (예약, 0)
+    8       i32    시작일 (1970-01-01 기준 일수)
+    12      u16    간격(일)
+    14      u16    일수 n_days
+    16      u16    품목 수
+    18      u16    배율 scale (값 = 정수 / scale)
+    20      u32    본문 바이트 수
+    24      본문 — 품목마다: u8 이름 길이 + UTF-8 이름, u8 열 수, (u8 열 이름 길이 + 열 이름) × 열 수,
+                   이어서 열마다 int32 × n_days (열 순서대로)
+
+    python -m wholesale.bundle                       # outputs_daily → outputs_daily/forecast_bundle.bin
+    python -m wholesale.bundle --check               # 저장 후 디코드해 CSV 와 비교
+
+참조 디코더: decode_bundle (Python), flutter_application_1/lib/services/forecast_bundle.dart (Dart)
+"""
+
+import argparse
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import COMMODITIES, FORECAST_END, FORECAST_START, OUT_DIR, get_commodity
+
+BUNDLE_MAGIC   = b"WSFB"
+BUNDLE_VERSION = 1
+BUNDLE_NAME    = "forecast_bundle.bin"
+_HEADER = struct.Struct("<4sHHiHHHHI")
+_EPOCH  = pd.Timestamp("1970-01-01")
+
+
+def _pstr(s: str) -> bytes:
+    b = s.encode("utf-8")
+    if len(b) > 255:
+        raise ValueError(f"bundle: 이름이 너무 깁니다 ({len(b)}바이트): {s}")
+    return bytes([len(b)]) + b
+
+
+def encode_bundle(frames: dict, start=None, stride=1, scale=1) -> bytes:
+    """
+    frames: 품목명 → DataFrame(date + 값 열들). 모든 품목이 같은 일자 격자(start, stride, 일수)여야 한다.
+    결측이 있는 열은 제외한다. 반환: 번들 바이트
+    """
+    if not frames:
+        raise ValueError("bundle: 품목이 없습니다.")
+    grids = {name: pd.DatetimeIndex(df["date"]) for name, df in frames.items()}
+    first = next(iter(grids.values()))
+    start = first[0] if start is None else pd.Timestamp(start)
+    n_days = len(first)
+    want = pd.date_range(start, periods=n_days, freq=f"{stride}D")
+    for name, dates in grids.items():
+        if not dates.equals(want):
+            raise ValueError(f"bundle: '{name}' 의 일자가 공통 격자({start.date()}, {stride}일 × {n_days})와 다릅니다.")
+
+    body = bytearray()
+    for name, df in frames.items():
+        cols = [c for c in df.columns if c != "date" and df[c].notna().all()]
+        body += _pstr(name) + bytes([len(cols)])
+        for c in cols:
+            body += _pstr(c)
+        for c in cols:
+            v = np.rint(df[c].to_numpy(dtype=float) * scale).astype(np.int64)
+            d = np.diff(v, prepend=0)
+            if np.abs(d).max(initial=0) > np.iinfo(np.int32).max:
+                raise ValueError(f"bundle: '{name}.{c}' 값 범위가 int32 델타를 넘습니다.")
+            body += d.astype("<i4").tobytes()
+    header = _HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, (start - _EPOCH).days, stride, n_days,
+                          len(frames), scale, len(body))
+    return header + bytes(body)
+
+
+def decode_bundle(data: bytes) -> dict:
+    """번들 바이트 → 품목명 → DataFrame(date + 열들) (참조 디코더)."""
+    if len(data) < _HEADER.size:
+        raise ValueError("bundle: 헤더보다 짧습니다.")
+    magic, version, _flags, start, stride, n_days, n_items, scale, body_len = _HEADER.unpack_from(data)
+    if magic != BUNDLE_MAGIC:
+        raise ValueError(f"bundle: 매직 불일치 {magic!r}")
+    if version != BUNDLE_VERSION:
+        raise ValueError(f"bundle: 지원하지 않는 버전 {version} (지원: {BUNDLE_VERSION})")
+    if len(data) < _HEADER.size + body_len:
+        raise ValueError("bundle: 본문이 잘렸습니다.")
+    dates = pd.date_range(_EPOCH + pd.Timedelta(days=start), periods=n_days, freq=f"{stride}D")
+
+    pos, out = _HEADER.size, {}
+
+    def _read_str():
+        nonlocal pos
+        n = data[pos]
+        s = bytes(data[pos + 1: pos + 1 + n]).decode("utf-8")
+        pos += 1 + n
+        return s
+
+    for _ in range(n_items):
+        name = _read_str()
+        n_cols = data[pos]
+        pos += 1
+        cols = [_read_str() for _ in range(n_cols)]
+        df = pd.DataFrame({"date": dates})
+        for c in cols:
+            d = np.frombuffer(data, dtype="<i4", count=n_days, offset=pos)
+            df[c] = np.cumsum(d, dtype=np.int64) / scale
+            pos += 4 * n_days
+        out[name] = df
+    return out
+
+
+def forecast_csv(cfg, out_dir=OUT_DIR) -> Path:
+    span = f"{FORECAST_START.strftime('%Y%m%d')}_{FORECAST_END.strftime('%Y%m%d')}"
+    return Path(out_dir) / f"pred_2025_{cfg.pref}_forecast_{span}.csv"
+
+
+def export_bundle(names=None, out_dir=OUT_DIR, path=None) -> Path:
+    """out_dir 의 품목별 예측 CSV → 번들 1개 (CSV 없는 품목은 건너뜀). 반환: 번들 경로"""
+    frames = {}
+    for name in names or COMMODITIES:
+        cfg = get_commodity(name)
+        csv = forecast_csv(cfg, out_dir)
+        if not csv.exists():
+            print(f"[bundle] {cfg.name}: 예측 CSV 없음 → 제외 ({csv})")
+            continue
+        frames[cfg.name] = pd.read_csv(csv, parse_dates=["date"], encoding="utf-8-sig")
+    data = encode_bundle(frames)
+    path = Path(path) if path else Path(out_dir) / BUNDLE_NAME
+    path.write_bytes(data)
+    csv_bytes = sum(forecast_csv(get_commodity(n), out_dir).stat().st_size for n in frames)
+    print(f"[bundle] 품목 {len(frames)}개 → {path} ({len(data):,}B, CSV 합 {csv_bytes:,}B)")
+    return path
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale.bundle", description="모바일용 예측 번들 내보내기")
+    ap.add_argument("items", nargs="*", help=f"품목 (기본: 전체 — {', '.join(COMMODITIES)})")
+    ap.add_argument("--out-dir", default=str(OUT_DIR), help="예측 CSV 위치")
+    ap.add_argument("--path", default=None, help=f"번들 경로 (기본: out-dir/{BUNDLE_NAME})")
+    ap.add_argument("--check", action="store_true", help="디코드해 CSV 와 비교 (원 단위 반올림 오차 ≤ 0.5)")
+    args = ap.parse_args(argv)
+
+    path = export_bundle(args.items or None, args.out_dir, args.path)
+    if args.check:
+        for name, df in decode_bundle(path.read_bytes()).items():
+            ref = pd.read_csv(forecast_csv(get_commodity(name), args.out_dir), encoding="utf-8-sig")
+            err = max(float(np.abs(df[c].to_numpy() - ref[c].to_numpy()).max()) for c in df.columns if c != "date")
+            print(f"[bundle] {name}: 열 {len(df.columns) - 1}개 · 최대 오차 {err:.3f}")
+            if err > 0.5:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
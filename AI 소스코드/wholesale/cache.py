@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+파싱 결과 캐시 (CSV → (date, 평균가))
+- 키: 파일 내용 해시(blake2b) + 파서 버전 + 타깃 컬럼 → 파일명/수정시각이 바뀌어도 내용이 같으면 적중
+- 저장: 컬럼별 배열(.npz: date=datetime64(파싱 결과 단위 그대로), value=float64) — 로드는 파싱 없이 배열 2개만 읽음
+- 새 파일/수정된 파일만 파싱 → 수집 시간은 '바뀐 파일 수'에 비례
+"""
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PARSER_VERSION = 2   # read_one_csv 결과가 바뀌면 올릴 것 (기존 캐시 무효화)
+
+
+def content_key(data: bytes, target: str) -> str:
+    h = hashlib.blake2b(data, digest_size=16)
+    h.update(f"|v{PARSER_VERSION}|{target}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _load(path: Path, target: str) -> pd.DataFrame:
+    with np.load(path) as z:
+        return pd.DataFrame({"date": z["date"], target: z["value"]})
+
+
+def _save(path: Path, df: pd.DataFrame, target: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 임시 파일에 쓰고 교체 → 병렬 워커가 동시에 써도 깨진 캐시를 읽지 않음
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f,
+                     date=df["date"].to_numpy(),
+                     value=df[target].to_numpy(dtype=float))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def read_cached(path, parse, target: str, cache_dir) -> tuple:
+    """
+    parse(path) 결과를 내용 해시로 캐시. 반환: (DataFrame, 캐시 적중 여부)
+    - 파싱 실패(ValueError 등)는 캐시하지 않고 그대로 전달
+    """
+    path = Path(path)
+    return cached_parse(content_key(path.read_bytes(), target), lambda: parse(path), target, cache_dir)
+
+
+def cached_parse(key: str, parse, target: str, cache_dir) -> tuple:
+    """키(content_key)로 캐시 조회, 없으면 parse() 후 저장. zip 멤버처럼 경로가 없는 입력용."""
+    entry = Path(cache_dir) / f"{key}.npz"
+    if entry.exists():
+        try:
+            return _load(entry, target), True
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            pass   # 손상된 항목 → 다시 파싱해 덮어씀
+    df = parse()
+    _save(entry, df, target)
+    return df, False
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+품목별 설정 + 공통 설정
+- 품목 스크립트(감자/고구마/무/배추/양파)의 차이는 여기에만 둔다
+  (DATA_DIR, 파일명 접두어, 그래프 제목, 다운웨이트 기간, 피처/스플릿 변형)
+- 새 품목은 COMMODITIES 에 한 줄 추가
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+# =======================
+# 공통 설정
+# =======================
+TARGET_COL = "평균가"
+OUT_DIR    = Path("outputs_daily")
+CACHE_DIR  = Path(".cache/wholesale")   # 파싱 결과 캐시 (None 이면 매번 파싱)
+STORE_DIR  = CACHE_DIR / "features"     # 품목별 피처 저장소 (None 이면 매번 build_features)
+ARCHIVE_DIR = Path("../농산물 도매가격 데이터")   # 원본 zip 위치 (품목 폴더가 없으면 zip 에서 직접 수집)
+MODEL_DIR  = Path("models")   # 학습 산출물 (부스터 + meta.json) — --forecast-only 가 사용
+TUNE_DIR   = MODEL_DIR / "tune"   # 하이퍼파라미터 탐색 결과 ({pref}_best.json) — --tuned 가 사용
+SPEC_DIR   = MODEL_DIR / "features"   # 피처 가지치기 사양 ({pref}_features.json) — --pruned 가 사용
+
+USE_YOY        = False
+FEATURE_BACKEND = "pandas"   # 가격 단위 피처 계산: pandas / numpy (feature_kernels 융합 커널, numba 있으면 JIT)
+ENGINE          = "pandas"   # 수집/병합/달력/피처 실행 경로: pandas / arrow (arrow_engine — pyarrow Acero 계획)
+ENGINES         = ("pandas", "arrow")
+EVAL_END_2025  = pd.Timestamp("2025-09-12")
+FORECAST_START = pd.Timestamp("2025-09-13")
+FORECAST_END   = pd.Timestamp("2025-12-31")
+
+FILL_RECENT_DAYS = 180   # 미래 예측용 결측 보정(중앙값) 계산 구간
+N_SCENARIOS      = 1000  # 시나리오(몬테카를로) 경로 수 — 0이면 밴드 생략
+QUANTILES        = (0.1, 0.5, 0.9)   # 분위 회귀 예측 구간 (예측 CSV 의 pred_p10/p50/p90) — () 이면 생략
+QUANTILE_FOLDS   = 4      # 분위 모델 학습용 표본 외 잔차: 학습 구간을 확장 창 폴드로 나눠 점 모델 재학습 횟수
+
+# 미래 예측 방식: recursive 순차(되먹임) / direct horizon 구간별 직접 모델 / both 둘 다 + 비교 표
+STRATEGIES = ("recursive", "direct", "both")
+
+XGB_PARAMS = dict(
+    n_estimators=5000, learning_rate=0.01, max_depth=8,
+    subsample=0.8, colsample_bytree=0.8, reg_lambda=2.0, reg_alpha=0.0,
+    random_state=42, tree_method="hist", eval_metric="rmse",
+)
+EARLY_STOPPING_ROUNDS = 200
+
+# 일일 증분 갱신 (python -m wholesale --update)
+UPDATE_ROUNDS      = 50    # 저장 부스터 위에 이어 붙일 라운드 수
+UPDATE_WINDOW_DAYS = 90    # 이어 학습에 쓸 최근 레이블 구간
+DRIFT_THRESHOLD    = 1.5   # 새 레이블 RMSE / 학습 당시 검증 RMSE 가 이 값을 넘으면 전체 재학습
+MAX_UPDATES        = 30    # 연속 증분 갱신 횟수 상한 (넘으면 전체 재학습)
+
+
+# =======================
+# 품목 설정
+# =======================
+@dataclass(frozen=True)
+class Commodity:
+    name: str                 # 품목명 (그래프 제목/로그)
+    data_dir: str             # 이 폴더의 CSV만 사용 (일자/평균가)
+    pref: str                 # 출력 파일명 접두어
+    dw_periods: tuple = ()    # 다운웨이트 기간: ((시작, 끝, 가중치), ...)
+    subtitle: str = ""        # 통합 그래프 부제
+    ffill: bool = False       # 랙/EMA/롤링을 ffill 보정값으로 계산 (양파)
+    split: str = "year"       # "year": 2024까지 학습·마지막 90일 검증 / "last_label": 마지막 레이블 기준 90일 검증
+    try_gpu: bool = True      # gpu_hist 먼저 시도 후 CPU 폴백
+    archive: str = ""         # ARCHIVE_DIR 안의 원본 zip (data_dir 가 없을 때 사용)
+
+
+DW_2022_05_09 = ("2022-05-01", "2022-09-30", 0.3)
+
+COMMODITIES = {
+    "감자": Commodity(
+        name="감자", data_dir="감자도매_csv", pref="감자_평균가", archive="감자(수미)_csv.zip",
+        dw_periods=(DW_2022_05_09,),
+        subtitle="(학습: 2020~2024, 2022-05~09 다운웨이트 + EMA/추세 피처)",
+    ),
+    "고구마": Commodity(
+        name="고구마", data_dir="고구마도매_csv", pref="고구마_평균가", archive="고구마도매_csv.zip",
+        dw_periods=(DW_2022_05_09,),
+        subtitle="(학습: 2020~2024, 2022-05~09 다운웨이트 + EMA/추세 피처)",
+    ),
+    "무": Commodity(
+        name="무", data_dir="무도매_csv", pref="무_평균가", archive="무_csv.zip",
+        dw_periods=(DW_2022_05_09,),
+        subtitle="(학습: 2020~2024, 2022-05~09 다운웨이트 + EMA/추세 피처)",
+    ),
+    "배추": Commodity(
+        name="배추", data_dir="배추도매_csv", pref="배추_평균가", archive="배추도매_csv.zip",
+        dw_periods=(DW_2022_05_09,
+                    ("2023-09-01", "2023-09-30", 0.3),
+                    ("2024-09-01", "2024-09-30", 0.3)),
+        subtitle="(학습: 2020~2024, 2022-05~09 & 2023/2024-09 다운웨이트 + EMA/추세 피처)",
+    ),
+    "양파": Commodity(
+        name="양파", data_dir="양파도매", pref="양파_평균가", archive="양파도매.zip",
+        dw_periods=(("2022-01-01", "2022-04-30", 0.3),),   # 저장양파 소진 여파로 폭락 구간
+        subtitle="(ffill 안정화 + 2022-01~04 다운웨이트)",
+        ffill=True, split="last_label", try_gpu=False,
+    ),
+}
+
+
+def get_commodity(name) -> Commodity:
+    """품목명 → 설정 (Commodity 객체는 그대로 통과)."""
+    if isinstance(name, Commodity):
+        return name
+    try:
+        return COMMODITIES[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 품목 '{name}' (가능: {', '.join(COMMODITIES)})") from None
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+로딩
+- 품목 폴더의 CSV → (date, 평균가) 병합 → 2020~2025 제한 → 연말까지 일 단위 달력
+- 파싱: 알려진 스키마(일자/평균가, 구분/평균)는 C 엔진 + 벡터 연산 고속 경로,
+        그 외/실패 시 기존 관용 경로(python 엔진 + 정규식)로 폴백 — 결과는 동일
+- 입력: 파일 경로 또는 내용(bytes) — zip 멤버는 임시 파일 없이 bytes 로 바로 파싱 (archive.py)
+"""
+
+import io
+from glob import glob
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import read_cached
+from .config import FORECAST_END, TARGET_COL
+
+
+def _source(src):
+    """경로 또는 bytes → read_csv 입력."""
+    return io.BytesIO(src) if isinstance(src, (bytes, bytearray)) else src
+
+
+def _name(src) -> str:
+    return "<bytes>" if isinstance(src, (bytes, bytearray)) else Path(src).name
+
+
+def _header(src) -> list:
+    """첫 줄(헤더)의 컬럼명."""
+    if isinstance(src, (bytes, bytearray)):
+        end = src.find(b"\n")
+        line = src[:end if end >= 0 else len(src)]
+    else:
+        with open(src, "rb") as f:
+            line = f.readline()
+    return [c.strip() for c in line.decode("utf-8-sig").rstrip("\r\n").split(",")]
+
+
+def value_columns(columns, target: str = TARGET_COL):
+    """(일자 컬럼, 값 컬럼) — 기본 일자/평균가, 구형 구분/평균. 둘 다 없으면 None."""
+    if "일자" in columns and target in columns:
+        return "일자", target
+    if "구분" in columns and "평균" in columns:
+        return "구분", "평균"
+    return None
+
+
+def parse_dates_tolerant(s: pd.Series) -> pd.Series:
+    """날짜 파싱 (YYYY.MM.DD / YYYY-MM-DD / YYYY/MM/DD 허용, 그 외 NaT)."""
+    date_str = (
+        s.astype(str).str.replace(r"[^0-9\.\-\/]", "", regex=True)
+                     .str.replace("/", ".", regex=False)
+                     .str.replace("-", ".", regex=False)
+    )
+    return pd.to_datetime(date_str, format="%Y.%m.%d", errors="coerce")
+
+
+def parse_prices_tolerant(s: pd.Series) -> pd.Series:
+    """숫자 파싱 ('1,234원' 허용, 그 외 NaN)."""
+    return pd.to_numeric(s.astype(str).str.replace(",", "", regex=False).str.replace("원", "", regex=False).str.strip(),
+                         errors="coerce")
+
+
+def read_one_csv(path, target: str = TARGET_COL) -> pd.DataFrame:
+    """
+    path: 파일 경로 또는 CSV 내용(bytes)
+    - 기본: 일자/평균가만 사용 (다른 컬럼은 무시)
+    - 호환: 구형 포맷(구분/평균)도 자동 매핑
+    - 동일 일자 다행 존재 시 일자별 평균값으로 집계
+    - 고속 경로가 처리하지 못하는 파일은 관용 경로로 폴백
+    """
+    out = read_one_csv_fast(path, target)
+    return out if out is not None else read_one_csv_tolerant(path, target)
+
+
+def read_one_csv_tolerant(path, target: str = TARGET_COL) -> pd.DataFrame:
+    """관용 경로: 모든 컬럼 문자열로 읽고 정규식으로 날짜/숫자 정리."""
+    df = pd.read_csv(_source(path), header=0, dtype=str, encoding="utf-8", engine="python", on_bad_lines="skip")
+    df.columns = df.columns.str.strip()
+
+    # 컬럼 호환
+    cols = value_columns(df.columns, target)
+    if cols is None:
+        raise ValueError(f"[{_name(path)}] '일자/평균가' 또는 '구분/평균' 컬럼이 필요합니다.")
+    dt, val = parse_dates_tolerant(df[cols[0]]), parse_prices_tolerant(df[cols[1]])
+
+    out = pd.DataFrame({"date": dt, target: val}).dropna()
+    # 같은 일자 여러 행 → 일자 평균
+    out = out.groupby("date", as_index=False)[target].mean()
+    return out
+
+
+# =======================
+# 고속 경로
+# =======================
+_SEPS = (ord("."), ord("-"), ord("/"))
+_WON  = ord("원")
+_DATE_DTYPE = pd.to_datetime(pd.Series(["2000.01.01"]), format="%Y.%m.%d").dtype   # 관용 경로와 같은 단위
+
+
+def _codepoints(s: pd.Series) -> np.ndarray:
+    """문자열 Series → (행, 최대길이) 코드포인트 행렬 (짧은 문자열은 0으로 채움)."""
+    u = np.asarray(s.fillna("").to_numpy(dtype=object), dtype=str)
+    width = max(u.dtype.itemsize // 4, 1)
+    return np.ascontiguousarray(u, dtype=f"U{width}").view(np.uint32).reshape(len(u), width)
+
+
+def parse_dates_fast(s: pd.Series):
+    """YYYY.MM.DD / YYYY-MM-DD / YYYY/MM/DD (정확히 10자) → datetime64. 형식 밖 행이 있으면 None."""
+    cp = _codepoints(s)
+    if cp.shape[1] < 10:
+        cp = np.pad(cp, ((0, 0), (0, 10 - cp.shape[1])))
+    empty = cp[:, 0] == 0
+    if cp.shape[1] > 10 and (cp[:, 10] != 0).any():
+        return None
+    d = cp[:, :10].astype(np.int64) - 48
+    digit = (d >= 0) & (d <= 9)
+    pos = [0, 1, 2, 3, 5, 6, 8, 9]
+    layout = digit[:, pos].all(axis=1) & np.isin(cp[:, 4], _SEPS) & np.isin(cp[:, 7], _SEPS)
+    if not (layout | empty).all():
+        return None
+    year  = d[:, 0]*1000 + d[:, 1]*100 + d[:, 2]*10 + d[:, 3]
+    month = d[:, 5]*10 + d[:, 6]
+    day   = d[:, 8]*10 + d[:, 9]
+    ok = layout & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    year, month, day = np.where(ok, year, 1970), np.where(ok, month, 1), np.where(ok, day, 1)
+    ym = (year - 1970).astype("M8[Y]").astype("M8[M]") + (month - 1).astype("m8[M]")
+    dt = ym.astype("M8[D]") + (day - 1).astype("m8[D]")
+    ok &= dt.astype("M8[M]") == ym   # 02-30 같은 없는 날짜 → NaT (관용 경로의 errors="coerce"와 동일)
+    return np.where(ok, dt, np.datetime64("NaT")).astype(_DATE_DTYPE)
+
+
+def parse_prices_fast(s: pd.Series):
+    """'1,234원' / '36160' → float. 숫자·쉼표·'원' 외 문자가 있으면 None."""
+    cp = _codepoints(s)
+    digit = (cp >= 48) & (cp <= 57)
+    if not (digit | (cp == 0) | (cp == ord(",")) | (cp == _WON)).all():
+        return None
+    val = np.zeros(len(cp))
+    for j in range(cp.shape[1]):
+        val = np.where(digit[:, j], val*10 + (cp[:, j].astype(np.int64) - 48), val)
+    val[~digit.any(axis=1)] = np.nan
+    return val
+
+
+def read_one_csv_fast(path, target: str = TARGET_COL):
+    """
+    고속 경로: 헤더로 스키마 확인 → C 엔진으로 읽기 → 날짜/가격을 코드포인트 행렬 연산으로 파싱.
+    처리할 수 없으면 None (호출 측에서 관용 경로로 폴백).
+    """
+    try:
+        header = _header(path)
+        if value_columns(header, target) is None:
+            return None
+        date_col, val_col = value_columns(header, target)
+        df = pd.read_csv(_source(path), header=0, dtype=str, encoding="utf-8", engine="c", on_bad_lines="skip")
+        df.columns = df.columns.str.strip()
+        if list(df.columns) != header:
+            return None
+        dt  = parse_dates_fast(df[date_col])
+        val = parse_prices_fast(df[val_col])
+    except (OSError, UnicodeDecodeError, ValueError, pd.errors.ParserError):
+        return None
+    if dt is None or val is None:
+        return None
+
+    out = pd.DataFrame({"date": dt, target: val}).dropna()
+    # 같은 일자 여러 행 → 일자 평균
+    return out.groupby("date", as_index=False)[target].mean()
+
+
+def merge_frames(frames, end_date=FORECAST_END, target: str = TARGET_COL) -> pd.DataFrame:
+    """파일별 (date, 값) → 중복 일자 제거 → 2020~2025 제한 → end_date 까지 일 단위 달력."""
+    raw = (pd.concat(frames, ignore_index=True)
+           .drop_duplicates(subset=["date"])
+           .sort_values("date"))
+    # 학습/평가 범위 제한 (안전)
+    raw = raw[(raw["date"].dt.year>=2020) & (raw["date"].dt.year<=2025)].copy()
+
+    # 날짜 뼈대(연말까지)
+    full_dates = pd.date_range(raw["date"].min(), end_date, freq="D")
+    return raw.set_index("date").reindex(full_dates).rename_axis("date").reset_index()[["date", target]]
+
+
+def read_csvs(paths, target: str = TARGET_COL, cache_dir=None) -> list:
+    """파일별 파싱 결과 목록. cache_dir 가 있으면 내용 해시 캐시 사용(바뀐 파일만 파싱)."""
+    if cache_dir is None:
+        return [read_one_csv(Path(p), target) for p in paths]
+    frames, hits = [], 0
+    for p in paths:
+        df, hit = read_cached(p, lambda q: read_one_csv(q, target), target, cache_dir)
+        frames.append(df)
+        hits += hit
+    if hits < len(paths):
+        print(f"[캐시] 파싱 {len(paths) - hits}개 / 적중 {hits}개")
+    return frames
+
+
+def load_raw(data_dir, end_date=FORECAST_END, target: str = TARGET_COL, cache_dir=None) -> pd.DataFrame:
+    """data_dir/*.csv 병합 결과 (미래 구간은 NaN)."""
+    data_dir = Path(data_dir)
+    paths = sorted(glob(str(data_dir/"*.csv")))
+    if not paths:
+        raise FileNotFoundError(f"{data_dir.resolve()} 에 CSV가 없습니다.")
+    return merge_frames(read_csvs(paths, target, cache_dir), end_date, target)
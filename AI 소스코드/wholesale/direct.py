@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+직접(direct) 다중 horizon 예측 — 순차 예측의 대안
+- 학습 행 = (원점 피처, h) → y(원점 + h - 1): 원점 피처는 원점 전날까지의 값만 사용 (build_features 행 그대로)
+  + 대상일 달력(t_*) + h  → 예측값을 되먹이지 않으므로 오차가 누적되지 않음
+- horizon 구간(1-7 / 8-28 / 29-112)마다 모델 1개, 구간 안에서는 h 를 H_STEP 간격으로 표본화해 학습 행 수 제한
+- 예측: 원점 1행을 horizon 행렬(H×F)로 펼쳐 구간별 predict 1회 → 09/13~12/31 전체가 predict 3회
+- 학습/검증 분할은 대상일 기준으로 split_train_valid 와 같은 일자 집합을 사용
+"""
+
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .config import FORECAST_END, FORECAST_START, TARGET_COL, USE_YOY
+from .forecast import history_state, origin_states
+
+HORIZON_BUCKETS = ((1, 7), (8, 28), (29, 112))   # (시작, 끝) — 운영 예측 110일을 덮음
+H_STEP          = (1, 3, 7)                      # 구간별 학습용 h 간격 (예측은 모든 h)
+TARGET_CAL      = ("t_month", "t_dow", "t_doy", "t_is_harvest", "t_sin_year", "t_cos_year")
+
+
+def target_calendar(dates) -> np.ndarray:
+    """대상일 달력 피처 (len × TARGET_CAL)."""
+    d = pd.DatetimeIndex(dates)
+    month, doy = d.month.to_numpy(), d.dayofyear.to_numpy()
+    return np.column_stack([month, d.dayofweek.to_numpy(), doy, ((month >= 9) & (month <= 11)).astype(int),
+                            np.sin(2*np.pi*doy/365.25), np.cos(2*np.pi*doy/365.25)]).astype(float)
+
+
+def direct_columns(feature_cols) -> list:
+    return list(feature_cols) + list(TARGET_CAL) + ["h"]
+
+
+def horizon_matrix(X0: np.ndarray, origins, horizons) -> np.ndarray:
+    """원점 피처(N×F)를 원점 × h 행으로 펼친 행렬 (행 순서: h 바깥, 원점 안쪽)."""
+    origins = np.asarray(pd.DatetimeIndex(origins).values.astype("datetime64[D]"))
+    horizons = np.asarray(horizons, dtype=int)
+    h = np.repeat(horizons, len(origins))
+    dates = np.tile(origins, len(horizons)) + (h - 1).astype("timedelta64[D]")
+    return np.hstack([np.tile(X0, (len(horizons), 1)), target_calendar(dates), h[:, None].astype(float)])
+
+
+@dataclass
+class DirectModel:
+    """horizon 구간별 모델 묶음."""
+    feature_cols: list
+    fill_values: pd.Series
+    models: list = field(default_factory=list)   # [(시작, 끝, 모델), ...]
+
+    @property
+    def horizon(self) -> int:
+        return max(hi for _, hi, _ in self.models)
+
+    def predict(self, X0: np.ndarray, origins, horizon) -> np.ndarray:
+        """원점 피처(N×F) → (horizon, N) 예측. 구간마다 predict 1회."""
+        if horizon > self.horizon:
+            raise ValueError(f"direct: horizon {horizon} > 학습 구간 끝 {self.horizon}")
+        out = np.empty((horizon, len(X0)))
+        for lo, hi, model in self.models:
+            hs = np.arange(lo, min(hi, horizon) + 1)
+            if len(hs):
+                out[hs - 1] = model.predict(horizon_matrix(X0, origins, hs)).reshape(len(hs), len(X0))
+        return out
+
+
+# =======================
+# 학습
+# =======================
+def direct_dataset(feat: pd.DataFrame, feature_cols, horizons):
+    """
+    feat(build_features 결과, 일 단위 연속)에서 (원점, h) 학습 행 생성.
+    반환: (X, y, 대상일) — 원점 피처 결측/대상 레이블 결측 행 제외
+    """
+    dates = feat["date"].to_numpy(dtype="datetime64[D]")
+    if len(dates) > 1 and (np.diff(dates) != np.timedelta64(1, "D")).any():
+        raise ValueError("direct_dataset: 피처 테이블이 일 단위 연속 달력이 아닙니다.")
+    F = feat[list(feature_cols)].to_numpy(dtype=float)
+    y = feat["y"].to_numpy(dtype=float)
+    ok = np.flatnonzero(~np.isnan(F).any(axis=1))
+    Xs, ys, ds = [], [], []
+    for h in horizons:
+        i = ok[ok + h - 1 < len(dates)]
+        j = i + h - 1
+        keep = ~np.isnan(y[j])
+        i, j = i[keep], j[keep]
+        Xs.append(np.hstack([F[i], target_calendar(dates[j]), np.full((len(i), 1), float(h))]))
+        ys.append(y[j])
+        ds.append(dates[j])
+    return np.vstack(Xs), np.concatenate(ys), np.concatenate(ds)
+
+
+def fit_direct(feat: pd.DataFrame, feature_cols, fill_values, cfg, n_jobs=None, params=None,
+               buckets=HORIZON_BUCKETS, steps=H_STEP) -> DirectModel:
+    """구간별 모델 학습 (분할/가중치/조기종료는 파이프라인 규칙과 동일)."""
+    from .pipeline import fit_model, sample_weights, split_train_valid
+
+    train, valid = split_train_valid(feat, feature_cols, cfg)
+    tr_days = train["date"].to_numpy(dtype="datetime64[D]")
+    va_days = valid["date"].to_numpy(dtype="datetime64[D]")
+    dm = DirectModel(list(feature_cols), pd.Series(fill_values).reindex(feature_cols))
+    for (lo, hi), step in zip(buckets, steps):
+        t0 = time.perf_counter()
+        X, y, d = direct_dataset(feat, feature_cols, range(lo, hi + 1, step))
+        tr, va = np.isin(d, tr_days), np.isin(d, va_days)
+        model = fit_model(X[tr], y[tr], sample_weights(d[tr], cfg.dw_periods), X[va], y[va],
+                          try_gpu=cfg.try_gpu, n_jobs=n_jobs, params=params)
+        dm.models.append((lo, hi, model))
+        print(f"[{cfg.name}] direct h{lo}-{hi}: 학습 {tr.sum()}행 / 검증 {va.sum()}행 · "
+              f"best_it {getattr(model, 'best_iteration', None)} ({time.perf_counter() - t0:.1f}s)")
+    return dm
+
+
+# =======================
+# 예측
+# =======================
+def direct_forecast(dm: DirectModel, raw: pd.DataFrame, start=FORECAST_START, end=FORECAST_END,
+                    target: str = TARGET_COL, use_yoy: bool = USE_YOY, ffill: bool = False) -> pd.DataFrame:
+    """start~end 직접 예측 (recursive_forecast_force 와 같은 date/pred 형식)."""
+    state = history_state(raw[["date", target]], start, target, use_yoy, ffill)
+    dates = pd.date_range(start, end, freq="D")
+    pred = dm.predict(state.matrix(dm.feature_cols, dm.fill_values), [start], len(dates))
+    return pd.DataFrame({"date": dates, "pred": pred[:, 0]})
+
+
+def direct_backfill(dm: DirectModel, raw: pd.DataFrame, origins, horizon, target: str = TARGET_COL,
+                    use_yoy: bool = USE_YOY, ffill: bool = False) -> pd.DataFrame:
+    """원점별 직접 예측 (backfill.backfill 과 같은 long 형식)."""
+    origins = pd.DatetimeIndex(origins)
+    state = origin_states(raw[["date", target]], origins, target, use_yoy, ffill)
+    preds = dm.predict(state.matrix(dm.feature_cols, dm.fill_values), origins, horizon)
+    step = np.repeat(np.arange(1, horizon + 1), len(origins))
+    org = np.tile(origins.values, horizon)
+    dates = org + (step - 1).astype("timedelta64[D]")
+    actual = raw.set_index("date")[target].reindex(dates).to_numpy()
+    return pd.DataFrame({"origin": org, "horizon": step, "date": dates, "pred": preds.ravel(), "actual": actual})
+
+
+def compare_strategies(model, dm: DirectModel, raw: pd.DataFrame, feature_cols, fill_values, cfg, origins,
+                       horizon=None) -> tuple:
+    """
+    같은 원점들에서 순차 vs 직접 예측 → horizon 구간별 MAE/RMSE/SMAPE 나란히 + 지연 시간.
+    반환: (비교 표, {"recursive": 초, "direct": 초})  — 지연은 운영 예측(09/13~12/31) 1회 기준
+    """
+    from .backfill import backfill
+    from .backtest import horizon_table
+    from .forecast import recursive_forecast_force
+
+    horizon = horizon or (FORECAST_END - FORECAST_START).days + 1
+    base = raw[["date", TARGET_COL]]
+    rec = backfill(model, base, feature_cols, fill_values, origins, horizon, use_yoy=USE_YOY, ffill=cfg.ffill)
+    drc = direct_backfill(dm, base, origins, horizon, use_yoy=USE_YOY, ffill=cfg.ffill)
+    keys = ["horizon", "n", "origins"]
+    table = horizon_table(rec.dropna(subset=["actual"])).merge(
+        horizon_table(drc.dropna(subset=["actual"])), on=keys, suffixes=("_recursive", "_direct"))
+
+    t0 = time.perf_counter()
+    recursive_forecast_force(model, base, FORECAST_START, FORECAST_END, feature_cols, fill_values,
+                             use_yoy=USE_YOY, ffill=cfg.ffill)
+    t1 = time.perf_counter()
+    direct_forecast(dm, base, ffill=cfg.ffill)
+    t2 = time.perf_counter()
+    return table, {"recursive": round(t1 - t0, 4), "direct": round(t2 - t1, 4)}
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+가격 단위 피처 커널 (build_features(backend="numpy") 용)
+- 랙/EMA/롤링 평균·표준편차/차분·수익률(+YoY)을 연속 float64 가격 배열 1개에서 미리 할당한 n×K 배열로 계산
+  (pandas 경로의 shift/rolling/ewm 중간 Series 없음)
+- numba 가 설치되어 있으면 한 번의 루프(JIT)로 전 컬럼을 채움 (롤링은 창마다 2-pass), 없으면 NumPy 경로:
+  랙/차분은 슬라이스 대입, 롤링은 누적합 차 (O(n)), EMA 만 스칼라 루프 (재귀식)
+- 규칙은 pandas 와 같음: rolling(min_periods=1, ddof=1), ewm(adjust=False, ignore_na=False), 결측은 NaN 전파
+  → 값은 부동소수 오차 수준까지 일치. 단 값이 모두 같은 창의 rstd 는 커널이 정확히 0,
+    pandas 는 온라인 갱신 잔차(가격 수준 × 1e-7 정도)를 남김
+"""
+
+import numpy as np
+
+from .feature_state import EMA_SPANS, LAGS, WINDOWS, YOY_LAGS
+
+try:
+    import numba
+except ImportError:   # 선택 의존성 — 없으면 NumPy 경로
+    numba = None
+
+
+def kernel_columns(use_yoy: bool = False) -> list:
+    """커널 출력 컬럼 순서: 랙, EMA, 롤링(rmean/rstd), 차분·수익률, (YoY)."""
+    cols = [f"lag_{L}" for L in LAGS] + [f"ema_{sp}" for sp in EMA_SPANS]
+    cols += [f"{k}_{W}" for W in WINDOWS for k in ("rmean", "rstd")]
+    cols += ["diff_1", "diff_7", "ret_1", "ret_7"]
+    if use_yoy:
+        cols += [f"lag_{L}" for L in YOY_LAGS] + ["yoy_diff", "yoy_ratio"]
+    return cols
+
+
+def backend_name() -> str:
+    return "numba" if numba is not None else "numpy"
+
+
+def _ffill(y: np.ndarray) -> np.ndarray:
+    """직전 유효값으로 채움 (앞쪽 결측은 그대로)."""
+    idx = np.where(np.isnan(y), 0, np.arange(len(y)))
+    np.maximum.accumulate(idx, out=idx)
+    return y[idx]
+
+
+def _fused_loop(y, out, lags, windows, spans, yoy_lags, use_yoy):
+    """전 컬럼을 행 순서 1회 루프로 (numba 가 있으면 JIT). out 은 kernel_columns 순서 n×K."""
+    n = y.shape[0]
+    nan = np.nan
+    n_ema = spans.shape[0]
+    ema = np.full(n_ema, nan)
+    ema_wt = np.ones(n_ema)
+    for t in range(n):
+        col = 0
+        for L in lags:
+            out[t, col] = y[t - L] if t >= L else nan
+            col += 1
+
+        # EMA(y.shift(1)) — pandas ewm(adjust=False, ignore_na=False)
+        y1 = y[t - 1] if t >= 1 else nan
+        for j in range(n_ema):
+            alpha = 2.0 / (spans[j] + 1.0)
+            if ema[j] == ema[j]:
+                ema_wt[j] *= 1.0 - alpha
+                if y1 == y1:
+                    if ema[j] != y1:
+                        ema[j] = (ema_wt[j] * ema[j] + alpha * y1) / (ema_wt[j] + alpha)
+                    ema_wt[j] = 1.0
+            elif y1 == y1:
+                ema[j] = y1
+            out[t, col] = ema[j]
+            col += 1
+
+        # 롤링(y.shift(1), min_periods=1, ddof=1): 창 [t-W, t-1] 2-pass
+        for W in windows:
+            lo = t - W if t >= W else 0
+            cnt = 0
+            s = 0.0
+            for i in range(lo, t):
+                if y[i] == y[i]:
+                    cnt += 1
+                    s += y[i]
+            mean = s / cnt if cnt > 0 else nan
+            ss = 0.0
+            for i in range(lo, t):
+                if y[i] == y[i]:
+                    ss += (y[i] - mean) * (y[i] - mean)
+            out[t, col] = mean
+            out[t, col + 1] = np.sqrt(ss / (cnt - 1)) if cnt > 1 else nan
+            col += 2
+
+        # 차분·수익률 (전일 기준)
+        y2 = y[t - 2] if t >= 2 else nan
+        y8 = y[t - 8] if t >= 8 else nan
+        out[t, col] = y1 - y2
+        out[t, col + 1] = y1 - y8
+        out[t, col + 2] = y1 / y2 - 1 if y2 != 0 else (nan if y1 != y1 or y1 == 0 else np.inf * np.sign(y1))
+        out[t, col + 3] = y1 / y8 - 1 if y8 != 0 else (nan if y1 != y1 or y1 == 0 else np.inf * np.sign(y1))
+        col += 4
+
+        if use_yoy:
+            for L in yoy_lags:
+                out[t, col] = y[t - L] if t >= L else nan
+                col += 1
+            y366 = y[t - 366] if t >= 366 else nan
+            out[t, col] = y1 - y366
+            out[t, col + 1] = y1 / y366 - 1 if y366 != 0 else (nan if y1 != y1 or y1 == 0 else np.inf * np.sign(y1))
+
+
+_fused_jit = numba.njit(cache=True)(_fused_loop) if numba is not None else None
+
+
+def _shift(y: np.ndarray, k: int) -> np.ndarray:
+    out = np.full(len(y), np.nan)
+    if k < len(y):
+        out[k:] = y[:len(y) - k]
+    return out
+
+
+def _ema(x: np.ndarray, span: int) -> np.ndarray:
+    """pandas x.ewm(span, adjust=False).mean() — 재귀식이라 스칼라 루프 (list 순회)."""
+    alpha = 2.0 / (span + 1.0)
+    out = []
+    m, wt = np.nan, 1.0
+    for v in x.tolist():
+        if m == m:
+            wt *= 1.0 - alpha
+            if v == v:
+                if m != v:
+                    m = (wt * m + alpha * v) / (wt + alpha)
+                wt = 1.0
+        elif v == v:
+            m = v
+        out.append(m)
+    return np.array(out)
+
+
+def _window_sums(x: np.ndarray, W: int):
+    """행 t 까지 길이 W 후행 창(앞쪽은 부분 창)의 (유효 개수, 합, 제곱합) — 누적합 차 (O(n))."""
+    ok = ~np.isnan(x)
+    z = np.where(ok, x, 0.0)
+    hi = np.arange(1, len(x) + 1)
+    lo = np.maximum(hi - W, 0)
+    res = []
+    for v in (ok.astype(float), z, z * z):
+        c = np.concatenate([[0.0], np.cumsum(v)])
+        res.append(c[hi] - c[lo])
+    return res
+
+
+def _fused_numpy(y, out, use_yoy):
+    col = 0
+    for L in LAGS:
+        out[:, col] = _shift(y, L)
+        col += 1
+    y1 = _shift(y, 1)
+    for sp in EMA_SPANS:
+        out[:, col] = _ema(y1, sp)
+        col += 1
+    # 롤링: 기준값(첫 유효값)을 뺀 값의 누적합 차 — 정수 가격이면 합/제곱합이 정확 (pandas 온라인 갱신보다 오차 작음)
+    ref = y1[~np.isnan(y1)][0] if (~np.isnan(y1)).any() else 0.0
+    for W in WINDOWS:
+        cnt, s1, s2 = _window_sums(y1 - ref, W)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = s1 / cnt
+            var = np.maximum(s2 - s1 * mean, 0.0) / (cnt - 1)
+        out[:, col] = np.where(cnt > 0, mean + ref, np.nan)
+        out[:, col + 1] = np.where(cnt > 1, np.sqrt(var), np.nan)
+        col += 2
+    y2, y8 = _shift(y, 2), _shift(y, 8)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out[:, col] = y1 - y2
+        out[:, col + 1] = y1 - y8
+        out[:, col + 2] = y1 / y2 - 1
+        out[:, col + 3] = y1 / y8 - 1
+        col += 4
+        if use_yoy:
+            for L in YOY_LAGS:
+                out[:, col] = _shift(y, L)
+                col += 1
+            y366 = _shift(y, 366)
+            out[:, col] = y1 - y366
+            out[:, col + 1] = y1 / y366 - 1
+
+
+def level_features(y, use_yoy: bool = False, ffill: bool = False) -> tuple:
+    """
+    y: 일 단위 연속 가격 배열 (결측 NaN). 반환: (kernel_columns(use_yoy), n×K float64 배열)
+    ffill=True 면 직전 유효값으로 채운 시계열로 계산 (build_features 의 ffill 과 같음)
+    """
+    y = np.ascontiguousarray(y, dtype=float)
+    if ffill:
+        y = _ffill(y)
+    cols = kernel_columns(use_yoy)
+    out = np.empty((len(y), len(cols)))
+    if _fused_jit is not None:
+        _fused_jit(y, out, np.array(LAGS), np.array(WINDOWS), np.array(EMA_SPANS, dtype=float),
+                   np.array(YOY_LAGS), use_yoy)
+    else:
+        _fused_numpy(y, out, use_yoy)
+    return cols, out
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+피처 그룹 비용/효과 측정 + 가지치기 사양 (품목별)
+- 그룹: features.FEATURE_GROUPS (달력/주기/추세/랙/EMA/롤링/차분·수익률/YoY)
+- 비용: build_features 그룹별 계산 시간(best-of-repeat), 그룹을 뺀 모델의 학습 시간·순차 예측 시간
+- 효과: 기준 모델의 total_gain 비중, 검증 순열 중요도(그룹 컬럼을 함께 섞은 RMSE 증가),
+        그룹 제거 재학습(drop-column)의 검증 RMSE / 순차 예측 MAE 변화
+  · 학습/검증 행은 기준 모델과 같음 (split_train_valid 를 전체 컬럼으로 1회) → 컬럼만 다르게 비교
+  · 순차 예측 MAE: 검증 첫날부터 마지막 레이블까지 recursive_forecast_force (되먹임 오차 포함)
+- 가지치기: 단독 제거 시 두 지표가 모두 tol 이내로만 나빠지는 그룹을 덜 해로운 순으로 누적 제거
+  (누적 제거 모델도 tol 이내일 때만 채택)
+- 결과: SPEC_DIR/{pref}_features.json (columns → run_commodity(pruned=True) / --pruned)
+        + out_dir/feature_profile_{pref}.csv (그룹별 표)
+
+    python -m wholesale.feature_profile 양파
+    python -m wholesale.feature_profile --rounds 1500 --tol 0.02
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .archive import load_commodity_raw
+from .config import (ARCHIVE_DIR, CACHE_DIR, COMMODITIES, FORECAST_END, OUT_DIR, SPEC_DIR, STORE_DIR,
+                     TARGET_COL, USE_YOY, get_commodity)
+from .feature_store import materialize, store_path
+from .features import FEATURE_GROUPS, build_features, feature_columns, feature_group
+from .forecast import recursive_forecast_force
+from .pipeline import compute_fill_values, fit_model, sample_weights, split_train_valid
+
+SPEC_VERSION = 1
+PRUNE_TOL    = 0.01   # 검증 RMSE / 순차 MAE 허용 악화 비율
+N_PERMUTE    = 3      # 순열 중요도 반복
+
+
+def _rmse(y, p):
+    return float(np.sqrt(np.mean((np.asarray(y) - np.asarray(p)) ** 2)))
+
+
+class _Bench:
+    """같은 학습/검증 행으로 컬럼 부분집합 모델을 학습/평가."""
+
+    def __init__(self, feat, raw, cfg, n_jobs=None, params=None):
+        self.cfg, self.raw, self.n_jobs, self.params = cfg, raw, n_jobs, params
+        self.cols = feature_columns(feat, TARGET_COL)
+        self.train, self.valid = split_train_valid(feat, self.cols, cfg)
+        if len(self.valid) == 0:
+            raise ValueError("feature_profile: 검증 행이 없습니다.")
+        self.w_tr = sample_weights(self.train["date"], cfg.dw_periods)
+        self.start, self.end = self.valid["date"].min(), self.valid["date"].max()
+        self.actual = feat.set_index("date")["y"]
+
+    def evaluate(self, cols) -> dict:
+        X_tr, X_va = self.train[cols], self.valid[cols]
+        t0 = time.perf_counter()
+        model = fit_model(X_tr, self.train["y"], self.w_tr, X_va, self.valid["y"], try_gpu=False,
+                          n_jobs=self.n_jobs, params=self.params)
+        t_fit = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        rec = recursive_forecast_force(model, self.raw[["date", TARGET_COL]], self.start, self.end, cols,
+                                       compute_fill_values(X_tr, cols), use_yoy=USE_YOY, ffill=self.cfg.ffill)
+        t_fc = time.perf_counter() - t0
+        y = self.actual.reindex(rec["date"]).to_numpy()
+        ok = ~np.isnan(y)
+        return {"model": model, "valid_rmse": _rmse(self.valid["y"], model.predict(X_va)),
+                "recursive_mae": float(np.mean(np.abs(y[ok] - rec["pred"].to_numpy()[ok]))),
+                "fit_s": t_fit, "forecast_s": t_fc, "features": len(cols)}
+
+
+def _gain_share(model, cols) -> dict:
+    score = model.get_booster().get_score(importance_type="total_gain")
+    total = sum(score.values()) or 1.0
+    out = {}
+    for c in cols:
+        out[feature_group(c)] = out.get(feature_group(c), 0.0) + score.get(c, 0.0) / total
+    return out
+
+
+def _permutation(model, X_va: pd.DataFrame, y_va, groups, base_rmse, rng) -> dict:
+    out = {}
+    for g, cols in groups.items():
+        deltas = []
+        for _ in range(N_PERMUTE):
+            Xp = X_va.copy()
+            Xp[cols] = X_va[cols].to_numpy()[rng.permutation(len(X_va))]   # 그룹 컬럼을 같은 순서로 섞음
+            deltas.append(_rmse(y_va, model.predict(Xp)) / base_rmse - 1)
+        out[g] = float(np.mean(deltas))
+    return out
+
+
+def _worse(res, base, tol) -> bool:
+    return (res["valid_rmse"] > base["valid_rmse"] * (1 + tol)
+            or res["recursive_mae"] > base["recursive_mae"] * (1 + tol))
+
+
+def profile_features(cfg, data_root=".", out_dir=OUT_DIR, spec_dir=SPEC_DIR, tol=PRUNE_TOL, rounds=None,
+                     n_jobs=None, repeat=5, seed=42, cache_dir=CACHE_DIR, archive_dir=ARCHIVE_DIR,
+                     store_dir=STORE_DIR) -> pd.DataFrame:
+    """품목 1개 그룹별 측정 + 사양 저장. 반환: 그룹별 표"""
+    cfg = get_commodity(cfg)
+    tag = f"[{cfg.name}]"
+    t0 = time.perf_counter()
+    raw = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL, cache_dir=cache_dir)
+    feat = materialize(raw, TARGET_COL, store_path(store_dir, cfg) if store_dir else None, USE_YOY, cfg.ffill).feat
+
+    # 계산 비용 (build_features 그룹별, best-of-repeat)
+    cost = {}
+    for _ in range(repeat):
+        t = {}
+        build_features(raw, TARGET_COL, use_yoy=USE_YOY, ffill=cfg.ffill, timings=t)
+        cost = {g: min(v, cost.get(g, np.inf)) for g, v in t.items()}
+
+    bench = _Bench(feat, raw, cfg, n_jobs, {"n_estimators": rounds} if rounds else None)
+    groups = {g: [c for c in cols if c in bench.cols] for g, cols in FEATURE_GROUPS.items()}
+    groups = {g: cols for g, cols in groups.items() if cols}
+    base = bench.evaluate(bench.cols)
+    print(f"{tag} 기준: 피처 {base['features']}개 · 검증 RMSE {base['valid_rmse']:,.1f} · "
+          f"순차 MAE {base['recursive_mae']:,.1f} ({bench.start.date()}~{bench.end.date()})")
+
+    gain = _gain_share(base["model"], bench.cols)
+    perm = _permutation(base["model"], bench.valid[bench.cols], bench.valid["y"], groups, base["valid_rmse"],
+                        np.random.default_rng(seed))
+    rows, drops = [], {}
+    for g, cols in groups.items():
+        res = bench.evaluate([c for c in bench.cols if c not in cols])
+        drops[g] = res
+        rows.append({"group": g, "columns": len(cols), "build_ms": cost.get(g, np.nan) * 1e3,
+                     "gain_share": gain.get(g, 0.0), "permutation": perm[g],
+                     "drop_valid": res["valid_rmse"] / base["valid_rmse"] - 1,
+                     "drop_recursive": res["recursive_mae"] / base["recursive_mae"] - 1,
+                     "drop_fit_s": res["fit_s"], "drop_forecast_s": res["forecast_s"]})
+        print(f"{tag} -{g:<9} 검증 {rows[-1]['drop_valid']:+.2%} · 순차 {rows[-1]['drop_recursive']:+.2%} · "
+              f"gain {rows[-1]['gain_share']:.1%} · 순열 {perm[g]:+.2%} · 계산 {rows[-1]['build_ms']:.1f}ms")
+    table = pd.DataFrame(rows)
+
+    # 누적 제거 (덜 해로운 그룹부터)
+    candidates = [g for g in table.sort_values(["drop_valid", "drop_recursive"])["group"]
+                  if not _worse(drops[g], base, tol)]
+    dropped, final = [], base
+    for g in candidates:
+        cols = [c for c in bench.cols if feature_group(c) not in dropped + [g]]
+        res = drops[g] if not dropped else bench.evaluate(cols)
+        if _worse(res, base, tol):
+            print(f"{tag} 누적 제거 -{g}: 허용 범위 초과 → 유지")
+            continue
+        dropped.append(g)
+        final = res
+    table["dropped"] = table["group"].isin(dropped)
+    keep = [c for c in bench.cols if feature_group(c) not in dropped]
+
+    doc = {"version": SPEC_VERSION, "commodity": cfg.name, "columns": keep, "dropped_groups": dropped,
+           "tol": tol, "rounds": rounds,
+           "baseline": {k: base[k] for k in ("features", "valid_rmse", "recursive_mae", "fit_s", "forecast_s")},
+           "pruned": {k: final[k] for k in ("features", "valid_rmse", "recursive_mae", "fit_s", "forecast_s")},
+           "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "seconds": round(time.perf_counter() - t0, 2)}
+    spec_dir, out_dir = Path(spec_dir), Path(out_dir)
+    spec_dir.mkdir(parents=True, exist_ok=True)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    spec = spec_dir / f"{cfg.pref}_features.json"
+    spec.write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+    csv = out_dir / f"feature_profile_{cfg.pref}.csv"
+    table.to_csv(csv, index=False, encoding="utf-8-sig")
+    print(f"{tag} 제거 {dropped or '없음'} → 피처 {base['features']} → {final['features']}개 · "
+          f"검증 RMSE {final['valid_rmse']:,.1f} · 순차 MAE {final['recursive_mae']:,.1f} · "
+          f"학습 {base['fit_s']:.1f} → {final['fit_s']:.1f}s · 예측 {base['forecast_s']:.2f} → {final['forecast_s']:.2f}s")
+    print(f"[저장] 피처 사양: {spec}")
+    print(f"[저장] 그룹별 표 : {csv}")
+    return table
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale.feature_profile",
+                                 description="피처 그룹 비용/효과 측정 + 가지치기 사양")
+    ap.add_argument("items", nargs="*", help=f"품목 (기본: 전체 — {', '.join(COMMODITIES)})")
+    ap.add_argument("--tol", type=float, default=PRUNE_TOL, help="허용 악화 비율 (검증 RMSE, 순차 MAE)")
+    ap.add_argument("--rounds", type=int, default=None, help="n_estimators 덮어쓰기 (기본: XGB_PARAMS)")
+    ap.add_argument("--threads", type=int, default=None, help="XGBoost 스레드 수")
+    ap.add_argument("--data-root", default=".")
+    ap.add_argument("--out-dir", default=str(OUT_DIR))
+    ap.add_argument("--spec-dir", default=str(SPEC_DIR))
+    args = ap.parse_args(argv)
+
+    for name in args.items or COMMODITIES:
+        profile_features(name, data_root=args.data_root, out_dir=args.out_dir, spec_dir=args.spec_dir,
+                         tol=args.tol, rounds=args.rounds, n_jobs=args.threads)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
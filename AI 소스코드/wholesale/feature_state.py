@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+증분 피처 상태 (순차 예측용)
+- build_features 의 '다음 날 1행'을 과거 길이와 무관하게 상수 시간에 생성
+- 랙: 링버퍼 / EMA: 지수이동평균 상태(adjust=False, ignore_na=False 규칙)
+- 롤링: 창별 합/제곱합(+유효개수) 누적 → rmean_*/rstd_*
+- N개 경로(시나리오)를 한 번에 들고 다니며 스텝마다 N×F 행렬을 벡터 연산으로 생성
+- 입력 시계열은 일 단위 연속 달력(행 = 하루)을 전제 (main()의 reindex 결과)
+"""
+
+import numpy as np
+import pandas as pd
+
+LAGS      = [1, 2, 3, 7, 14, 21, 28, 56, 84]
+YOY_LAGS  = [364, 365, 366]
+WINDOWS   = [7, 14, 28, 56]
+EMA_SPANS = [7, 28]
+
+
+class FeatureState:
+    """
+    build_features(df)의 '다음 행'과 같은 값을 만드는 증분 상태 (경로 N개).
+
+    - features(): 경로별 next_date 의 피처 dict (값은 길이 N 배열, y(t-1) 까지만 사용)
+    - push(v)  : next_date 의 값(실측/예측, 스칼라 또는 길이 N)을 반영하고 하루 전진
+    - repeat(n): 같은 과거를 공유하는 N개 경로로 복제 / stack(states): 서로 다른 상태 결합
+    - ffill=True 이면 결측을 직전 유효값으로 보정(양파 파이프라인과 동일)
+    """
+
+    def __init__(self, base_date, next_date, use_yoy=False, ffill=False, n=1):
+        self.n       = int(n)
+        self.use_yoy = use_yoy
+        self.ffill   = ffill
+        self.base_date = np.full(self.n, np.datetime64(pd.Timestamp(base_date), "D"))
+        self.next_date = np.full(self.n, np.datetime64(pd.Timestamp(next_date), "D"))
+
+        # 링버퍼: _buf[:, (_pos-k+1) % size] = y(t-k)  (채워지지 않은 칸은 NaN)
+        self._size = (max(YOY_LAGS) if use_yoy else max(LAGS + WINDOWS)) + 1
+        self._buf  = np.full((self.n, self._size), np.nan)
+        self._pos  = self._size - 1
+        self._last_valid = np.full(self.n, np.nan)
+
+        # EMA 상태 (pandas ewm: adjust=False, ignore_na=False)
+        self._ema    = np.full((self.n, len(EMA_SPANS)), np.nan)
+        self._ema_wt = np.ones((self.n, len(EMA_SPANS)))
+
+        # 롤링 상태: 기준값(ref) 대비 편차의 합/제곱합 → 큰 가격대에서도 상쇄오차 억제
+        self._ref   = np.full(self.n, np.nan)
+        self._cnt   = np.zeros((self.n, len(WINDOWS)))
+        self._sum   = np.zeros((self.n, len(WINDOWS)))
+        self._sumsq = np.zeros((self.n, len(WINDOWS)))
+        self._same  = np.zeros(self.n)          # 직전 유효값과 같은 값이 연속된 개수(상수 구간 std=0 보장)
+        self._prev  = np.full(self.n, np.nan)
+
+    @classmethod
+    def from_history(cls, dates, values, use_yoy=False, ffill=False, base_date=None):
+        """과거 (date, 값) 시계열을 순서대로 밀어넣어 단일 경로 상태를 만든다."""
+        dates  = pd.to_datetime(pd.Series(dates)).reset_index(drop=True)
+        values = np.asarray(values, dtype=float)
+        if len(dates) == 0:
+            raise ValueError("FeatureState.from_history: 과거 데이터가 비어 있습니다.")
+        base = dates.min() if base_date is None else base_date
+        state = cls(base_date=base, next_date=dates.iloc[0], use_yoy=use_yoy, ffill=ffill)
+        for v in values:
+            state.push(v)
+        return state
+
+    def _take(self, idx):
+        """경로 인덱스 배열로 새 상태를 만든다 (복제/선택 공용)."""
+        out = object.__new__(type(self))
+        out.__dict__.update(self.__dict__)
+        for k, v in self.__dict__.items():
+            if isinstance(v, np.ndarray):
+                setattr(out, k, v[idx].copy())
+        out.n = len(idx)
+        return out
+
+    def repeat(self, n):
+        """모든 경로를 n번씩 복제 (단일 경로 → 시나리오 n개)."""
+        return self._take(np.repeat(np.arange(self.n), n))
+
+    @classmethod
+    def stack(cls, states):
+        """여러 상태를 한 배치로 결합 (기준일/다음 날짜가 서로 달라도 됨)."""
+        states = list(states)
+        if not states:
+            raise ValueError("FeatureState.stack: 빈 목록입니다.")
+        first = states[0]
+        for s in states[1:]:
+            if s.use_yoy != first.use_yoy or s.ffill != first.ffill:
+                raise ValueError("FeatureState.stack: use_yoy/ffill 설정이 다른 상태는 결합할 수 없습니다.")
+        out = first._take(np.arange(first.n))
+        for k, v in first.__dict__.items():
+            if k == "_buf":
+                # 링버퍼는 각 상태의 _pos 기준으로 정렬한 뒤 결합
+                out._buf = np.concatenate([np.roll(s._buf, -(s._pos + 1) % s._size, axis=1) for s in states])
+            elif isinstance(v, np.ndarray):
+                setattr(out, k, np.concatenate([getattr(s, k) for s in states]))
+        out._pos = out._size - 1
+        out.n = sum(s.n for s in states)
+        return out
+
+    # -----------------------
+    # 내부 조회
+    # -----------------------
+    def _lag(self, k):
+        return self._buf[:, (self._pos - k + 1) % self._size]
+
+    # -----------------------
+    # 갱신
+    # -----------------------
+    def push(self, value):
+        """next_date 의 값을 반영하고 next_date 를 하루 전진."""
+        v = np.broadcast_to(np.asarray(value, dtype=float), (self.n,)).copy()
+        if self.ffill:
+            ok = ~np.isnan(v)
+            self._last_valid = np.where(ok, v, self._last_valid)
+            v = self._last_valid.copy()
+        ok = ~np.isnan(v)
+
+        # 롤링: 창에서 빠지는 값 제거 / 새 값 추가
+        self._ref = np.where(ok & np.isnan(self._ref), v, self._ref)
+        for j, W in enumerate(WINDOWS):
+            old = self._lag(W)   # 새 값이 들어오면 W+1 번째 과거값 → 창 밖
+            out = ~np.isnan(old)
+            d_old = np.where(out, old - self._ref, 0.0)
+            d_new = np.where(ok, v - self._ref, 0.0)
+            self._cnt[:, j]   += ok.astype(float) - out
+            self._sum[:, j]   += d_new - d_old
+            self._sumsq[:, j] += d_new * d_new - d_old * d_old
+        self._same = np.where(ok, np.where(v == self._prev, self._same + 1, 1), self._same)
+        self._prev = np.where(ok, v, self._prev)
+
+        # EMA
+        for j, sp in enumerate(EMA_SPANS):
+            alpha = 2.0 / (sp + 1.0)
+            w  = self._ema[:, j]
+            has = ~np.isnan(w)
+            wt = np.where(has, self._ema_wt[:, j] * (1.0 - alpha), self._ema_wt[:, j])
+            upd = has & ok & (w != v)
+            with np.errstate(invalid="ignore"):
+                mixed = (wt * w + alpha * v) / (wt + alpha)
+            self._ema[:, j]    = np.where(upd, mixed, np.where(~has & ok, v, w))
+            self._ema_wt[:, j] = np.where(has & ok, 1.0, wt)
+
+        # 랙 버퍼
+        self._pos = (self._pos + 1) % self._size
+        self._buf[:, self._pos] = v
+        self.next_date = self.next_date + np.timedelta64(1, "D")
+
+    # -----------------------
+    # 피처
+    # -----------------------
+    def features(self) -> dict:
+        """경로별 next_date 의 피처 (build_features 와 같은 컬럼명, 값은 길이 N 배열)."""
+        d = pd.DatetimeIndex(self.next_date)
+        f = {}
+
+        # 달력/계절성
+        f["year"]  = d.year.to_numpy()
+        f["month"] = d.month.to_numpy()
+        f["day"]   = d.day.to_numpy()
+        f["dow"]   = d.dayofweek.to_numpy()
+        f["doy"]   = d.dayofyear.to_numpy()
+        f["week"]  = d.isocalendar().week.to_numpy().astype(int)
+        f["quarter"] = d.quarter.to_numpy()
+        f["is_harvest"] = ((f["month"] >= 9) & (f["month"] <= 11)).astype(int)
+
+        # 연/월 주기
+        f["sin_year"]  = np.sin(2*np.pi*f["doy"]/365.25)
+        f["cos_year"]  = np.cos(2*np.pi*f["doy"]/365.25)
+        f["sin_month"] = np.sin(2*np.pi*f["day"]/31.0)
+        f["cos_month"] = np.cos(2*np.pi*f["day"]/31.0)
+
+        # 추세
+        f["trend"]  = (self.next_date - self.base_date).astype(float)
+        f["trend2"] = f["trend"]**2 / 1e6
+
+        # 랙
+        for L in LAGS:
+            f[f"lag_{L}"] = self._lag(L)
+
+        # EMA
+        for j, sp in enumerate(EMA_SPANS):
+            f[f"ema_{sp}"] = self._ema[:, j]
+
+        y1, y2, y8 = self._lag(1), self._lag(2), self._lag(8)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # (옵션) YoY
+            if self.use_yoy:
+                for L in YOY_LAGS:
+                    f[f"lag_{L}"] = self._lag(L)
+                y366 = self._lag(366)
+                f["yoy_diff"]  = y1 - y366
+                f["yoy_ratio"] = y1 / y366 - 1
+
+            # 롤링 (min_periods=1, ddof=1)
+            for j, W in enumerate(WINDOWS):
+                n = self._cnt[:, j]
+                mean_d = self._sum[:, j] / n
+                var = (self._sumsq[:, j] - n * mean_d * mean_d) / (n - 1)
+                std = np.where(self._same >= n, 0.0, np.sqrt(np.maximum(var, 0.0)))
+                f[f"rmean_{W}"] = np.where(n > 0, self._ref + mean_d, np.nan)
+                f[f"rstd_{W}"]  = np.where(n > 1, std, np.nan)
+
+            # 변화율/차분 (전일 기준)
+            f["diff_1"] = y1 - y2
+            f["diff_7"] = y1 - y8
+            f["ret_1"]  = y1 / y2 - 1
+            f["ret_7"]  = y1 / y8 - 1
+        return f
+
+    def matrix(self, feature_cols, fill_values=None) -> np.ndarray:
+        """feature_cols 순서의 N×F float 행렬 (결측은 fill_values 로 보정)."""
+        f = self.features()
+        X = np.empty((self.n, len(feature_cols)))
+        for j, c in enumerate(feature_cols):
+            X[:, j] = f[c] if c in f else np.nan
+        if fill_values is not None:
+            fill = np.asarray(pd.Series(fill_values).reindex(list(feature_cols)), dtype=float)
+            X = np.where(np.isnan(X), fill, X)
+        return X
+
+    def row(self, feature_cols, fill_values=None) -> pd.DataFrame:
+        """feature_cols 순서의 N행 DataFrame (model.predict 입력용)."""
+        return pd.DataFrame(self.matrix(feature_cols, fill_values), columns=list(feature_cols))
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+품목별 피처 저장소 (build_features 결과를 디스크에 두고 새 일자만 증분 계산)
+- 위치: STORE_DIR/{pref}.npz — 컬럼별 배열(c__*) + 마지막 실측 다음 날의 FeatureState(s__*) + meta(JSON)
+- 갱신 규칙 (materialize):
+  · 저장본과 같은 원시 시계열 → 그대로 사용 (hit)
+  · 마지막 실측일까지 값/일자가 같고 그 뒤만 바뀜(새 실측/달력 연장) → 스냅샷 상태에서
+    바뀐 첫 행부터만 FeatureState 로 계산 (append — 랙 84/창 56/EMA 는 상태에 들어 있음)
+  · 과거 값 수정, 설정(use_yoy/ffill/타깃)·STORE_VERSION 변경 → 전체 build_features (build)
+- 증분 행은 FeatureState 값 (롤링은 합/제곱합 누적 → pandas rolling 과 부동소수 오차 수준 차이)
+- 스냅샷 상태는 history_state(raw, 마지막 실측 다음 날)과 같음 → 순차 예측이 과거를 다시 밀어넣지 않음
+"""
+
+import json
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import TARGET_COL, USE_YOY
+from .feature_state import FeatureState
+from .features import build_features
+
+STORE_VERSION = 1   # build_features/FeatureState 결과가 바뀌면 올릴 것 (기존 저장소 무효화)
+
+
+@dataclass
+class FeatureStore:
+    feat: pd.DataFrame                  # build_features 와 같은 컬럼/순서
+    state: FeatureState                 # 마지막 실측 다음 날 상태 (경로 1개)
+    info: dict = field(default_factory=dict)   # action(hit/append/build), rows(새로 계산한 행), path
+
+    @property
+    def snap_date(self) -> pd.Timestamp:
+        return pd.Timestamp(self.state.next_date[0])
+
+    def history_state(self, raw: pd.DataFrame, start_date, target: str = TARGET_COL) -> FeatureState:
+        """forecast.history_state(raw, start_date) 와 같은 상태 (스냅샷 이후면 사이 구간만 밀어넣음)."""
+        start = pd.Timestamp(start_date)
+        if start < self.snap_date:
+            from .forecast import history_state
+            return history_state(raw, start, target, self.state.use_yoy, self.state.ffill)
+        st = self.state._take(np.arange(1))
+        work = raw.sort_values("date")
+        for v in work.loc[(work["date"] >= self.snap_date) & (work["date"] < start), target]:
+            st.push(v)
+        return st
+
+
+def store_path(store_dir, cfg) -> Path:
+    return Path(store_dir) / f"{cfg.pref}.npz"
+
+
+# =======================
+# 저장/로드
+# =======================
+_STATE_SCALARS = ("n", "use_yoy", "ffill", "_size", "_pos")
+
+
+def _save(path: Path, feat: pd.DataFrame, state: FeatureState, meta: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {f"c__{c}": feat[c].to_numpy() for c in feat.columns}
+    arrays.update({f"s__{k}": v for k, v in state.__dict__.items() if isinstance(v, np.ndarray)})
+    meta = dict(meta, columns=list(feat.columns), state={k: getattr(state, k) for k in _STATE_SCALARS})
+    # 임시 파일에 쓰고 교체 → 동시에 읽는 프로세스가 깨진 파일을 보지 않음
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _load(path: Path):
+    """반환: (feat, state, meta) 또는 None (없음/손상)."""
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as z:
+            meta = json.loads(str(z["meta"]))
+            feat = pd.DataFrame({c: z[f"c__{c}"] for c in meta["columns"]})
+            state = object.__new__(FeatureState)
+            state.__dict__.update(meta["state"])
+            state.__dict__.update({k[3:]: z[k] for k in z.files if k.startswith("s__")})
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        return None
+    return feat, state, meta
+
+
+# =======================
+# 갱신
+# =======================
+def _last_obs(values: np.ndarray) -> int:
+    """마지막 실측 다음 위치 (실측이 없으면 0)."""
+    idx = np.flatnonzero(~np.isnan(values))
+    return int(idx[-1]) + 1 if len(idx) else 0
+
+
+def _append(feat, state, dates, values):
+    """이전 스냅샷 이후만 계산. 반환: (feat, state, 새로 계산한 행 수) 또는 None(증분 불가)"""
+    n_old = len(feat)
+    old_dates = feat["date"].to_numpy(dtype="datetime64[D]")
+    if len(dates) < n_old or not np.array_equal(dates[:n_old], old_dates):
+        return None
+    old_y = feat["y"].to_numpy(dtype=float)
+    p_old = int(np.searchsorted(old_dates, state.next_date[0]))
+    if not np.array_equal(values[:p_old], old_y[:p_old], equal_nan=True):
+        return None   # 과거 실측 수정
+
+    same = (values[:n_old] == old_y) | (np.isnan(values[:n_old]) & np.isnan(old_y))
+    diff = np.flatnonzero(~same)
+    first = int(diff[0]) if len(diff) else n_old
+    p_new = _last_obs(values)
+    if first == len(dates):
+        return feat, state, 0
+
+    cols = [c for c in feat.columns if c not in ("date", "y")]
+    st, snap, rows = state._take(np.arange(1)), None, []
+    for t in range(p_old, len(dates)):
+        if t == p_new:
+            snap = st._take(np.arange(1))
+        if t >= first:
+            rows.append(st.matrix(cols))   # 새 배열 (features() 값은 상태 버퍼의 뷰)
+        st.push(values[t])
+    if snap is None:
+        snap = st
+
+    new = pd.DataFrame(np.vstack(rows), columns=cols)
+    new.insert(0, "date", pd.DatetimeIndex(dates[first:]).astype(feat["date"].dtype))
+    new.insert(1, "y", values[first:])
+    new = new[list(feat.columns)].astype(feat.dtypes.to_dict())
+    return pd.concat([feat.iloc[:first], new], ignore_index=True), snap, len(new)
+
+
+def materialize(raw: pd.DataFrame, target: str = TARGET_COL, path=None, use_yoy: bool = USE_YOY,
+                ffill: bool = False, backend: str = None) -> FeatureStore:
+    """
+    raw(['date', target], 일 단위 연속 달력) → 피처 저장소. path=None 이면 저장 없이 build_features.
+    반환 FeatureStore.feat 는 build_features(raw, target, use_yoy, ffill) 와 같은 표.
+    backend: 전체 계산 시 build_features 백엔드 (증분 추가는 FeatureState 그대로)
+    """
+    work = raw.sort_values("date").reset_index(drop=True)
+    dates = work["date"].to_numpy(dtype="datetime64[D]")
+    values = work[target].to_numpy(dtype=float)
+    meta = {"version": STORE_VERSION, "target": target, "use_yoy": use_yoy, "ffill": ffill}
+
+    loaded = _load(Path(path)) if path is not None else None
+    if loaded is not None and all(loaded[2].get(k) == v for k, v in meta.items()):
+        out = _append(loaded[0], loaded[1], dates, values)
+        if out is not None:
+            feat, state, rows = out
+            if rows:
+                _save(Path(path), feat, state, meta)
+            return FeatureStore(feat, state, {"action": "append" if rows else "hit", "rows": rows, "path": str(path)})
+
+    feat = build_features(work, target, use_yoy=use_yoy, ffill=ffill, backend=backend)
+    p = _last_obs(values)
+    if p == 0:
+        raise ValueError("materialize: 실측값이 없습니다.")
+    state = FeatureState.from_history(work["date"].iloc[:p], values[:p], use_yoy=use_yoy, ffill=ffill,
+                                      base_date=work["date"].iloc[0])
+    if path is not None:
+        _save(Path(path), feat, state, meta)
+    return FeatureStore(feat, state, {"action": "build", "rows": len(feat), "path": None if path is None else str(path)})
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+피처 (행 유지; 결측은 후처리)
+- 달력/주기/추세/다중 랙/EMA/롤링/차분/수익률 (+옵션 YoY)
+- ffill=True: 랙/EMA/롤링/차분을 ffill 보정값으로 계산 (양파 파이프라인)
+- 그룹(FEATURE_GROUPS) 단위로 계산 → timings 로 그룹별 비용 측정, 가지치기 사양은 그룹/컬럼 선택
+- backend="numpy": 랙/EMA/롤링/차분/YoY 를 feature_kernels 커널 1회로 (컬럼 순서/값은 pandas 경로와 같음)
+- backend="arrow": 달력/주기/추세도 pyarrow.compute 로 (arrow_engine — engine="arrow" 경로)
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from .config import FEATURE_BACKEND, USE_YOY
+from .feature_kernels import level_features
+from .feature_state import EMA_SPANS, LAGS, WINDOWS, YOY_LAGS
+
+
+# 피처 그룹 (가지치기 단위 — feature_profile): 그룹 → 컬럼
+FEATURE_GROUPS = {
+    "calendar": ["year", "month", "day", "dow", "doy", "week", "quarter", "is_harvest"],
+    "cycle":    ["sin_year", "cos_year", "sin_month", "cos_month"],
+    "trend":    ["trend", "trend2"],
+    "lag":      [f"lag_{L}" for L in LAGS],
+    "ema":      [f"ema_{sp}" for sp in EMA_SPANS],
+    "rolling":  [f"{k}_{W}" for W in WINDOWS for k in ("rmean", "rstd")],
+    "change":   ["diff_1", "diff_7", "ret_1", "ret_7"],
+    "yoy":      [f"lag_{L}" for L in YOY_LAGS] + ["yoy_diff", "yoy_ratio"],
+}
+
+
+def build_features(df: pd.DataFrame, target: str, use_yoy: bool = USE_YOY, ffill: bool = False,
+                   timings: dict = None, backend: str = None) -> pd.DataFrame:
+    """timings(dict)를 주면 그룹별 계산 시간(초)을 누적 (numpy 백엔드는 커널 전체가 'kernel')."""
+    backend = backend or FEATURE_BACKEND
+    if backend not in ("pandas", "numpy", "arrow"):
+        raise ValueError(f"backend 는 pandas/numpy/arrow 중 하나여야 합니다: {backend}")
+    s = df.sort_values("date").reset_index(drop=True)
+    s["y"] = s[target].astype(float)
+    if backend == "numpy":
+        return _build_kernel(s, target, use_yoy, ffill, timings)
+    if backend == "arrow":
+        from .arrow_engine import build_features_arrow   # pyarrow 는 이 경로에서만 import
+        return build_features_arrow(s, target, use_yoy, ffill, timings)
+
+    # ffill로 듬성듬성 날짜 안정화(미래 누수 없음: 과거만 사용)
+    y = s["y"].ffill() if ffill else s["y"]
+
+    for name, step in _steps(use_yoy, ffill):
+        t0 = time.perf_counter()
+        step(s, y)
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - t0
+
+    # 피처 테이블에서 원 타깃 컬럼 제거
+    if target in s.columns:
+        s = s.drop(columns=[target])
+
+    return s  # dropna 하지 않음
+
+
+def _build_kernel(s, target, use_yoy, ffill, timings):
+    # 달력/주기/추세는 pandas 그대로, 가격 단위 그룹은 커널 1회 → _steps 순서로 컬럼 정렬
+    for name, step in _steps(False, ffill)[:3]:
+        t0 = time.perf_counter()
+        step(s, None)
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cols, X = level_features(s["y"].to_numpy(), use_yoy, ffill)
+    level = pd.DataFrame(X, columns=cols, index=s.index)
+    if timings is not None:
+        timings["kernel"] = timings.get("kernel", 0.0) + time.perf_counter() - t0
+    order = [c for c in s.columns if c != target] + [c for name, _ in _steps(use_yoy, ffill)[3:]
+                                                     for c in FEATURE_GROUPS[name]]
+    return pd.concat([s, level], axis=1)[order]
+
+
+def _steps(use_yoy, ffill):
+    # YoY — 기존 파이프라인별 컬럼 순서 유지(ffill 변형은 맨 뒤)
+    steps = [("calendar", _add_calendar), ("cycle", _add_cycle), ("trend", _add_trend),
+             ("lag", _add_lags), ("ema", _add_ema), ("rolling", _add_rolling), ("change", _add_change)]
+    if use_yoy:
+        steps.insert(len(steps) if ffill else 5, ("yoy", _add_yoy))
+    return steps
+
+
+def _add_calendar(s: pd.DataFrame, y: pd.Series):
+    # 달력/계절성
+    s["year"]  = s["date"].dt.year
+    s["month"] = s["date"].dt.month
+    s["day"]   = s["date"].dt.day
+    s["dow"]   = s["date"].dt.dayofweek
+    s["doy"]   = s["date"].dt.dayofyear
+    s["week"]  = s["date"].dt.isocalendar().week.astype(int)
+    s["quarter"] = s["date"].dt.quarter
+    s["is_harvest"] = s["month"].between(9, 11).astype(int)  # 기본 가정 유지
+
+
+def _add_cycle(s: pd.DataFrame, y: pd.Series):
+    # 연/월 주기
+    doy, day = s["date"].dt.dayofyear, s["date"].dt.day
+    s["sin_year"]  = np.sin(2*np.pi*doy/365.25)
+    s["cos_year"]  = np.cos(2*np.pi*doy/365.25)
+    s["sin_month"] = np.sin(2*np.pi*day/31.0)
+    s["cos_month"] = np.cos(2*np.pi*day/31.0)
+
+
+def _add_trend(s: pd.DataFrame, y: pd.Series):
+    # 추세(장기/단기)
+    base = s["date"].min()
+    s["trend"]   = (s["date"] - base).dt.days.astype(float)
+    s["trend2"]  = s["trend"]**2 / 1e6  # 스케일 안정화
+
+
+def _add_lags(s: pd.DataFrame, y: pd.Series):
+    for L in LAGS:
+        s[f"lag_{L}"] = y.shift(L)
+
+
+def _add_ema(s: pd.DataFrame, y: pd.Series):
+    # EMA(지수이동평균)
+    for sp in EMA_SPANS:
+        s[f"ema_{sp}"] = y.shift(1).ewm(span=sp, adjust=False).mean()
+
+
+def _add_rolling(s: pd.DataFrame, y: pd.Series):
+    # 롤링(누수 방지: shift(1) 후 rolling) — 최초 예측일 피처 생성을 위해 min_periods=1
+    for W in WINDOWS:
+        s[f"rmean_{W}"] = y.shift(1).rolling(W, min_periods=1).mean()
+        s[f"rstd_{W}"]  = y.shift(1).rolling(W, min_periods=1).std()
+
+
+def _add_change(s: pd.DataFrame, y: pd.Series):
+    # 변화율/차분 (전일 기준)
+    s["diff_1"] = y.shift(1) - y.shift(2)
+    s["diff_7"] = y.shift(1) - y.shift(8)
+    s["ret_1"]  = y.shift(1) / y.shift(2) - 1
+    s["ret_7"]  = y.shift(1) / y.shift(8) - 1
+
+
+def _add_yoy(s: pd.DataFrame, y: pd.Series):
+    for L in YOY_LAGS:
+        s[f"lag_{L}"] = y.shift(L)
+    s["yoy_diff"]  = y.shift(1) - y.shift(366)
+    s["yoy_ratio"] = (y.shift(1) / y.shift(366)) - 1
+
+
+def feature_group(col: str) -> str:
+    """컬럼 → 그룹 이름 (모르는 컬럼은 컬럼명 그대로)."""
+    for name, cols in FEATURE_GROUPS.items():
+        if col in cols:
+            return name
+    return col
+
+
+def feature_columns(feat: pd.DataFrame, target: str) -> list:
+    """모델 입력 컬럼 (date/y/원 타깃 제외 — 이중 가드)."""
+    cols = [c for c in feat.columns if c not in ["date", "y", target]]
+    assert target not in cols and "y" not in cols
+    return cols
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+순차 예측
+- 예측값을 다음 날 랙/EMA/롤링에 되먹임 (FeatureState 로 스텝당 O(1))
+- origin_states: 여러 원점의 시작 상태를 과거 1회 순회로 만들어 한 배치로 결합 (backfill 용)
+- 분위 모델(다중 분위 부스터 1개)이 있으면 같은 피처 행으로 predict 1회 추가 → 스텝당 predict 2회
+  (잔차 분위 부스터면 점 예측 + 잔차 분위 → 구간이 점 예측 경로를 따라감)
+- 시작 상태(state)를 넘기면 과거 적재 생략 (feature_store 스냅샷)
+"""
+
+import numpy as np
+import pandas as pd
+
+from .config import QUANTILES, TARGET_COL, USE_YOY
+from .feature_state import FeatureState
+
+
+def quantile_columns(quantiles=QUANTILES) -> list:
+    """분위 → 예측 CSV 컬럼명 (0.1 → pred_p10)."""
+    return [f"pred_p{int(round(q * 100))}" for q in quantiles]
+
+
+def quantile_predict(quantile_model, X, pred) -> np.ndarray:
+    """
+    분위 부스터 → N×Q 분위 예측 (교차 방지 정렬).
+    residual_ 부스터(점 모델의 표본 외 잔차 분위, fit_quantile_model)는 점 예측 pred 에 더함, 아니면 값 그대로.
+    잔차 분위의 양 끝은 0 을 넘지 않게 → 구간이 항상 점 예측을 감쌈 (편향된 잔차면 한쪽만 넓어짐)
+    """
+    q = np.sort(np.asarray(quantile_model.predict(X), dtype=float).reshape(len(pred), -1), axis=1)
+    if getattr(quantile_model, "residual_", False):
+        if q.shape[1] > 1:
+            q[:, 0] = np.minimum(q[:, 0], 0.0)
+            q[:, -1] = np.maximum(q[:, -1], 0.0)
+        q = q + np.asarray(pred, dtype=float).reshape(-1, 1)
+    return q
+
+
+def band_outside(future_df: pd.DataFrame, quantiles=QUANTILES) -> int:
+    """점 예측 pred 가 [최저 분위, 최고 분위] 밖인 일수 (분위 컬럼이 없으면 0)."""
+    cols = quantile_columns(quantiles)
+    if not quantiles or cols[0] not in future_df:
+        return 0
+    pred = future_df["pred"]
+    return int(((pred < future_df[cols[0]]) | (pred > future_df[cols[-1]])).sum())
+
+
+def history_state(base_raw: pd.DataFrame, start_date, target: str = TARGET_COL,
+                  use_yoy: bool = USE_YOY, ffill: bool = False) -> FeatureState:
+    """base_raw 의 start_date 이전 구간을 적재한 상태 (next_date = start_date)."""
+    work = base_raw.sort_values("date")
+    hist = work[work["date"] < start_date]
+    return FeatureState.from_history(hist["date"], hist[target], use_yoy=use_yoy, ffill=ffill,
+                                     base_date=work["date"].min())
+
+
+def origin_states(base_raw: pd.DataFrame, origins, target: str = TARGET_COL,
+                  use_yoy: bool = USE_YOY, ffill: bool = False) -> FeatureState:
+    """
+    원점마다 history_state(base_raw, origin) 와 같은 상태를 경로 1개씩 결합 (경로 순서 = origins 순서).
+    과거는 한 번만 밀어넣고 원점에 닿을 때마다 상태를 복사한다.
+    """
+    work = base_raw.sort_values("date")
+    dates = work["date"].to_numpy(dtype="datetime64[D]")
+    values = work[target].to_numpy(dtype=float)
+    wanted = np.asarray(pd.DatetimeIndex(origins).values.astype("datetime64[D]"))
+    if len(wanted) == 0:
+        raise ValueError("origin_states: 원점이 없습니다.")
+    if wanted.min() <= dates[0] or wanted.max() > dates[-1] + np.timedelta64(1, "D"):
+        raise ValueError("origin_states: 원점은 첫 일자 이후 ~ 마지막 일자 다음 날 사이여야 합니다.")
+
+    state = FeatureState(base_date=work["date"].min(), next_date=dates[0], use_yoy=use_yoy, ffill=ffill)
+    need, snaps = set(wanted.tolist()), {}
+    for d, v in zip(dates.tolist(), values):
+        if d in need:
+            snaps[d] = state._take(np.arange(1))
+        state.push(v)
+    snaps[(dates[-1] + np.timedelta64(1, "D")).tolist()] = state
+    return FeatureState.stack([snaps[o] for o in wanted.tolist()])
+
+
+def recursive_forecast_force(model, base_raw: pd.DataFrame,
+                             start_date: pd.Timestamp, end_date: pd.Timestamp,
+                             feature_cols, fill_values: pd.Series,
+                             target: str = TARGET_COL, use_yoy: bool = USE_YOY,
+                             ffill: bool = False, quantile_model=None,
+                             quantiles=QUANTILES, state: FeatureState = None) -> pd.DataFrame:
+    """
+    base_raw: ['date', target] (미래는 NaN)
+    결측 피처는 훈련셋(최근 180일) 중앙값으로 보정하여 반드시 예측.
+    quantile_model: 다중 분위 부스터 (점 예측 경로의 같은 행으로 평가 → pred_p10/p50/p90 컬럼)
+    state: history_state(base_raw, start_date) 와 같은 시작 상태 (None 이면 여기서 적재, 주어지면 진행시킴)
+    """
+    # 과거 구간은 한 번만 적재 → 이후 스텝마다 다음 1행만 O(1) 생성
+    if state is None:
+        state = history_state(base_raw, start_date, target, use_yoy, ffill)
+    preds, bands = [], []
+    for d in pd.date_range(start_date, end_date, freq="D"):
+        # 1×F 배열로 바로 예측 (DataFrame 변환 비용 없음, 값은 동일)
+        row = state.matrix(feature_cols, fill_values)
+
+        y_pred = float(model.predict(row)[0])
+        preds.append({"date": d, "pred": y_pred})
+        if quantile_model is not None:
+            bands.append(quantile_predict(quantile_model, row, [y_pred])[0])
+
+        # 예측값 누적(다음 날 랙/EMA/롤링 갱신)
+        state.push(y_pred)
+    out = pd.DataFrame(preds)
+    if bands:
+        out[quantile_columns(quantiles)] = np.vstack(bands)   # quantile_predict 에서 정렬됨
+    return out
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+품목 공통 전역 모델 (감자/고구마/무/배추/양파 피처 표를 쌓아 부스터 1개)
+- 품목별 피처/스플릿/다운웨이트/결측 보정은 품목 모드와 같음 (feature_store + split_train_valid)
+- 스케일 정규화: 품목마다 scale = 학습 레이블 중앙값 → 타깃과 가격 단위 피처(랙/EMA/롤링/차분/YoY 차)를
+  scale 로 나눔 (수익률·달력·추세는 그대로), 예측 × scale 로 원 단위 복원
+- 품목 피처: commodity_id (COMMODITIES 순서 코드) + log_scale (log(scale)) → 짧은 이력 품목도 다른 품목에서 학습
+- 예측: 품목별 상태를 한 루프에서 진행 — 스텝마다 품목 수 × F 행렬 1개 + predict 1회
+- 산출물: MODEL_DIR/global/ (부스터 1개 + meta.json 의 품목별 code/scale/fill_values)
+         예측 CSV 는 품목별 pred_2025_{pref}_forecast_global_*.csv
+
+    python -m wholesale.global_model                     # 전 품목
+    python -m wholesale.global_model 감자 배추 --rounds 2000
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .archive import load_commodity_raw
+from .artifacts import data_fingerprint, save_artifact
+from .config import (ARCHIVE_DIR, CACHE_DIR, COMMODITIES, EVAL_END_2025, FORECAST_END, FORECAST_START, MODEL_DIR,
+                     OUT_DIR, STORE_DIR, TARGET_COL, USE_YOY, Commodity, get_commodity)
+from .feature_store import FeatureStore, materialize, store_path
+from .features import FEATURE_GROUPS, feature_columns
+from .metrics import report
+from .pipeline import compute_fill_values, fit_model, sample_weights, save_future, split_train_valid
+from .profiling import RunReport
+
+GLOBAL = Commodity(name="전 품목", data_dir="", pref="global")   # 산출물 위치/보고서 이름용
+ID_COLS = ["commodity_id", "log_scale"]
+# 가격 단위 피처 (scale 로 나눔) — 수익률/비율, 달력, 추세는 제외
+LEVEL_COLS = (FEATURE_GROUPS["lag"] + FEATURE_GROUPS["ema"] + FEATURE_GROUPS["rolling"] + ["diff_1", "diff_7"]
+              + [c for c in FEATURE_GROUPS["yoy"] if c != "yoy_ratio"])
+
+
+@dataclass
+class Member:
+    cfg: Commodity
+    code: int
+    raw: pd.DataFrame
+    store: FeatureStore
+    scale: float
+    fill_values: pd.Series   # 원 단위 (compute_fill_values)
+    train: pd.DataFrame
+    valid: pd.DataFrame
+    test: pd.DataFrame       # 2025-01-01 ~ EVAL_END_2025
+
+
+def normalize(X: np.ndarray, feature_cols, member: Member) -> np.ndarray:
+    """원 단위 N×F → 가격 단위 열 ÷ scale + 품목 피처 열 (N×(F+2), 새 배열)."""
+    cols = list(feature_cols)
+    out = np.empty((len(X), len(cols) + len(ID_COLS)))
+    out[:, :len(cols)] = X
+    lev = [j for j, c in enumerate(cols) if c in LEVEL_COLS]
+    out[:, lev] /= member.scale
+    out[:, len(cols)] = member.code
+    out[:, len(cols) + 1] = np.log(member.scale)
+    return out
+
+
+def stack_members(names=None, data_root=".", cache_dir=CACHE_DIR, archive_dir=ARCHIVE_DIR,
+                  store_dir=STORE_DIR) -> tuple:
+    """품목별 피처/스플릿/scale. 반환: (members, feature_cols) — 피처 컬럼은 전 품목 공통"""
+    members, cols = [], None
+    for name in names or COMMODITIES:
+        cfg = get_commodity(name)
+        raw = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL, cache_dir=cache_dir)
+        store = materialize(raw, TARGET_COL, store_path(store_dir, cfg) if store_dir else None, USE_YOY, cfg.ffill)
+        feat = store.feat
+        c = feature_columns(feat, TARGET_COL)
+        if cols is not None and c != cols:
+            raise ValueError(f"[{cfg.name}] 피처 컬럼이 다른 품목과 다릅니다.")
+        cols = c
+        train, valid = split_train_valid(feat, cols, cfg)
+        test = feat[(feat["date"].dt.year == 2025) & (feat["date"] <= EVAL_END_2025) & feat["y"].notna()]
+        members.append(Member(cfg, list(COMMODITIES).index(cfg.name), raw, store, float(train["y"].median()),
+                              compute_fill_values(train[cols], cols), train, valid,
+                              test.dropna(subset=cols + ["y"]).reset_index(drop=True)))
+    return members, cols
+
+
+def _stack(members, cols, part):
+    X = np.vstack([normalize(getattr(m, part)[cols].to_numpy(dtype=float), cols, m) for m in members])
+    y = np.concatenate([getattr(m, part)["y"].to_numpy(dtype=float) / m.scale for m in members])
+    return X, y
+
+
+def global_forecast(model, members, feature_cols, start_date=FORECAST_START, end_date=FORECAST_END) -> dict:
+    """품목별 순차 예측을 한 루프로 (스텝마다 predict 1회). 반환: {품목명: (date, pred) 표}"""
+    states = [m.store.history_state(m.raw[["date", TARGET_COL]], start_date) for m in members]
+    scales = np.array([m.scale for m in members])
+    dates = pd.date_range(start_date, end_date, freq="D")
+    preds = np.empty((len(dates), len(members)))
+    for t in range(len(dates)):
+        X = np.vstack([normalize(st.matrix(feature_cols, m.fill_values), feature_cols, m)
+                       for m, st in zip(members, states)])
+        preds[t] = model.predict(X) * scales
+        for j, st in enumerate(states):
+            st.push(preds[t, j])
+    return {m.cfg.name: pd.DataFrame({"date": dates, "pred": preds[:, j]}) for j, m in enumerate(members)}
+
+
+def run_global(names=None, data_root=".", out_dir=OUT_DIR, model_dir=MODEL_DIR, cache_dir=CACHE_DIR,
+               archive_dir=ARCHIVE_DIR, store_dir=STORE_DIR, n_jobs=None, params=None, profile=None) -> dict:
+    """전 품목 피처 적재 → 부스터 1개 학습 → 품목별 평가/예측 CSV. 반환: 요약 dict"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    rr = RunReport(GLOBAL.name, kind="train", profile=profile)
+
+    with rr.stage("features") as st:
+        members, cols = stack_members(names, data_root, cache_dir, archive_dir, store_dir)
+        st["commodities"] = [m.cfg.name for m in members]
+    all_cols = cols + ID_COLS
+
+    with rr.stage("split") as st:
+        X_tr, y_tr = _stack(members, cols, "train")
+        X_va, y_va = _stack(members, cols, "valid")
+        w_tr = np.concatenate([sample_weights(m.train["date"], m.cfg.dw_periods) for m in members])
+        st.update(rows=len(y_tr), valid_rows=len(y_va), features=len(all_cols))
+
+    with rr.stage("fit", rows=len(y_tr)) as st:
+        model = fit_model(X_tr, y_tr, w_tr, X_va, pd.Series(y_va), try_gpu=all(m.cfg.try_gpu for m in members),
+                          n_jobs=n_jobs, params=params, feature_names=all_cols)
+        st["best_iteration"] = getattr(model, "best_iteration", None)
+    t_fit = rr.doc["stages"][-1]["wall_s"]
+
+    summary = {"name": GLOBAL.name, "commodities": {}, "outputs": []}
+    with rr.stage("evaluate"):
+        for m in members:
+            s = summary["commodities"][m.cfg.name] = {"scale": m.scale}
+            for label, part in (("VALID", m.valid), ("TEST", m.test)):
+                if len(part):
+                    pred = model.predict(normalize(part[cols].to_numpy(dtype=float), cols, m)) * m.scale
+                    s[label.lower()] = report(part["y"], pred, f"[{m.cfg.name}·전역] {label}")
+
+    if model_dir is not None:
+        with rr.stage("artifact"):
+            fill = pd.Series(np.nanmedian(X_tr, axis=0), index=all_cols)   # 새 품목용 (정규화 단위)
+            art = save_artifact(model_dir, GLOBAL, model, all_cols, fill,
+                                data_fingerprint(pd.concat([m.raw for m in members]), TARGET_COL),
+                                trained_rows=len(y_tr), valid_rows=len(y_va),
+                                commodities={m.cfg.name: {"code": m.code, "scale": m.scale, "ffill": m.cfg.ffill,
+                                                          "fill_values": [None if pd.isna(v) else float(v)
+                                                                          for v in m.fill_values]}
+                                             for m in members})
+        summary["artifact"] = str(art)
+        print(f"[저장] 전역 모델 산출물: {art}")
+
+    with rr.stage("forecast", rows=len(members) * ((FORECAST_END - FORECAST_START).days + 1)):
+        futures = global_forecast(model, members, cols)
+    with rr.stage("save"):
+        for m in members:
+            future = futures[m.cfg.name]
+            future.insert(2, "pred_ma7", future["pred"].rolling(7, min_periods=1).mean())
+            for p in save_future(m.cfg, future, None, out_dir, kind="forecast_global"):
+                summary["outputs"].append(str(p))
+                print(f"[저장] {m.cfg.name} 전역 예측 CSV : {p}")
+
+    summary["seconds"] = round(time.perf_counter() - t0, 2)
+    rr.set(commodities=[m.cfg.name for m in members], best_iteration=getattr(model, "best_iteration", None))
+    summary["report"] = str(rr.finish(out_dir, GLOBAL.pref))
+    print(f"[전역] 품목 {len(members)}개 · 학습 {len(y_tr):,}행 · 부스터 1개 학습 {t_fit:.1f}s")
+    print(f"[전역] 단계별 소요 ({summary['report']})\n{rr.table()}")
+    return summary
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale.global_model",
+                                 description="품목 공통 전역 모델 (피처 표 적재 + 스케일 정규화 + 부스터 1개)")
+    ap.add_argument("items", nargs="*", help=f"품목 (기본: 전체 — {', '.join(COMMODITIES)})")
+    ap.add_argument("--rounds", type=int, default=None, help="n_estimators 덮어쓰기 (기본: XGB_PARAMS)")
+    ap.add_argument("--threads", type=int, default=None, help="XGBoost 스레드 수")
+    ap.add_argument("--data-root", default=".")
+    ap.add_argument("--archive-dir", default=str(ARCHIVE_DIR))
+    ap.add_argument("--out-dir", default=str(OUT_DIR))
+    ap.add_argument("--model-dir", default=str(MODEL_DIR))
+    ap.add_argument("--no-cache", action="store_true", help="파싱 캐시/피처 저장소 사용 안 함")
+    ap.add_argument("--profile", action="store_true", help="cProfile 덤프 (out-dir/profile_global_train.prof)")
+    args = ap.parse_args(argv)
+
+    run_global(args.items or None, data_root=args.data_root, out_dir=args.out_dir, model_dir=args.model_dir,
+               cache_dir=None if args.no_cache else CACHE_DIR, archive_dir=args.archive_dir,
+               store_dir=None if args.no_cache else STORE_DIR, n_jobs=args.threads,
+               params={"n_estimators": args.rounds} if args.rounds else None, profile=args.profile or None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+저메모리 모드용 피처 행렬 (품목 1개 = 연속 float32 행렬 1개)
+- 사용 가능 행(레이블 + 모든 피처가 있는 행)만 날짜 순으로 담음 → 학습/검증/평가 구간은 날짜 범위 = 행 슬라이스
+  → X[sl] 은 복사 없는 뷰 (C 연속), XGBoost 에 ndarray 로 그대로 전달 (DataFrame 변환 없음)
+- float32: XGBoost 가 내부적으로 쓰는 정밀도와 같음 (모델 결과 동일), 메모리는 float64 DataFrame 의 절반 이하
+- 레이블 y 는 float64 유지 (평가 CSV 의 실측값 그대로)
+- 컬럼별로 채워 넣음 → 변환 중에도 N×F float64 임시 행렬을 만들지 않음
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .config import EVAL_END_2025, FILL_RECENT_DAYS
+
+
+@dataclass
+class FeatureMatrix:
+    X: np.ndarray        # 사용 가능 행 × feature_cols, float32 C 연속
+    y: np.ndarray        # float64
+    dates: np.ndarray    # datetime64[D], 오름차순
+    cols: list
+    labeled: np.ndarray  # 레이블이 있는 모든 일자 (피처 결측 행 포함 — 검증 구간 기준일용)
+
+    @classmethod
+    def from_features(cls, feat: pd.DataFrame, feature_cols, dtype=np.float32) -> "FeatureMatrix":
+        cols = list(feature_cols)
+        feat = feat.sort_values("date") if not feat["date"].is_monotonic_increasing else feat
+        ok = feat["y"].notna().to_numpy().copy()
+        for c in cols:
+            ok &= feat[c].notna().to_numpy()
+        X = np.empty((int(ok.sum()), len(cols)), dtype=dtype)
+        for j, c in enumerate(cols):
+            X[:, j] = feat[c].to_numpy()[ok]
+        dates = feat["date"].to_numpy(dtype="datetime64[D]")
+        return cls(X, feat["y"].to_numpy(dtype=float)[ok], dates[ok], cols, dates[feat["y"].notna().to_numpy()])
+
+    @property
+    def nbytes(self) -> int:
+        return self.X.nbytes + self.y.nbytes + self.dates.nbytes
+
+    def span(self, start=None, end=None) -> slice:
+        """start <= date <= end 인 행 슬라이스 (None 이면 열린 구간)."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start), "D")))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end), "D"),
+                                                                     side="right"))
+        return slice(lo, max(lo, hi))
+
+    def take(self, sl: slice):
+        """(X, y, dates) 뷰."""
+        return self.X[sl], self.y[sl], self.dates[sl]
+
+
+def split_views(fm: FeatureMatrix, cfg):
+    """split_train_valid 와 같은 행을 슬라이스로. 반환: (학습, 검증, 평가 2025~EVAL_END) 슬라이스"""
+    labeled = fm.labeled if cfg.split == "last_label" else fm.labeled[fm.labeled <= np.datetime64("2024-12-31")]
+    if len(labeled) == 0:
+        raise ValueError("레이블(y)이 존재하지 않습니다. 원본 CSV의 '평균가/평균'을 확인해 주세요.")
+    last = pd.Timestamp(labeled[-1])
+    cut = last - pd.Timedelta(days=89)
+    train = fm.span(end=cut - pd.Timedelta(days=1))
+    valid = fm.span(cut, last)
+    if train.stop == 0:
+        raise ValueError("train이 비었습니다. 데이터 기간을 늘리거나 피처 설정을 조정하세요.")
+    return train, valid, fm.span("2025-01-01", EVAL_END_2025)
+
+
+def fill_values_matrix(X_tr: np.ndarray, feature_cols) -> pd.Series:
+    """compute_fill_values 의 행렬판 (최근 FILL_RECENT_DAYS 중앙값, 사용 가능 행이라 결측 없음).
+    값은 float32 로 저장된 피처의 중앙값 → DataFrame 경로와 float32 반올림 수준 차이."""
+    cols = list(feature_cols)
+    if "trend" in cols and len(X_tr):
+        t = X_tr[:, cols.index("trend")]
+        X_tr = X_tr[t >= t.max() - FILL_RECENT_DAYS]
+    return pd.Series(np.median(X_tr.astype(float), axis=0), index=cols)   # 최근 구간만 float64 (중앙값 평균 오차 방지)
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""평가 지표 (MAE/RMSE/R^2/SMAPE)"""
+
+import numpy as np
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+
+def smape(y_true, y_pred):
+    denom = np.abs(y_true) + np.abs(y_pred)
+    m = denom != 0
+    return 100.0 * np.mean(2.0 * np.abs(y_pred - y_true)[m] / denom[m])
+
+
+def scores(y_true, y_pred) -> dict:
+    y_true, y_pred = np.asarray(y_true, dtype=float), np.asarray(y_pred, dtype=float)
+    mae  = mean_absolute_error(y_true, y_pred)
+    rmse = np.sqrt(mean_squared_error(y_true, y_pred))
+    r2   = r2_score(y_true, y_pred) if len(y_true) > 1 else float("nan")
+    s    = smape(y_true, y_pred)
+    return {"mae": float(mae), "rmse": float(rmse), "r2": float(r2), "smape": float(s)}
+
+
+def report(y_true, y_pred, tag):
+    m = scores(y_true, y_pred)
+    print(f"{tag} -> MAE:{m['mae']:.1f}  RMSE:{m['rmse']:.1f}  R^2:{m['r2']:.3f}  SMAPE:{m['smape']:.2f}%")
+    return m
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+패널 모드 (시장 × 품목 × 단위 × 등급 시계열 전부 + 전역 모델 1개)
+- 수집: CSV 의 시장/품목/단위/등급을 버리지 않고 시계열별 (date, 값) 유지 (같은 시계열·일자 여러 행은 평균)
+  키 컬럼이 없는 파일(일자/평균가만)은 "전체" 시계열 1개 → read_one_csv/merge_frames 와 같은 값
+- 달력: 시계열마다 첫 실측일 ~ end_date 일 단위 (merge_frames 규칙), sid·date 순으로 이어 붙인 long 표 1개
+- 피처: build_features 와 같은 컬럼/순서 — 랙/EMA/롤링/차분은 sid 그룹 연산(groupby shift/ewm/rolling)으로
+  전체 행을 한 번에 계산 (시계열별 Python 루프 없음), 달력/주기는 고유 일자에서 1회 계산 후 펼침
+  + 식별자 피처 market_id/item_id/unit_id/grade_id (키별 정렬 코드, 값이 2개 이상인 키만
+    → 시계열 1개 패널은 품목 모드와 같은 피처/모델)
+- 학습: 모든 시계열을 일자·sid 순 float32 행렬 1개(matrix.FeatureMatrix)에 담아 전역 XGBoost 1개
+  (검증/평가 구간은 품목 모드와 같은 날짜 규칙 → 슬라이스 뷰)
+- 예측: 시계열 N개를 FeatureState 경로 N개로 묶어 스텝마다 N×F 행렬 1회 + predict 1회
+  (예측 시작일 이후에 처음 관측된 시계열은 과거 상태가 없어 제외)
+
+    python -m wholesale.panel 양파
+    python -m wholesale.panel 배추 --rounds 500 --threads 8
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, replace
+from glob import glob
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .archive import read_archive
+from .artifacts import data_fingerprint, save_artifact
+from .config import (ARCHIVE_DIR, ENGINE, ENGINES, FORECAST_END, FORECAST_START, MODEL_DIR, OUT_DIR, TARGET_COL,
+                     USE_YOY, get_commodity)
+from .data import (_source, parse_dates_fast, parse_dates_tolerant, parse_prices_fast, parse_prices_tolerant,
+                   value_columns)
+from .feature_state import EMA_SPANS, LAGS, WINDOWS, YOY_LAGS, FeatureState
+from .features import FEATURE_GROUPS, _steps
+from .matrix import FeatureMatrix, fill_values_matrix, split_views
+from .metrics import report
+from .pipeline import fit_model, sample_weights
+from .profiling import RunReport
+
+# CSV 키 컬럼 → 식별자 피처 이름
+PANEL_KEYS = {"시장": "market_id", "품목": "item_id", "단위": "unit_id", "등급": "grade_id"}
+ALL_KEY    = "전체"   # 키 컬럼이 없는 파일의 값
+
+
+@dataclass
+class Panel:
+    series: pd.DataFrame   # 행 번호 = sid: PANEL_KEYS 값 + first(첫 실측일) + obs(실측 일수)
+    raw: pd.DataFrame      # sid, date, 값 — 시계열마다 첫 실측일 ~ end_date, sid·date 순 (미래는 NaN)
+
+    @property
+    def n(self) -> int:
+        return len(self.series)
+
+    @property
+    def id_keys(self) -> list:
+        """식별자 피처로 쓸 키 (값이 2개 이상)."""
+        return [k for k in PANEL_KEYS if self.series[k].nunique() > 1]
+
+    def codes(self) -> np.ndarray:
+        """시계열 × id_keys 정수 코드 (키별 값 정렬 순)."""
+        return np.column_stack([pd.Categorical(self.series[k], categories=sorted(self.series[k].unique())).codes
+                                for k in self.id_keys] or [np.empty((self.n, 0))]).astype(float)
+
+
+# =======================
+# 수집
+# =======================
+def read_panel_csv(src, target: str = TARGET_COL) -> pd.DataFrame:
+    """
+    CSV 1개(경로 또는 bytes) → PANEL_KEYS + date + 값 (시계열·일자별 평균)
+    날짜/가격 파싱은 read_one_csv 와 같은 규칙 (고속 경로 실패 시 관용 파서)
+    """
+    try:
+        df = pd.read_csv(_source(src), header=0, dtype=str, encoding="utf-8", engine="c", on_bad_lines="skip")
+    except pd.errors.ParserError:
+        df = pd.read_csv(_source(src), header=0, dtype=str, encoding="utf-8", engine="python", on_bad_lines="skip")
+    df.columns = df.columns.str.strip()
+    cols = value_columns(df.columns, target)
+    if cols is None:
+        raise ValueError("'일자/평균가' 또는 '구분/평균' 컬럼이 필요합니다.")
+    dt = parse_dates_fast(df[cols[0]])
+    val = parse_prices_fast(df[cols[1]])
+    out = pd.DataFrame({k: df[k].str.strip().fillna(ALL_KEY).replace("", ALL_KEY) if k in df.columns else ALL_KEY
+                        for k in PANEL_KEYS}, index=df.index)
+    out["date"] = dt if dt is not None else parse_dates_tolerant(df[cols[0]])
+    out[target] = val if val is not None else parse_prices_tolerant(df[cols[1]])
+    out = out.dropna(subset=["date", target])
+    return out.groupby(list(PANEL_KEYS) + ["date"], as_index=False, sort=False)[target].mean()
+
+
+def merge_panel(frames, end_date=FORECAST_END, target: str = TARGET_COL) -> Panel:
+    """파일별 패널 → (시계열, 일자) 중복 제거(앞 파일 우선) → 2020~2025 제한 → 시계열별 일 단위 달력."""
+    keys = list(PANEL_KEYS)
+    end = np.datetime64(pd.Timestamp(end_date), "D")
+    obs = pd.concat(frames, ignore_index=True).drop_duplicates(subset=keys + ["date"])
+    obs = obs[(obs["date"].dt.year >= 2020) & (obs["date"].dt.year <= 2025) & (obs["date"] <= end_date)]
+    if obs.empty:
+        raise ValueError("merge_panel: 실측값이 없습니다.")
+
+    grp = obs.groupby(keys, sort=True)
+    sid = grp.ngroup().to_numpy()
+    series = grp.agg(first=("date", "min"), obs=(target, "size")).reset_index()
+
+    # 시계열별 달력을 한 번에: 길이 → 시작 오프셋 → (sid, 일자) 행
+    first = series["first"].to_numpy(dtype="datetime64[D]")
+    days = (end - first).astype(int) + 1
+    start = np.concatenate([[0], np.cumsum(days)[:-1]])
+    rows = np.repeat(np.arange(len(series)), days)
+    dates = first[rows] + (np.arange(len(rows)) - start[rows]).astype("timedelta64[D]")
+    values = np.full(len(rows), np.nan)
+    d = obs["date"].to_numpy(dtype="datetime64[D]")
+    values[start[sid] + (d - first[sid]).astype(int)] = obs[target].to_numpy(dtype=float)
+
+    raw = pd.DataFrame({"sid": rows, "date": pd.DatetimeIndex(dates).astype(obs["date"].dtype), target: values})
+    return Panel(series, raw)
+
+
+def load_panel(cfg, data_root=".", archive_dir=ARCHIVE_DIR, end_date=FORECAST_END, target: str = TARGET_COL,
+               workers=None, engine=None) -> Panel:
+    """품목 원천(폴더 CSV, 없으면 zip — load_commodity_raw 와 같은 선택)의 패널. engine="arrow" 면 pyarrow 경로."""
+    cfg = get_commodity(cfg)
+    if (engine or ENGINE) == "arrow":
+        from .arrow_engine import load_panel_arrow
+        return load_panel_arrow(cfg, data_root, archive_dir, end_date, target, workers)
+    paths = sorted(glob(str(Path(data_root) / cfg.data_dir / "*.csv")))
+    if paths:
+        return merge_panel([read_panel_csv(Path(p), target) for p in paths], end_date, target)
+    zip_path = Path(archive_dir) / cfg.archive if cfg.archive else None
+    if zip_path is None or not zip_path.exists():
+        raise FileNotFoundError(f"{(Path(data_root) / cfg.data_dir).resolve()} 에 CSV가 없고 zip 도 없습니다.")
+    return merge_panel(read_archive([zip_path], target, workers=workers, parse=read_panel_csv), end_date, target)
+
+
+# =======================
+# 피처 (sid 그룹 연산)
+# =======================
+def panel_feature_columns(panel: Panel, use_yoy: bool = USE_YOY, ffill: bool = False) -> list:
+    """build_features 와 같은 피처 순서 + 식별자 피처."""
+    return ([c for name, _ in _steps(use_yoy, ffill) for c in FEATURE_GROUPS[name]]
+            + [PANEL_KEYS[k] for k in panel.id_keys])
+
+
+def _columns(panel: Panel, target: str, use_yoy: bool, ffill: bool):
+    """(컬럼명, 전체 행 값 배열) 을 panel_feature_columns 순서로 하나씩 (열 단위 → 피처 표 전체를 들지 않음)."""
+    raw = panel.raw
+    sid = raw["sid"].to_numpy()
+    y = raw[target].astype(float)
+    if ffill:
+        y = y.groupby(sid, sort=False).ffill()
+    g = y.groupby(sid, sort=False)
+    y1 = g.shift(1)
+    g1 = y1.groupby(sid, sort=False)
+
+    # 달력/주기: 고유 일자 표에서 build_features 의 단계 함수로 1회 계산 → 행으로 펼침
+    cal = pd.DataFrame({"date": pd.date_range(raw["date"].min(), raw["date"].max(), freq="D")})
+    day = (raw["date"] - cal["date"].iloc[0]).dt.days.to_numpy()
+
+    for name, step in _steps(use_yoy, ffill):
+        if name in ("calendar", "cycle"):
+            c = cal[["date"]].copy()
+            step(c, None)
+            for col in FEATURE_GROUPS[name]:
+                yield col, c[col].to_numpy()[day]
+        elif name == "trend":
+            first = panel.series["first"].to_numpy(dtype="datetime64[ns]")[sid]
+            trend = (raw["date"].to_numpy(dtype="datetime64[ns]") - first) / np.timedelta64(1, "D")
+            yield "trend", trend
+            yield "trend2", trend**2 / 1e6
+        elif name == "lag":
+            for L in LAGS:
+                yield f"lag_{L}", g.shift(L).to_numpy()
+        elif name == "ema":
+            for sp in EMA_SPANS:
+                yield f"ema_{sp}", g1.ewm(span=sp, adjust=False).mean().to_numpy()
+        elif name == "rolling":
+            for W in WINDOWS:
+                roll = g1.rolling(W, min_periods=1)
+                yield f"rmean_{W}", roll.mean().to_numpy()
+                yield f"rstd_{W}", roll.std().to_numpy()
+        elif name == "change":
+            y2, y8 = g.shift(2), g.shift(8)
+            yield "diff_1", (y1 - y2).to_numpy()
+            yield "diff_7", (y1 - y8).to_numpy()
+            yield "ret_1", (y1 / y2 - 1).to_numpy()
+            yield "ret_7", (y1 / y8 - 1).to_numpy()
+        elif name == "yoy":
+            for L in YOY_LAGS:
+                yield f"lag_{L}", g.shift(L).to_numpy()
+            y366 = g.shift(366)
+            yield "yoy_diff", (y1 - y366).to_numpy()
+            yield "yoy_ratio", (y1 / y366 - 1).to_numpy()
+
+    codes = panel.codes()[sid]
+    for j, k in enumerate(panel.id_keys):
+        yield PANEL_KEYS[k], codes[:, j]
+
+
+def build_panel_features(panel: Panel, target: str = TARGET_COL, use_yoy: bool = USE_YOY,
+                         ffill: bool = False) -> pd.DataFrame:
+    """sid, date, y + 피처 표 (시계열마다 build_features 를 따로 돌린 결과와 같은 값). 작은 패널/검증용."""
+    out = panel.raw[["sid", "date"]].copy()
+    out["y"] = panel.raw[target].astype(float)
+    for col, v in _columns(panel, target, use_yoy, ffill):
+        out[col] = v
+    return out
+
+
+def panel_matrix(panel: Panel, target: str = TARGET_COL, use_yoy: bool = USE_YOY, ffill: bool = False,
+                 dtype=np.float32) -> FeatureMatrix:
+    """
+    학습용 행렬: 레이블 + 모든 피처가 있는 행만, 일자·sid 순 (→ 날짜 구간 = 행 슬라이스)
+    열 단위로 채움 → 임시 메모리는 전체 행 열 몇 개 + 레이블 행 float32 행렬
+    """
+    y = panel.raw[target].to_numpy(dtype=float)
+    labeled = np.flatnonzero(~np.isnan(y))
+    dates = panel.raw["date"].to_numpy(dtype="datetime64[D]")
+    order = labeled[np.lexsort((panel.raw["sid"].to_numpy()[labeled], dates[labeled]))]
+    cols = panel_feature_columns(panel, use_yoy, ffill)
+    X = np.empty((len(order), len(cols)), dtype=dtype)
+    ok = np.ones(len(order), dtype=bool)
+    for j, (col, v) in enumerate(_columns(panel, target, use_yoy, ffill)):
+        X[:, j] = v[order]
+        ok &= ~np.isnan(X[:, j])
+    return FeatureMatrix(X[ok], y[order][ok], dates[order][ok], cols, np.sort(dates[labeled]))
+
+
+# =======================
+# 예측 (시계열 N개 = 경로 N개)
+# =======================
+def active_series(panel: Panel, start_date) -> np.ndarray:
+    """start_date 전에 첫 실측이 있는 sid (이후에 시작하는 시계열은 과거 상태가 없어 예측 대상에서 제외)."""
+    first = panel.series["first"].to_numpy(dtype="datetime64[D]")
+    return np.flatnonzero(first < np.datetime64(pd.Timestamp(start_date), "D"))
+
+
+def panel_state(panel: Panel, start_date, target: str = TARGET_COL, use_yoy: bool = USE_YOY,
+                ffill: bool = False, sids=None) -> FeatureState:
+    """
+    start_date 이전 구간을 적재한 상태 (경로 = sids 순, 기본 active_series, 기준일 = 시계열별 첫 실측일).
+    공통 달력으로 맞춰 하루씩 N개를 함께 밀어넣음 — 첫 실측일 전의 NaN 은 상태를 바꾸지 않음.
+    """
+    sids = active_series(panel, start_date) if sids is None else np.asarray(sids)
+    first = panel.series["first"].to_numpy(dtype="datetime64[D]")[sids]
+    start = np.datetime64(pd.Timestamp(start_date), "D")
+    if len(sids) == 0 or (first >= start).any():
+        raise ValueError("panel_state: start_date 전에 시작한 시계열만 적재할 수 있습니다.")
+    d0 = first.min()
+    col = np.full(panel.n, -1)
+    col[sids] = np.arange(len(sids))
+    hist = panel.raw[(panel.raw["date"] < pd.Timestamp(start_date)) & (col[panel.raw["sid"].to_numpy()] >= 0)]
+    wide = np.full(((start - d0).astype(int), len(sids)), np.nan)   # 일자 × 시계열 (행 단위로 push)
+    t = (hist["date"].to_numpy(dtype="datetime64[D]") - d0).astype(int)
+    wide[t, col[hist["sid"].to_numpy()]] = hist[target].to_numpy(dtype=float)
+
+    state = FeatureState(base_date=d0, next_date=d0, use_yoy=use_yoy, ffill=ffill, n=len(sids))
+    state.base_date = first.copy()
+    for v in wide:
+        state.push(v)
+    return state
+
+
+def panel_forecast(model, panel: Panel, feature_cols, fill_values, start_date=FORECAST_START,
+                   end_date=FORECAST_END, target: str = TARGET_COL, use_yoy: bool = USE_YOY,
+                   ffill: bool = False) -> pd.DataFrame:
+    """
+    전 시계열 순차 예측 (스텝마다 predict 1회). 반환: long 표 (PANEL_KEYS, date, pred)
+    start_date 이후에 시작하는 시계열은 제외 (개수 출력)
+    """
+    sids = active_series(panel, start_date)
+    if len(sids) < panel.n:
+        print(f"[패널] {pd.Timestamp(start_date).date()} 이후 시작 시계열 {panel.n - len(sids)}개 제외 "
+              f"→ 예측 {len(sids)}개")
+    state = panel_state(panel, start_date, target, use_yoy, ffill, sids)
+    cols = list(feature_cols)
+    ids = [cols.index(PANEL_KEYS[k]) for k in panel.id_keys]
+    codes = panel.codes()[sids]   # 학습 때와 같은 코드 (전체 패널 기준)
+    dates = pd.date_range(start_date, end_date, freq="D")
+    preds = np.empty((len(dates), len(sids)))
+    for t in range(len(dates)):
+        X = state.matrix(cols, fill_values)
+        X[:, ids] = codes   # 식별자는 보정값이 아니라 시계열 코드
+        preds[t] = model.predict(X)
+        state.push(preds[t])
+
+    out = panel.series.loc[np.tile(sids, len(dates)), list(PANEL_KEYS)].reset_index(drop=True)
+    out["date"] = np.repeat(dates.values, len(sids))
+    out["pred"] = preds.ravel()
+    return out
+
+
+# =======================
+# 실행
+# =======================
+def run_panel(cfg, data_root=".", out_dir=OUT_DIR, model_dir=MODEL_DIR, archive_dir=ARCHIVE_DIR, n_jobs=None,
+              params=None, profile=None, engine=None) -> dict:
+    """품목 1개 패널: 수집 → 그룹 피처 → 전역 모델 → 전 시계열 예측 CSV. 반환: 요약 dict (engine: 수집 경로)"""
+    cfg = get_commodity(cfg)
+    tag = f"[{cfg.name}·패널]"
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    rr = RunReport(cfg.name, kind="panel", profile=profile)
+
+    with rr.stage("load") as st:
+        panel = load_panel(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL, workers=n_jobs, engine=engine)
+        st.update(rows=int(panel.raw[TARGET_COL].notna().sum()), series=panel.n)
+    print(f"{tag} 시계열 {panel.n:,}개 · 실측 {int(panel.raw[TARGET_COL].notna().sum()):,}행")
+
+    with rr.stage("features", rows=len(panel.raw)) as st:
+        fm = panel_matrix(panel, TARGET_COL, USE_YOY, cfg.ffill)
+        st["matrix_mb"] = round(fm.nbytes / 1e6, 2)
+    cols = fm.cols
+
+    with rr.stage("split") as st:
+        sl_tr, sl_va, sl_te = split_views(fm, cfg)
+        X_tr, y_tr, d_tr = fm.take(sl_tr)
+        X_va, y_va, _ = fm.take(sl_va)
+        X_te, y_te, _ = fm.take(sl_te)
+        fill_values = fill_values_matrix(X_tr, cols)
+        st.update(rows=len(y_tr), valid_rows=len(y_va), features=len(cols))
+
+    with rr.stage("fit", rows=len(y_tr)) as st:
+        model = fit_model(X_tr, y_tr, sample_weights(d_tr, cfg.dw_periods), X_va, pd.Series(y_va),
+                          try_gpu=cfg.try_gpu, n_jobs=n_jobs, params=params, feature_names=cols)
+        st["best_iteration"] = getattr(model, "best_iteration", None)
+
+    summary = {"name": cfg.name, "series": panel.n, "outputs": []}
+    residuals = None
+    with rr.stage("evaluate", rows=len(y_va) + len(y_te)):
+        if len(y_va):
+            val_pred = model.predict(X_va)
+            residuals = y_va - val_pred
+            summary["valid"] = report(y_va, val_pred, f"{tag} VALID")
+        if len(y_te):
+            summary["test"] = report(y_te, model.predict(X_te), f"{tag} TEST  (2025~09-12)")
+
+    if model_dir is not None:
+        with rr.stage("artifact"):
+            art = save_artifact(model_dir, replace(cfg, pref=f"{cfg.pref}_panel"), model, cols, fill_values,
+                                data_fingerprint(panel.raw, TARGET_COL), residuals=residuals,
+                                trained_rows=len(y_tr), valid_rows=len(y_va), series=panel.n,
+                                levels={k: sorted(panel.series[k].unique()) for k in PANEL_KEYS})
+        summary["artifact"] = str(art)
+
+    with rr.stage("forecast", rows=panel.n * ((FORECAST_END - FORECAST_START).days + 1)):
+        future = panel_forecast(model, panel, cols, fill_values, FORECAST_START, FORECAST_END, TARGET_COL,
+                                USE_YOY, cfg.ffill)
+    out_csv = out_dir / (f"pred_2025_{cfg.pref}_panel_forecast_"
+                         f"{FORECAST_START.strftime('%Y%m%d')}_{FORECAST_END.strftime('%Y%m%d')}.csv")
+    future.to_csv(out_csv, index=False, encoding="utf-8-sig")
+    summary["outputs"].append(str(out_csv))
+    print(f"[저장] 패널 예측 CSV : {out_csv}")
+
+    summary["seconds"] = round(time.perf_counter() - t0, 2)
+    rr.set(series=panel.n, matrix_mb=round(fm.nbytes / 1e6, 2), best_iteration=getattr(model, "best_iteration", None))
+    summary["report"] = str(rr.finish(out_dir, cfg.pref))
+    print(f"{tag} 단계별 소요 ({summary['report']})\n{rr.table()}")
+    return summary
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale.panel",
+                                 description="시장×품목×단위×등급 시계열 전역 모델 학습 + 전 시계열 예측")
+    ap.add_argument("items", nargs="+", help="품목")
+    ap.add_argument("--rounds", type=int, default=None, help="n_estimators 덮어쓰기 (기본: XGB_PARAMS)")
+    ap.add_argument("--threads", type=int, default=None, help="XGBoost 스레드 수")
+    ap.add_argument("--data-root", default=".")
+    ap.add_argument("--archive-dir", default=str(ARCHIVE_DIR))
+    ap.add_argument("--out-dir", default=str(OUT_DIR))
+    ap.add_argument("--model-dir", default=str(MODEL_DIR))
+    ap.add_argument("--profile", action="store_true", help="cProfile 덤프 (out-dir/profile_*_panel.prof)")
+    ap.add_argument("--engine", choices=ENGINES, default=ENGINE, help="수집 경로: pandas / arrow (pyarrow Acero 계획)")
+    args = ap.parse_args(argv)
+
+    for name in args.items:
+        run_panel(name, data_root=args.data_root, out_dir=args.out_dir, model_dir=args.model_dir,
+                  archive_dir=args.archive_dir, n_jobs=args.threads,
+                  params={"n_estimators": args.rounds} if args.rounds else None, profile=args.profile or None,
+                  engine=args.engine)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
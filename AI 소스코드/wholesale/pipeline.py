@@ -0,0 +1,585 @@
+# -*- coding: utf-8 -*-
+"""
+품목 1개 파이프라인 (병합 → 피처 → 학습 → 평가 → 순차/직접 예측 → 저장/시각화 → 백테스트)
+- 품목별 차이는 config.Commodity 로만 받는다
+- 학습 후 산출물 저장(artifacts) → forecast_only 는 로드 후 순차 예측만
+- 피처는 품목별 저장소(feature_store)에서 읽음 → 새 일자만 계산, 순차 예측 시작 상태도 저장소 스냅샷
+- low_memory: 연속 float32 행렬 1개(matrix.FeatureMatrix)에서 학습/검증/평가를 슬라이스 뷰로 → ndarray 로 학습/예측
+- 분위 회귀(QUANTILES): 다중 분위 부스터 1개 → 순차 예측 스텝마다 predict 1회 추가로 pred_p10/p50/p90
+- 그래프: 실행 중에는 작업(함수명, 인자)만 모으고 CSV 저장/백테스트가 끝난 뒤 한꺼번에 렌더링
+  (plots=False 면 matplotlib import 없음, "defer" 면 호출자가 렌더링 — runner 가 프로세스 풀로)
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from .archive import load_commodity_raw
+from .artifacts import data_fingerprint, feature_spec, load_artifact, save_artifact, tuned_params
+from .config import (ARCHIVE_DIR, CACHE_DIR, EARLY_STOPPING_ROUNDS, EVAL_END_2025, FILL_RECENT_DAYS, FORECAST_END,
+                     ENGINE, FORECAST_START, MODEL_DIR, N_SCENARIOS, OUT_DIR, QUANTILE_FOLDS, QUANTILES, SPEC_DIR, STORE_DIR, STRATEGIES,
+                     TARGET_COL, TUNE_DIR, USE_YOY, XGB_PARAMS, get_commodity)
+from .feature_store import materialize, store_path
+from .features import feature_columns
+from .matrix import FeatureMatrix, fill_values_matrix, split_views
+from .forecast import band_outside, history_state, quantile_predict, recursive_forecast_force
+from .metrics import report
+from .plots import render_job, render_jobs
+from .profiling import RunReport
+from .scenario import scenario_forecast
+
+
+# =======================
+# 학습 구성요소
+# =======================
+def select_feature_cols(feat: pd.DataFrame, cfg, pruned=False, spec_dir=SPEC_DIR) -> list:
+    """모델 입력 컬럼: 전체 피처, pruned 면 피처 사양(spec_dir)에 있는 것만 (사양 없으면 전체)."""
+    feature_cols = feature_columns(feat, TARGET_COL)
+    if pruned:
+        spec = feature_spec(cfg, spec_dir)
+        if spec:
+            feature_cols = [c for c in feature_cols if c in set(spec)]
+            print(f"[{cfg.name}] 피처 사양: {len(feature_cols)}개 컬럼")
+        else:
+            print(f"[{cfg.name}] [WARN] 피처 사양 없음 → 전체 피처")
+    return feature_cols
+
+
+def split_train_valid(feat: pd.DataFrame, feature_cols, cfg):
+    """학습/검증 분할 (검증 90일) + 결측 제거."""
+    if cfg.split == "last_label":
+        # '실제 레이블 존재 마지막 날짜' 기준 검증 90일
+        labeled = feat[feat["y"].notna()].copy()
+        if labeled.empty:
+            raise ValueError("레이블(y)이 존재하지 않습니다. 원본 CSV의 '평균가/평균'을 확인해 주세요.")
+        last_y_date = labeled["date"].max()
+        cut = last_y_date - pd.Timedelta(days=89)
+        train = labeled[labeled["date"] < cut].copy()
+        valid = labeled[(labeled["date"] >= cut) & (labeled["date"] <= last_y_date)].copy()
+    else:
+        train_all = feat[(feat["date"].dt.year<=2024) & (feat["y"].notna())].copy()
+        cut = train_all["date"].max() - pd.Timedelta(days=89)
+        train = train_all[train_all["date"] < cut].copy()
+        valid = train_all[train_all["date"] >= cut].copy()
+
+    # 학습/검증: 결측 제거
+    train = train.dropna(subset=feature_cols + ["y"]).reset_index(drop=True)
+    valid = valid.dropna(subset=feature_cols + ["y"]).reset_index(drop=True)
+    if len(train) == 0:
+        raise ValueError("train이 비었습니다. 데이터 기간을 늘리거나 피처 설정을 조정하세요.")
+    return train, valid
+
+
+def compute_fill_values(X_tr: pd.DataFrame, feature_cols) -> pd.Series:
+    """결측 보정용 중앙값(최근 180일 기준)."""
+    recent_cut = X_tr["trend"].max() - FILL_RECENT_DAYS if "trend" in X_tr.columns else None
+    if recent_cut is not None:
+        X_recent = X_tr[X_tr["trend"] >= recent_cut]
+        return X_recent.median(numeric_only=True).reindex(feature_cols)
+    return X_tr.median(numeric_only=True).reindex(feature_cols)
+
+
+def training_window(d_tr, d_va) -> dict:
+    """
+    산출물 meta 의 학습 구간: train_end = 마지막 학습 행 일자, valid_start/valid_end = 검증(조기종료) 구간 (없으면 None)
+    → 표본 외 평가(backfill)는 train_end 다음 날부터, 검증 구간은 조기종료에 쓰였으므로 준표본 내
+    """
+    day = lambda d: str(pd.Timestamp(np.max(np.asarray(d, dtype="datetime64[ns]"))).date())   # noqa: E731
+    return {"train_end": day(d_tr),
+            "valid_start": str(pd.Timestamp(np.min(np.asarray(d_va, dtype="datetime64[ns]"))).date()) if len(d_va) else None,
+            "valid_end": day(d_va) if len(d_va) else None}
+
+
+def sample_weights(dates, dw_periods) -> np.ndarray:
+    """다운웨이트 기간에 해당하는 행은 더 낮은 가중치로 통일."""
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    w = np.ones(len(dates), dtype=float)
+    for start, end, wt in dw_periods:
+        mask = (dates >= np.datetime64(start)) & (dates <= np.datetime64(end))
+        w[mask] = np.minimum(w[mask], wt)
+    return w
+
+
+def fit_model(X_tr, y_tr, w_tr, X_va, y_va, try_gpu=True, n_jobs=None, params=None, feature_names=None):
+    """
+    XGBoost 학습 (검증셋이 있으면 EarlyStopping, gpu_hist 실패 시 CPU 폴백). params: XGB_PARAMS 덮어쓰기
+    feature_names: ndarray 로 학습할 때 부스터에 붙일 컬럼명 (중요도/산출물이 DataFrame 학습과 같게)
+    """
+    params_cpu = dict(XGB_PARAMS, **(params or {}))
+    if n_jobs is not None:
+        params_cpu["n_jobs"] = n_jobs
+    params_gpu = {**params_cpu, "tree_method": "gpu_hist"}
+
+    def _fit(params):
+        m = xgb.XGBRegressor(**params)
+        if len(X_va) == 0:
+            print("[WARN] valid set is empty → fit without eval_set / early_stopping")
+            m.fit(X_tr, y_tr, sample_weight=w_tr, verbose=False)
+        else:
+            m.set_params(early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+            m.fit(X_tr, y_tr, sample_weight=w_tr,
+                  eval_set=[(X_va, y_va)], sample_weight_eval_set=[np.ones(len(X_va))], verbose=False)
+        if feature_names is not None and m.get_booster().feature_names is None:
+            m.get_booster().feature_names = list(feature_names)
+        return m
+
+    if not try_gpu:
+        return _fit(params_cpu)
+    t_gpu = time.perf_counter()
+    try:
+        return _fit(params_gpu)
+    except Exception as e:
+        print("[WARN] GPU 실패, CPU 폴백:", e)
+        m = _fit(params_cpu)
+        m.gpu_fallback_ = {"error": str(e).splitlines()[0][:200] if str(e) else type(e).__name__,
+                           "seconds": round(time.perf_counter() - t_gpu, 3)}   # 실행 보고서용 (실패한 시도 포함)
+        return m
+
+
+def _take(X, idx):
+    return X.iloc[idx] if isinstance(X, (pd.DataFrame, pd.Series)) else X[idx]
+
+
+def oof_residuals(model, X_tr, y_tr, w_tr, folds=QUANTILE_FOLDS, n_jobs=None, params=None) -> np.ndarray:
+    """
+    학습 구간의 표본 외 잔차 (y - 예측): 시간순 folds+1 블록, 블록 k 는 앞 블록들로 재학습한 점 모델로 예측.
+    라운드 = 점 모델의 best_iteration+1 고정 (검증셋 없이) → 첫 블록은 NaN.
+    학습 잔차는 과적합으로 0 근처라 분위 구간이 퇴화 → 분위 모델은 이 잔차로 학습
+    """
+    n = len(y_tr)
+    rounds = getattr(model, "best_iteration", None)
+    rounds = rounds + 1 if rounds is not None else model.get_booster().num_boosted_rounds()
+    fparams = {**XGB_PARAMS, **(params or {}), "n_estimators": int(rounds)}
+    if n_jobs is not None:
+        fparams["n_jobs"] = n_jobs
+    y = np.asarray(y_tr, dtype=float)
+    w = np.asarray(w_tr, dtype=float)
+    out = np.full(n, np.nan)
+    edges = np.linspace(0, n, folds + 2).astype(int)
+    for lo, hi in zip(edges[1:-1], edges[2:]):
+        if lo == 0 or hi <= lo:
+            continue
+        m = xgb.XGBRegressor(**fparams)
+        m.fit(_take(X_tr, slice(0, lo)), y[:lo], sample_weight=w[:lo], verbose=False)
+        out[lo:hi] = y[lo:hi] - m.predict(_take(X_tr, slice(lo, hi)))
+    return out
+
+
+def fit_quantile_model(model, X_tr, y_tr, w_tr, X_va, y_va, quantiles=QUANTILES, try_gpu=True, n_jobs=None,
+                       params=None, feature_names=None, folds=QUANTILE_FOLDS):
+    """
+    다중 분위 부스터 1개 (reg:quantileerror, 출력 열 = quantiles 순서) — 점 모델 model 의 잔차 분위.
+    학습: 표본 외 잔차(oof_residuals), 조기종료: 검증 잔차 → 예측 = 점 예측 + 분위 (forecast.quantile_predict)
+    """
+    r_tr = oof_residuals(model, X_tr, y_tr, w_tr, folds, n_jobs=n_jobs, params=params)
+    ok = np.flatnonzero(~np.isnan(r_tr))
+    r_va = np.asarray(y_va, dtype=float) - model.predict(X_va) if len(y_va) else np.asarray(y_va, dtype=float)
+    qparams = {**(params or {}), "objective": "reg:quantileerror",
+               "quantile_alpha": [float(q) for q in quantiles], "eval_metric": "quantile"}
+    qmodel = fit_model(_take(X_tr, ok), r_tr[ok], np.asarray(w_tr, dtype=float)[ok], X_va, r_va,
+                       try_gpu=try_gpu, n_jobs=n_jobs, params=qparams, feature_names=feature_names)
+    qmodel.residual_ = True
+    return qmodel
+
+
+def interval_coverage(qmodel, model, X, y, quantiles=QUANTILES) -> tuple:
+    """[최저 분위, 최고 분위] 구간에 (실측, 점 예측)이 들어간 비율."""
+    X = X if isinstance(X, np.ndarray) else np.asarray(X, dtype=float)   # float32 행렬 뷰는 그대로
+    pred = model.predict(X)
+    q = quantile_predict(qmodel, X, pred)
+    y = np.asarray(y, dtype=float)
+    inside = lambda v: float(np.mean((v >= q[:, 0]) & (v <= q[:, -1])))   # noqa: E731
+    return inside(y), inside(pred)
+
+
+# =======================
+# (추가 실험) 2021~2023 → 2024 예측
+# =======================
+def backtest_21_23_to_24(feat: pd.DataFrame, feature_cols, cfg, out_dir=OUT_DIR, n_jobs=None, show=True,
+                         plots=True, jobs=None, fm: FeatureMatrix = None):
+    """
+    plots=False 면 그래프 생략, jobs(list)가 주어지면 그리지 않고 그래프 작업만 추가.
+    fm: 저메모리 모드 행렬 (주어지면 feat 대신 연도 구간 슬라이스 뷰 사용)
+    """
+    cfg = get_commodity(cfg)
+    out_dir = Path(out_dir)
+    if fm is not None:
+        X_tr, y_tr, _ = fm.take(fm.span("2021-01-01", "2023-12-31"))
+        X_te, y_te, d_te = fm.take(fm.span("2024-01-01", "2024-12-31"))
+        y_te = pd.Series(y_te)
+    else:
+        tr = feat[(feat["date"].dt.year >= 2021) & (feat["date"].dt.year <= 2023) & (feat["y"].notna())].copy()
+        te = feat[(feat["date"].dt.year == 2024) & (feat["y"].notna())].copy()
+        tr = tr.dropna(subset=feature_cols + ["y"]).reset_index(drop=True)
+        te = te.dropna(subset=feature_cols + ["y"]).reset_index(drop=True)
+        X_tr, y_tr = tr[feature_cols], tr["y"]
+        X_te, y_te, d_te = te[feature_cols], te["y"], te["date"]
+
+    if len(y_tr) == 0 or len(y_te) == 0:
+        print("[INFO] 2021~23 또는 2024 데이터가 부족해 백테스트를 건너뜁니다.")
+        return None
+
+    params = dict(XGB_PARAMS, early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+    if n_jobs is not None:
+        params["n_jobs"] = n_jobs
+    m = xgb.XGBRegressor(**params)
+    m.fit(X_tr, y_tr, eval_set=[(X_te, y_te)], verbose=False)
+
+    pred = m.predict(X_te)
+    metrics = report(y_te, pred, f"[{cfg.name}] BACKTEST (2021~23 → 2024)")
+
+    # 그래프 저장
+    out_png = out_dir / f"plot_2024_{cfg.pref}_from_21_23.png"
+    if plots:
+        job = ("plot_backtest", (cfg, pd.Series(d_te).astype("datetime64[ns]"), y_te, pred, out_png))
+        if jobs is None:
+            render_job(job, show=show)
+        else:
+            jobs.append(job)
+        print(f"[저장] 2024 예측 플롯: {out_png}")
+
+    # CSV 저장
+    out_csv = out_dir / f"pred_2024_{cfg.pref}_from_21_23.csv"
+    pd.DataFrame({"date": pd.Series(d_te).astype("datetime64[ns]").values, "actual": y_te.values, "pred": pred}).to_csv(out_csv, index=False, encoding="utf-8-sig")
+    print(f"[저장] 2024 예측 CSV : {out_csv}")
+    return metrics
+
+
+# =======================
+# 미래 예측 (학습/forecast_only 공통)
+# =======================
+def forecast_future(model, raw: pd.DataFrame, feature_cols, fill_values, cfg, residuals=None,
+                    n_scenarios=N_SCENARIOS, quantile_model=None, quantiles=QUANTILES, store=None):
+    """
+    09/13~12/31 순차 예측 (+분위 모델이 있으면 pred_p* 컬럼) + (잔차가 있으면) 시나리오 밴드.
+    store: 같은 raw 의 FeatureStore (시작 상태를 과거 재적재 없이 사용). 반환: (future_df, bands_df 또는 None)
+    """
+    base_for_forecast = raw[["date", TARGET_COL]].copy()  # 미래는 NaN
+
+    def _start_state():
+        if store is not None:
+            return store.history_state(base_for_forecast, FORECAST_START)
+        return history_state(base_for_forecast, FORECAST_START, TARGET_COL, USE_YOY, cfg.ffill)
+
+    future_df = recursive_forecast_force(
+        model=model,
+        base_raw=base_for_forecast,
+        start_date=FORECAST_START,
+        end_date=FORECAST_END,
+        feature_cols=feature_cols,
+        fill_values=fill_values,
+        use_yoy=USE_YOY,
+        ffill=cfg.ffill,
+        quantile_model=quantile_model,
+        quantiles=quantiles,
+        state=_start_state(),
+    )
+    future_df.insert(2, "pred_ma7", future_df["pred"].rolling(7, min_periods=1).mean())   # pred 옆 (분위 컬럼은 뒤)
+    n_out = band_outside(future_df, quantiles)
+    if n_out:
+        print(f"[WARN] [{cfg.name}] 점 예측이 분위 구간 밖인 날 {n_out}/{len(future_df)}일 → 분위 모델 재학습 권장")
+
+    # 시나리오 밴드: 중심화한 검증 잔차 부트스트랩 경로 N개를 배치 예측 → 일자별 P10/P50/P90
+    bands_df = None
+    if n_scenarios > 0 and residuals is not None and len(residuals) > 0:
+        bands_df = scenario_forecast(model, _start_state(), FORECAST_END, feature_cols, fill_values,
+                                     residuals=residuals, n_paths=n_scenarios)
+    return future_df, bands_df
+
+
+def save_future(cfg, future_df, bands_df, out_dir, kind="forecast") -> list:
+    """예측/밴드 CSV 저장. 반환: 저장 경로 목록 (kind: 파일명 구분 — both 의 직접 예측은 forecast_direct)"""
+    span = f"{FORECAST_START.strftime('%Y%m%d')}_{FORECAST_END.strftime('%Y%m%d')}"
+    csv_future = out_dir / f"pred_2025_{cfg.pref}_{kind}_{span}.csv"
+    future_df.to_csv(csv_future, index=False, encoding="utf-8-sig")
+    paths = [csv_future]
+    if bands_df is not None:
+        csv_bands = out_dir / f"pred_2025_{cfg.pref}_bands_{span}.csv"
+        bands_df.to_csv(csv_bands, index=False, encoding="utf-8-sig")
+        paths.append(csv_bands)
+    return paths
+
+
+def run_direct(model, feat, raw, feature_cols, fill_values, valid_dates, cfg, out_dir, n_jobs=None, compare=False):
+    """
+    horizon 구간별 직접 모델 학습 + 09/13~12/31 예측. 반환: (예측 df, 요약 dict)
+    - compare: 검증 시작일 ~ 마지막 실측일의 매 원점에서 순차 vs 직접 비교 표 저장 (+ 지연 시간)
+    """
+    from .direct import compare_strategies, direct_forecast, fit_direct
+
+    tag = f"[{cfg.name}]"
+    t0 = time.perf_counter()
+    dm = fit_direct(feat, feature_cols, fill_values, cfg, n_jobs=n_jobs)
+    out = {"fit_seconds": round(time.perf_counter() - t0, 2)}
+    direct_df = direct_forecast(dm, raw, ffill=cfg.ffill)
+    direct_df["pred_ma7"] = direct_df["pred"].rolling(7, min_periods=1).mean()
+
+    if compare and len(valid_dates) > 0:
+        last = raw.loc[raw[TARGET_COL].notna(), "date"].max()
+        origins = pd.date_range(pd.Timestamp(min(valid_dates)), last, freq="D")
+        table, latency = compare_strategies(model, dm, raw, feature_cols, fill_values, cfg, origins)
+        csv_cmp = Path(out_dir) / f"compare_{cfg.pref}_recursive_vs_direct.csv"
+        table.to_csv(csv_cmp, index=False, encoding="utf-8-sig")
+        print(f"{tag} 순차 vs 직접 (원점 {len(origins)}개, {origins[0].date()}~{last.date()}; 검증 구간 포함)")
+        print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+        print(f"{tag} 예측 지연: 순차 {latency['recursive']:.3f}s / 직접 {latency['direct']:.3f}s")
+        print(f"[저장] 비교 표 CSV: {csv_cmp}")
+        out.update(latency=latency, compare=str(csv_cmp))
+    return direct_df, out
+
+
+# =======================
+# 메인 파이프라인
+# =======================
+def run_commodity(cfg, data_root=".", out_dir=OUT_DIR, n_jobs=None, show=True, backtest=True,
+                  n_scenarios=N_SCENARIOS, cache_dir=CACHE_DIR, archive_dir=ARCHIVE_DIR,
+                  model_dir=MODEL_DIR, tuned=False, tune_dir=TUNE_DIR, strategy="recursive",
+                  quantiles=QUANTILES, profile=None, plots=True, store_dir=STORE_DIR, pruned=False,
+                  spec_dir=SPEC_DIR, low_memory=False, engine=None) -> dict:
+    """
+    품목 1개 전체 실행. 반환: 지표/출력 경로 요약 dict
+    - data_root: 품목 CSV 폴더들이 있는 위치 (기본: 현재 폴더)
+    - n_jobs   : XGBoost 스레드 수 (병렬 실행 시 워커별 예산)
+    - cache_dir: 파싱 결과 캐시 위치 (None 이면 매번 파싱)
+    - archive_dir: 품목 폴더가 없을 때 원본 zip 을 직접 읽을 위치
+    - model_dir: 학습 산출물 저장 위치 (None 이면 저장 안 함)
+    - store_dir: 피처 저장소 위치 (None 이면 매번 build_features)
+    - tuned    : tune_dir 의 탐색 결과(최적 파라미터)로 학습 (없으면 XGB_PARAMS)
+    - pruned   : spec_dir 의 피처 사양(python -m wholesale.feature_profile)의 컬럼만 사용 (없으면 전체)
+    - strategy : 미래 예측 방식 — recursive(순차) / direct(horizon 구간별 직접 모델, 밴드 없음) /
+                 both(예측 CSV 는 순차, 직접 예측은 *_forecast_direct_* 로 따로 + 지연/정확도 비교 표)
+    - quantiles: 분위 회귀 구간 (예측 CSV 의 pred_p* 컬럼, 순차 예측에만) — () 이면 생략
+    - profile  : cProfile 덤프 (None 이면 환경변수 WHOLESALE_PROFILE) — 단계 보고서는 항상 out_dir/run_report_*_train.json
+    - plots    : True 면 모델링/저장이 끝난 뒤 렌더링 (show=False 면 프로세스 풀), False 면 생략(matplotlib import 없음),
+                 "defer" 면 그리지 않고 summary["plot_jobs"] 로 반환 (plots.render_jobs 로 렌더링)
+    - low_memory: 연속 float32 행렬 + 슬라이스 뷰로 학습/평가 (DataFrame 분할 복사 없음, 결측 보정값은 float32 중앙값)
+    - engine   : 수집/병합/피처 실행 경로 — pandas / arrow (pyarrow Acero 계획 + 커널 피처, 결과 표는 같음). None 이면 ENGINE
+    """
+    engine = engine or ENGINE
+    if strategy not in STRATEGIES:
+        raise ValueError(f"알 수 없는 strategy '{strategy}' (가능: {', '.join(STRATEGIES)})")
+    cfg = get_commodity(cfg)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.random.seed(42)
+    t0 = time.perf_counter()
+    tag = f"[{cfg.name}]"
+
+    rr = RunReport(cfg.name, "train", profile)
+
+    # 병합
+    with rr.stage("load") as st:
+        raw = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL,
+                                 cache_dir=cache_dir, workers=n_jobs, engine=engine)
+        st["rows"] = int(raw[TARGET_COL].notna().sum())
+
+    # 피처
+    with rr.stage("features", rows=len(raw)) as st:
+        store = materialize(raw, TARGET_COL, store_path(store_dir, cfg) if store_dir else None, USE_YOY, cfg.ffill,
+                            backend="arrow" if engine == "arrow" else None)
+        feat = store.feat
+        feature_cols = select_feature_cols(feat, cfg, pruned, spec_dir)
+        st.update(store=store.info["action"], computed=store.info["rows"])
+
+    # 스플릿 (저메모리: 행렬 1개 + 뷰 / 기본: DataFrame 분할)
+    fm = None
+    with rr.stage("split") as st:
+        if low_memory:
+            fm = FeatureMatrix.from_features(feat, feature_cols)
+            sl_tr, sl_va, sl_te = split_views(fm, cfg)
+            X_tr, y_tr, d_tr = fm.take(sl_tr)
+            X_va, y_va, d_va = fm.take(sl_va)
+            X_te, y_te, d_te = fm.take(sl_te)
+            y_va = pd.Series(y_va)
+            fill_values = fill_values_matrix(X_tr, feature_cols)
+            st["matrix_mb"] = round(fm.nbytes / 1e6, 2)
+        else:
+            train, valid = split_train_valid(feat, feature_cols, cfg)
+            X_tr, y_tr, d_tr = train[feature_cols], train["y"], train["date"]
+            X_va, y_va, d_va = valid[feature_cols], valid["y"], valid["date"]
+            fill_values = compute_fill_values(X_tr, feature_cols)
+        st.update(rows=len(y_tr), valid_rows=len(y_va), features=len(feature_cols))
+
+    # 가중치 + 모델
+    w_tr = sample_weights(d_tr, cfg.dw_periods)
+    params = tuned_params(cfg, tune_dir) if tuned else None
+    if tuned:
+        print(f"{tag} 탐색 파라미터: {params}" if params else f"{tag} [WARN] 탐색 결과 없음 → 기본 파라미터")
+    with rr.stage("fit", rows=len(y_tr)) as st:
+        model = fit_model(X_tr, y_tr, w_tr, X_va, y_va, try_gpu=cfg.try_gpu, n_jobs=n_jobs, params=params,
+                          feature_names=feature_cols if fm is not None else None)
+        st.update(best_iteration=getattr(model, "best_iteration", None), rounds=model.get_booster().num_boosted_rounds(),
+                  gpu_fallback=getattr(model, "gpu_fallback_", None))
+
+    summary = {"name": cfg.name, "outputs": []}
+    with rr.stage("evaluate") as st:
+        val_pred = model.predict(X_va) if len(y_va) > 0 else np.array([])
+        if len(y_va) > 0:
+            valid_tag = "VALID (last 90d)" if cfg.split == "last_label" else "VALID(2024 Q4)"
+            summary["valid"] = report(y_va, val_pred, f"{tag} {valid_tag}")
+
+        # 평가(~09/12)
+        if fm is None:
+            test_2025 = feat[feat["date"].dt.year==2025].copy()
+            mask_eval = (test_2025["date"] <= EVAL_END_2025) & (test_2025["y"].notna())
+            test_eval = test_2025.loc[mask_eval].dropna(subset=feature_cols + ["y"]).reset_index(drop=True)
+            X_te, y_te, d_te = test_eval[feature_cols], test_eval["y"], test_eval["date"]
+        y_hat_eval = model.predict(X_te) if len(y_te) else np.array([])
+        if len(y_te):
+            summary["test"] = report(y_te, y_hat_eval, f"{tag} TEST  (2025~09-12) 원값")
+        st["rows"] = len(y_va) + len(y_te)
+
+    # 분위 모델 (P10/P50/P90 → 예측 구간)
+    qmodel = None
+    if quantiles and strategy != "direct":
+        with rr.stage("quantile", rows=len(y_tr)) as st:
+            qmodel = fit_quantile_model(model, X_tr, y_tr, w_tr, X_va, y_va, quantiles, try_gpu=cfg.try_gpu,
+                                        n_jobs=n_jobs, params=params,
+                                        feature_names=feature_cols if fm is not None else None)
+            span = f"P{int(round(quantiles[0] * 100))}~P{int(round(quantiles[-1] * 100))}"
+            for label, X, y in (("VALID", X_va, y_va), ("TEST", X_te, y_te)):
+                if len(X):
+                    cov, cov_pred = interval_coverage(qmodel, model, X, y, quantiles)
+                    summary.setdefault("coverage", {})[label.lower()] = cov
+                    st[f"pred_inside_{label.lower()}"] = round(cov_pred, 4)
+                    print(f"{tag} 분위 구간 {span} 포함률 {label}: {cov:.1%} (n={len(X)}, 점 예측 {cov_pred:.1%})")
+            st["best_iteration"] = getattr(qmodel, "best_iteration", None)
+
+    # 학습 산출물 저장 → 이후 forecast_only 로 재학습 없이 예측 갱신
+    residuals = y_va.to_numpy() - val_pred if len(y_va) > 0 else None
+    if model_dir is not None:
+        with rr.stage("artifact"):
+            art = save_artifact(model_dir, cfg, model, feature_cols, fill_values, data_fingerprint(raw, TARGET_COL),
+                                residuals=residuals, quantile_model=qmodel, quantiles=quantiles,
+                                trained_rows=len(y_tr), valid_rows=len(y_va), pruned=bool(pruned),
+                                tuned=bool(tuned), tuned_params=params, low_memory=bool(low_memory), engine=engine,
+                                data_end=str(raw.loc[raw[TARGET_COL].notna(), "date"].max().date()),
+                                **training_window(d_tr, d_va))
+        summary["artifact"] = str(art)
+        print(f"[저장] 모델 산출물: {art}")
+
+    # 미래 예측(09/13~12/31): 순차/강제 예측 및/또는 직접 예측
+    future_df = bands_df = None
+    if strategy != "direct":
+        with rr.stage("forecast", scenarios=n_scenarios if residuals is not None else 0) as st:
+            future_df, bands_df = forecast_future(model, raw, feature_cols, fill_values, cfg,
+                                                  residuals=residuals, n_scenarios=n_scenarios,
+                                                  quantile_model=qmodel, quantiles=quantiles, store=store)
+            st.update(rows=len(future_df), band_outside=band_outside(future_df, quantiles))
+    if strategy != "recursive":
+        with rr.stage("direct") as st:
+            direct_df, direct_out = run_direct(model, feat, raw, feature_cols, fill_values, d_va, cfg, out_dir,
+                                               n_jobs=n_jobs, compare=strategy == "both")
+            st["rows"] = len(direct_df)
+        summary["direct"] = direct_out
+        if strategy == "direct":
+            future_df = direct_df
+        else:
+            summary["outputs"] += save_future(cfg, direct_df, None, out_dir, kind="forecast_direct")
+            print(f"[저장] 직접 예측 CSV : {summary['outputs'][-1]}")
+
+    # =======================
+    # 결과 저장/시각화 (원값 + MA7)
+    # =======================
+    with rr.stage("save"):
+        eval_df = pd.DataFrame({"date": pd.Series(d_te).astype("datetime64[ns]").values, "actual": np.asarray(y_te, dtype=float)})
+        if len(y_hat_eval)>0:
+            eval_df["pred"] = y_hat_eval
+            eval_df["pred_ma7"] = pd.Series(eval_df["pred"]).rolling(7, min_periods=1).mean()
+        else:
+            eval_df["pred"] = np.nan
+            eval_df["pred_ma7"] = np.nan
+        csv_eval = out_dir / f"pred_2025_{cfg.pref}_upto_{EVAL_END_2025.strftime('%Y%m%d')}.csv"
+        eval_df.to_csv(csv_eval, index=False, encoding="utf-8-sig")
+        future_paths = save_future(cfg, future_df, bands_df, out_dir)
+        summary["outputs"] = [str(csv_eval)] + [str(p) for p in future_paths + summary["outputs"]]
+
+    print(f"[저장] 평가 CSV : {csv_eval}")
+    for label, path in zip(("예측", "밴드"), future_paths):
+        print(f"[저장] {label} CSV : {path}")
+
+    jobs = []
+    if plots:
+        plot_path = out_dir / f"plot_2025_{cfg.pref}_actual_to_0912_and_forecast_to_1231.png"
+        jobs.append(("plot_forecast", (cfg, eval_df, future_df, bands_df, plot_path)))
+        summary["outputs"].append(str(plot_path))
+        print(f"[저장] 통합 플롯: {plot_path}")
+
+    # ===== 추가 실험: 2021~2023 → 2024 예측 =====
+    if backtest:
+        with rr.stage("backtest"):
+            summary["backtest"] = backtest_21_23_to_24(feat, feature_cols, cfg, out_dir, n_jobs=n_jobs, show=show,
+                                                       plots=plots, jobs=jobs, fm=fm)
+
+    # ===== 그래프 (예측/백테스트 산출물이 모두 저장된 뒤) =====
+    if plots == "defer":
+        summary["plot_jobs"] = jobs
+    elif jobs:
+        with rr.stage("plot", figures=len(jobs)):
+            if show:
+                for job in jobs:
+                    render_job(job, show=True)
+            else:
+                render_jobs(jobs, workers=n_jobs)
+
+    summary["best_iteration"] = getattr(model, "best_iteration", None)
+    summary["seconds"] = round(time.perf_counter() - t0, 2)
+    rr.set(best_iteration=summary["best_iteration"], strategy=strategy, n_jobs=n_jobs, low_memory=bool(low_memory),
+           engine=engine, matrix_mb=round(fm.nbytes / 1e6, 2) if fm is not None else None)
+    summary["report"] = str(rr.finish(out_dir, cfg.pref))
+    summary["peak_rss_mb"] = rr.doc.get("peak_rss_mb")
+    print(f"{tag} 단계별 소요 ({summary['report']})\n{rr.table()}")
+    if fm is not None:
+        print(f"{tag} 저메모리 모드: 피처 행렬 {fm.nbytes / 1e6:.1f}MB · 최대 RSS {summary['peak_rss_mb']}MB")
+    return summary
+
+
+def forecast_only(cfg, data_root=".", out_dir=OUT_DIR, n_jobs=None, n_scenarios=N_SCENARIOS,
+                  cache_dir=CACHE_DIR, archive_dir=ARCHIVE_DIR, model_dir=MODEL_DIR, profile=None,
+                  store_dir=STORE_DIR) -> dict:
+    """
+    저장된 산출물로 순차 예측만 실행 (학습/평가/그래프/백테스트 없음).
+    최신 가격으로 상태를 다시 쌓으므로 새 일자가 들어오면 예측이 갱신된다.
+    """
+    cfg = get_commodity(cfg)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+
+    rr = RunReport(cfg.name, "forecast", profile)
+
+    with rr.stage("artifact") as st:
+        art = load_artifact(model_dir, cfg)
+        if n_jobs is not None:
+            art.model.set_params(n_jobs=n_jobs)
+        st["best_iteration"] = art.meta.get("best_iteration")
+    with rr.stage("load") as st:
+        raw = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL,
+                                 cache_dir=cache_dir, workers=n_jobs)
+        st["rows"] = int(raw[TARGET_COL].notna().sum())
+    fingerprint = data_fingerprint(raw, TARGET_COL)
+    if fingerprint != art.fingerprint:
+        print(f"[{cfg.name}] 학습 이후 가격 데이터가 바뀌었습니다 → 저장된 모델로 최신 데이터 예측")
+    with rr.stage("features") as st:
+        store = materialize(raw, TARGET_COL, store_path(store_dir, cfg) if store_dir else None, USE_YOY, cfg.ffill)
+        st.update(store=store.info["action"], rows=store.info["rows"])
+
+    with rr.stage("forecast", scenarios=n_scenarios if len(art.residuals) else 0) as st:
+        future_df, bands_df = forecast_future(art.model, raw, art.feature_cols, art.fill_values, cfg,
+                                              residuals=art.residuals, n_scenarios=n_scenarios,
+                                              quantile_model=art.quantile_model, quantiles=art.quantiles,
+                                              store=store)
+        st.update(rows=len(future_df), band_outside=band_outside(future_df, art.quantiles))
+    with rr.stage("save"):
+        paths = save_future(cfg, future_df, bands_df, out_dir)
+    for label, path in zip(("예측", "밴드"), paths):
+        print(f"[저장] {label} CSV : {path}")
+    rr.set(best_iteration=art.meta.get("best_iteration"), data_changed=fingerprint != art.fingerprint)
+    return {"name": cfg.name, "outputs": [str(p) for p in paths], "forecast_only": True,
+            "data_changed": fingerprint != art.fingerprint,
+            "best_iteration": art.meta.get("best_iteration"),
+            "report": str(rr.finish(out_dir, cfg.pref)),
+            "seconds": round(time.perf_counter() - t0, 2)}
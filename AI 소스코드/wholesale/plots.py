@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+그래프 (matplotlib 은 그릴 때만 import → 그래프를 끄면 import 자체가 없음)
+- 통합 플롯: 실측(~09/12) + 예측 + 미래 순차 예측(+시나리오 밴드)
+- 백테스트 플롯: 2021~2023 학습 → 2024 예측
+- 오차 곡선: 원점별 순차 예측 백필의 경과 일수별 MAE/SMAPE
+- 한글 폰트: KOREAN_FONTS 중 설치된 첫 폰트를 프로세스당 1회 결정 (WHOLESALE_FONT 로 지정 가능)
+- show=False 면 비대화형 백엔드(Agg) → 서버에서 창/블로킹 없음
+- render_jobs: (함수명, 인자) 작업 목록을 프로세스 풀에서 렌더링 (모델링이 끝난 뒤, 예측 경로 밖)
+"""
+
+import functools
+import os
+import pickle
+
+import pandas as pd
+
+from .config import EVAL_END_2025, FORECAST_END
+
+KOREAN_FONTS = ("Malgun Gothic", "AppleGothic", "NanumGothic", "NanumBarunGothic", "Noto Sans CJK KR",
+                "Noto Sans KR", "Noto Sans CJK JP", "UnDotum", "Baekmuk Gulim")
+
+
+@functools.lru_cache(maxsize=None)
+def korean_font():
+    """설치된 한글 폰트 이름 (없으면 None → matplotlib 기본 폰트, 한글은 □ 로 표시)."""
+    from matplotlib import font_manager
+
+    installed = {f.name for f in font_manager.fontManager.ttflist}
+    wanted = os.environ.get("WHOLESALE_FONT")
+    for name in ((wanted,) if wanted else ()) + KOREAN_FONTS:
+        if name in installed:
+            return name
+    print(f"[WARN] 한글 폰트 없음 ({', '.join(KOREAN_FONTS[:3])} ...) → 기본 폰트 사용")
+    return None
+
+
+def _pyplot(show=False):
+    import matplotlib
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    font = korean_font()
+    if font:
+        plt.rcParams["font.family"] = font
+    plt.rcParams["axes.unicode_minus"] = False
+    return plt
+
+
+# =======================
+# 지연 렌더링 (프로세스 풀)
+# =======================
+def render_job(job, show=False):
+    """(함수명, 인자 튜플) 1개 렌더링 → 저장 경로."""
+    name, args = job
+    globals()[name](*args, show=show)
+    return str(args[-1])
+
+
+def render_blob(blob: bytes) -> list:
+    """pickle 된 작업 목록 렌더링 (부모 프로세스가 pandas 를 import 하지 않도록 bytes 로 전달)."""
+    return [render_job(job) for job in pickle.loads(blob)]
+
+
+def render_jobs(jobs, workers=None) -> list:
+    """작업 목록을 프로세스 풀로 렌더링 (workers=1 이면 현재 프로세스). 반환: 저장 경로 목록"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = list(jobs)
+    workers = max(1, min(len(jobs), workers or os.cpu_count() or 1))
+    if workers == 1:
+        return [render_job(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render) as ex:
+        return list(ex.map(render_job, jobs))
+
+
+def _init_render():
+    os.environ["MPLBACKEND"] = "Agg"
+
+
+def plot_forecast(cfg, eval_df: pd.DataFrame, future_df: pd.DataFrame, bands_df, out_path, show=True):
+    plt = _pyplot(show)
+    plt.figure(figsize=(14,6))
+
+    # 실측(~09/12) + 예측(~09/12)
+    if not eval_df.empty:
+        plt.plot(eval_df["date"], eval_df["actual"], label="실제(2025~09-12)", linewidth=2)
+        if "pred" in eval_df:
+            plt.plot(eval_df["date"], eval_df["pred"],     label="예측(원값·~09/12)", alpha=0.8)
+            plt.plot(eval_df["date"], eval_df["pred_ma7"], label="예측(7일MA·~09/12)", linewidth=2)
+
+    # 미래(09/13~12/31) — 점선
+    plt.plot(future_df["date"], future_df["pred"],     linestyle="--", label="예측(원값·09/13~12/31)", alpha=0.95)
+    plt.plot(future_df["date"], future_df["pred_ma7"], linestyle="--", linewidth=2, label="예측(7일MA·09/13~12/31)")
+    qcols = [c for c in future_df.columns if c.startswith("pred_p")]
+    if len(qcols) >= 2:
+        plt.fill_between(future_df["date"], future_df[qcols[0]], future_df[qcols[-1]], color="tab:green", alpha=0.12,
+                         label=f"분위 회귀 구간({qcols[0][5:].upper()}~{qcols[-1][5:].upper()})")
+    if bands_df is not None:
+        plt.fill_between(bands_df["date"], bands_df["p10"], bands_df["p90"], color="tab:orange", alpha=0.15,
+                         label=f"시나리오 범위(P10~P90, {bands_df.attrs.get('n_paths', '')}경로)")
+
+    ymin, ymax = plt.gca().get_ylim()
+    plt.axvspan(EVAL_END_2025, FORECAST_END, color="lightgray", alpha=0.25, lw=0)
+    plt.axvline(EVAL_END_2025, color="gray", linestyle="--", linewidth=1.5)
+    plt.text(EVAL_END_2025, ymax*0.98, "  2025-09-12 (실측 종료)", va="top", ha="left", fontsize=9, color="gray")
+
+    plt.title(f"{cfg.name} 도매 평균가: 실측(~09/12) + 미래 순차 예측(09/13~12/31)\n{cfg.subtitle}")
+    plt.xlabel("날짜"); plt.ylabel("가격(원)")
+    plt.grid(True, alpha=0.4); plt.legend(ncol=2); plt.tight_layout()
+
+    plt.savefig(out_path, dpi=150)
+    if show:
+        plt.show()
+    plt.close()
+
+
+def plot_backtest(cfg, dates, y_true, pred, out_path, show=True):
+    plt = _pyplot(show)
+    plt.figure(figsize=(14,6))
+    plt.plot(dates, y_true, label="실제 2024", linewidth=2)
+    plt.plot(dates, pred,   label="예측 2024", alpha=0.9)
+    plt.plot(dates, pd.Series(pred).rolling(7, min_periods=1).mean(), label="예측 2024 (7일MA)", linewidth=2)
+    plt.title(f"{cfg.name} 도매가 예측 — (학습: 2021~2023 → 예측: 2024)")
+    plt.xlabel("날짜"); plt.ylabel("가격(원)")
+    plt.grid(True, alpha=0.4); plt.legend(); plt.tight_layout()
+    plt.savefig(out_path, dpi=150)
+    if show:
+        plt.show()
+    plt.close()
+
+
+def plot_error_curve(cfg, curve: pd.DataFrame, out_path, origins, show=True):
+    plt = _pyplot(show)
+    fig, ax1 = plt.subplots(figsize=(12,5))
+    ax1.plot(curve["horizon"], curve["mae"], label="MAE(원)", linewidth=2)
+    ax1.set_xlabel("예측 경과 일수 (h)"); ax1.set_ylabel("MAE(원)")
+    ax2 = ax1.twinx()
+    ax2.plot(curve["horizon"], curve["smape"], color="tab:orange", linestyle="--", label="SMAPE(%)")
+    ax2.set_ylabel("SMAPE(%)")
+    span = f"{pd.Timestamp(origins[0]).date()} ~ {pd.Timestamp(origins[-1]).date()}"
+    ax1.set_title(f"{cfg.name} 순차 예측 오차 (원점 {len(origins)}개: {span})")
+    lines = ax1.get_legend_handles_labels(), ax2.get_legend_handles_labels()
+    ax1.legend(lines[0][0] + lines[1][0], lines[0][1] + lines[1][1], loc="upper left")
+    ax1.grid(True, alpha=0.4); fig.tight_layout()
+    fig.savefig(out_path, dpi=150)
+    if show:
+        plt.show()
+    plt.close(fig)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 계측 + 실행 보고서 (품목별 JSON)
+- stage(): 벽시계/CPU 시간, 단계 종료 시점 프로세스 최대 RSS, 처리 행 수 + 임의 항목(best_iteration 등)
+- 보고서: out_dir/run_report_{pref}_{kind}.json (kind: train / forecast)
+  → 느린 야간 실행에서 어느 단계(파싱/피처/GPU 폴백/학습/예측/그래프)가 시간을 썼는지 확인
+- 프로파일(선택): profile=True 또는 환경변수 WHOLESALE_PROFILE=1 → cProfile 결과 out_dir/profile_{pref}_{kind}.prof
+  (python -m pstats / snakeviz 로 열기; py-spy 는 외부에서 `py-spy record -- python -m wholesale ...` 로 그대로 사용)
+- 최대 RSS 는 프로세스 단위 누적 최대값 (병렬 워커가 품목 여러 개를 처리하면 앞 품목의 최대값 포함)
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+REPORT_VERSION = 1
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (MB). 측정 불가 환경이면 None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)   # macOS: 바이트, Linux: KB
+
+
+def profile_enabled(profile=None) -> bool:
+    if profile is not None:
+        return bool(profile)
+    return os.environ.get("WHOLESALE_PROFILE", "").lower() in ("1", "true", "yes", "cprofile")
+
+
+class RunReport:
+    """품목 1개 실행의 단계 기록."""
+
+    def __init__(self, name, kind="train", profile=None):
+        self.doc = {"version": REPORT_VERSION, "commodity": name, "kind": kind, "pid": os.getpid(),
+                    "started": time.strftime("%Y-%m-%dT%H:%M:%S"), "stages": []}
+        self._t0, self._c0 = time.perf_counter(), time.process_time()
+        self._profiler = None
+        if profile_enabled(profile):
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    @contextmanager
+    def stage(self, name, rows=None, **extra):
+        """with report.stage("fit", rows=n) as st: ... st["best_iteration"] = ..."""
+        rec = {"stage": name, "rows": rows, **extra}
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield rec
+        except BaseException as e:
+            rec["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            rec["wall_s"] = round(time.perf_counter() - t0, 4)
+            rec["cpu_s"] = round(time.process_time() - c0, 4)
+            rec["peak_rss_mb"] = peak_rss_mb()
+            self.doc["stages"].append(rec)
+
+    def set(self, **items):
+        self.doc.update(items)
+
+    def finish(self, out_dir, pref) -> Path:
+        """합계 기록 + JSON 저장 (+프로파일 덤프). 반환: 보고서 경로"""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if self._profiler is not None:
+            self._profiler.disable()
+            prof = out_dir / f"profile_{pref}_{self.doc['kind']}.prof"
+            self._profiler.dump_stats(prof)
+            self.doc["profile"] = str(prof)
+        self.doc["wall_s"] = round(time.perf_counter() - self._t0, 3)
+        self.doc["cpu_s"] = round(time.process_time() - self._c0, 3)
+        self.doc["peak_rss_mb"] = peak_rss_mb()
+        path = out_dir / f"run_report_{pref}_{self.doc['kind']}.json"
+        path.write_text(json.dumps(self.doc, ensure_ascii=False, indent=1, default=str), encoding="utf-8")
+        return path
+
+    def table(self) -> str:
+        """단계별 한 줄 요약 (로그용)."""
+        lines = []
+        for r in self.doc["stages"]:
+            rows = f"{r['rows']:>9,}행" if r.get("rows") is not None else " " * 11
+            lines.append(f"  {r['stage']:<10}{r['wall_s']:>8.2f}s  cpu {r['cpu_s']:>7.2f}s  {rows}"
+                         + (f"  rss {r['peak_rss_mb']:,.0f}MB" if r.get("peak_rss_mb") is not None else ""))
+        return "\n".join(lines)
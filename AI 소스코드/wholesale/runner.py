@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+전 품목 병렬 실행 (프로세스 풀)
+- 품목 1개 = 워커 1개, 워커마다 XGBoost 스레드 예산(n_jobs)을 명시해 코어 과다구독 방지
+- 부모 프로세스는 pandas/xgboost/matplotlib 을 import 하지 않음 (워커에서 1회씩)
+- 그래프: 학습 워커는 그래프 작업만 pickle(bytes)로 돌려주고, 부모가 같은 풀에 렌더링 작업으로 다시 제출
+  → 예측 CSV 는 그래프와 무관하게 먼저 저장되고, 렌더링은 비는 워커에서 진행
+"""
+
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .config import ARCHIVE_DIR, CACHE_DIR, COMMODITIES, MODEL_DIR, N_SCENARIOS, OUT_DIR, STORE_DIR
+
+
+def thread_budget(n_workers, n_threads=None):
+    """워커당 스레드 수 (미지정 시 코어를 워커 수로 균등 분배)."""
+    if n_threads:
+        return int(n_threads)
+    return max(1, (os.cpu_count() or 1) // max(1, n_workers))
+
+
+def _init_worker(n_threads):
+    # 라이브러리 import 전에 스레드 풀 크기 고정 + 창 없는 백엔드
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(n_threads)
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+
+MODES = ("train", "forecast", "update")
+
+
+def _run_one(name, mode, data_root, out_dir, n_threads, backtest, cache_dir, archive_dir, model_dir, n_scenarios,
+             update_opts, tuned, strategy="recursive", profile=None, plots=True, store_dir=STORE_DIR,
+             pruned=False, low_memory=False, engine=None):
+    common = dict(data_root=data_root, out_dir=out_dir, n_jobs=n_threads, n_scenarios=n_scenarios,
+                  cache_dir=cache_dir, archive_dir=archive_dir, model_dir=model_dir, store_dir=store_dir)
+    if mode == "forecast":
+        from .pipeline import forecast_only
+        return forecast_only(name, profile=profile, **common)
+    if mode == "update":
+        from .update import update_commodity
+        return update_commodity(name, **common, **(update_opts or {}))
+    from .pipeline import run_commodity
+    summary = run_commodity(name, show=False, backtest=backtest, tuned=tuned, strategy=strategy, profile=profile,
+                            plots="defer" if plots else False, pruned=pruned, low_memory=low_memory,
+                            engine=engine,
+                            **common)
+    if "plot_jobs" in summary:
+        summary["plot_jobs"] = pickle.dumps(summary["plot_jobs"])   # 부모는 DataFrame 을 풀지 않고 그대로 전달
+    return summary
+
+
+def _render(blob):
+    from .plots import render_blob
+    return render_blob(blob)
+
+
+def run_all(names=None, workers=None, threads=None, data_root=".", out_dir=OUT_DIR, backtest=True,
+            cache_dir=CACHE_DIR, archive_dir=ARCHIVE_DIR, model_dir=MODEL_DIR, n_scenarios=N_SCENARIOS,
+            mode="train", update_opts=None, tuned=False, strategy="recursive", profile=None, plots=True,
+            store_dir=STORE_DIR, pruned=False, low_memory=False, engine=None) -> list:
+    """
+    names 의 품목(기본: 전체)을 병렬로 학습/예측. 반환: 품목별 요약 dict 목록 (names 순서)
+    - workers: 동시 워커 수 (기본: min(품목 수, 코어 수))
+    - threads: 워커당 XGBoost 스레드 수 (기본: 코어 수 // workers)
+    - mode: "train" 전체 학습 / "forecast" 저장 모델로 예측만 / "update" 증분 갱신(드리프트 시 재학습)
+    - update_opts: update_commodity 옵션 (rounds, drift_threshold, max_updates)
+    - tuned: 학습 시 탐색 결과(TUNE_DIR/{pref}_best.json) 파라미터 사용
+    - strategy: 학습 시 미래 예측 방식 (recursive / direct / both — run_commodity 참고)
+    - profile: 품목별 cProfile 덤프 (out_dir/profile_{pref}_*.prof, None 이면 환경변수 WHOLESALE_PROFILE)
+    - plots: 학습 시 그래프 (False 면 렌더링 없음, 워커도 matplotlib 을 import 하지 않음)
+    - store_dir: 품목별 피처 저장소 (None 이면 매번 build_features)
+    - pruned: 학습 시 피처 사양(SPEC_DIR/{pref}_features.json)의 컬럼만 사용
+    - low_memory: 학습 시 연속 float32 행렬 + 슬라이스 뷰 (품목별 최대 RSS 를 결과에 표시)
+    - engine: 학습 시 수집/병합/피처 실행 경로 (pandas / arrow, None 이면 config.ENGINE)
+    """
+    if mode not in MODES:
+        raise ValueError(f"알 수 없는 mode '{mode}' (가능: {', '.join(MODES)})")
+    names = list(names or COMMODITIES)
+    unknown = [n for n in names if n not in COMMODITIES]
+    if unknown:
+        raise ValueError(f"알 수 없는 품목: {', '.join(unknown)} (가능: {', '.join(COMMODITIES)})")
+    workers = workers or min(len(names), os.cpu_count() or 1)
+    n_threads = thread_budget(workers, threads)
+    print(f"[RUN] {mode} · 품목 {len(names)}개 · 워커 {workers}개 × XGBoost 스레드 {n_threads}")
+
+    t0 = time.perf_counter()
+    results, renders = {}, {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(n_threads,)) as ex:
+        futs = {ex.submit(_run_one, n, mode, data_root, out_dir, n_threads, backtest, cache_dir, archive_dir,
+                          model_dir, n_scenarios, update_opts, tuned, strategy, profile, plots,
+                          store_dir, pruned, low_memory, engine): n for n in names}
+        for fut in as_completed(futs):
+            name = futs[fut]
+            try:
+                results[name] = fut.result()
+                rss = results[name].get("peak_rss_mb")
+                print(f"[완료] {name} ({results[name]['seconds']:.1f}s" + (f", 최대 RSS {rss:,.0f}MB)" if rss else ")"))
+            except Exception as e:
+                results[name] = {"name": name, "error": f"{type(e).__name__}: {e}"}
+                print(f"[실패] {name}: {results[name]['error']}")
+                continue
+            blob = results[name].pop("plot_jobs", None)
+            if blob:
+                renders[ex.submit(_render, blob)] = name
+        t_model = time.perf_counter() - t0
+        for fut in as_completed(renders):
+            name = renders[fut]
+            try:
+                results[name]["plots"] = fut.result()
+            except Exception as e:   # 그래프 실패는 예측 결과에 영향 없음
+                results[name]["plot_error"] = f"{type(e).__name__}: {e}"
+                print(f"[WARN] {name} 그래프 실패: {results[name]['plot_error']}")
+    if renders:
+        print(f"[RUN] 모델링 {t_model:.1f}s · 그래프 {time.perf_counter() - t0 - t_model:.1f}s")
+    print(f"[RUN] 전체 {time.perf_counter() - t0:.1f}s")
+    return [results[n] for n in names]
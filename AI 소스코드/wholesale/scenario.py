@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+몬테카를로 시나리오 예측
+- 경로 N개를 한 번에 진행: 스텝마다 N×F 피처 행렬 1회 생성 + model.predict 1회
+- 불확실성: (중심화한) 검증 잔차 부트스트랩(bootstrap) 또는 정규 잡음 주입(noise)
+- 출력: 일자별 분위수 밴드 (p10/p50/p90 ...) → 출하/보관 판단용 범위
+"""
+
+import numpy as np
+import pandas as pd
+
+from .feature_state import FeatureState
+
+
+def predict_batch(model, X: np.ndarray, feature_cols) -> np.ndarray:
+    """N×F 행렬을 한 번의 predict 로 평가 (학습 때와 같은 컬럼명 유지)."""
+    return np.asarray(model.predict(pd.DataFrame(X, columns=list(feature_cols))), dtype=float)
+
+
+def simulate_paths(model, state: FeatureState, end_date, feature_cols, fill_values,
+                   residuals=None, n_paths=1000, method="bootstrap", noise_std=None, seed=42):
+    """
+    state(단일 경로, next_date = 예측 시작일)에서 end_date 까지 n_paths 개 경로를 진행.
+    - bootstrap: 예측값 + 중심화 잔차(잔차 - 평균) 표본(복원추출) → 밴드는 점 예측 경로 주변
+      (검증 잔차의 평균 = 검증 구간 편향, 미래 경로에 더하면 밴드 전체가 한쪽으로 밀림)
+    - noise    : 예측값 + N(0, noise_std)  (noise_std 미지정 시 잔차 표준편차)
+    반환: (dates, paths)  paths 는 (스텝 수, n_paths) 배열
+    """
+    if state.n != 1:
+        raise ValueError("simulate_paths: 단일 경로 상태에서 시작해야 합니다.")
+    residuals = None if residuals is None else np.asarray(residuals, dtype=float)
+    if residuals is not None:
+        residuals = residuals[np.isfinite(residuals)]
+        if len(residuals):
+            residuals = residuals - residuals.mean()
+    if method == "bootstrap":
+        if residuals is None or len(residuals) == 0:
+            raise ValueError("simulate_paths: bootstrap 에는 잔차가 필요합니다.")
+    elif method == "noise":
+        if noise_std is None:
+            if residuals is None or len(residuals) < 2:
+                raise ValueError("simulate_paths: noise_std 또는 잔차가 필요합니다.")
+            noise_std = float(np.std(residuals, ddof=1))
+    else:
+        raise ValueError(f"simulate_paths: 알 수 없는 method '{method}' (bootstrap/noise)")
+
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(pd.Timestamp(state.next_date[0]), end_date, freq="D")
+    paths = np.empty((len(dates), n_paths))
+    batch = state.repeat(n_paths)
+    for t in range(len(dates)):
+        y = predict_batch(model, batch.matrix(feature_cols, fill_values), feature_cols)
+        if method == "bootstrap":
+            y = y + rng.choice(residuals, size=n_paths, replace=True)
+        else:
+            y = y + rng.normal(0.0, noise_std, size=n_paths)
+        y = np.maximum(y, 0.0)   # 가격은 음수 불가
+        paths[t] = y
+        batch.push(y)
+    return dates, paths
+
+
+def quantile_bands(dates, paths: np.ndarray, quantiles=(0.1, 0.5, 0.9)) -> pd.DataFrame:
+    """경로 행렬 → 일자별 평균 + 분위수 컬럼 (p10, p50, p90 ...)."""
+    out = pd.DataFrame({"date": dates, "mean": paths.mean(axis=1)})
+    qs = np.quantile(paths, quantiles, axis=1)
+    for q, v in zip(quantiles, qs):
+        out[f"p{int(round(q * 100))}"] = v
+    out.attrs["n_paths"] = paths.shape[1]
+    return out
+
+
+def scenario_forecast(model, state: FeatureState, end_date, feature_cols, fill_values,
+                      residuals=None, n_paths=1000, method="bootstrap", noise_std=None,
+                      quantiles=(0.1, 0.5, 0.9), seed=42) -> pd.DataFrame:
+    """simulate_paths + quantile_bands 를 한 번에."""
+    dates, paths = simulate_paths(model, state, end_date, feature_cols, fill_values,
+                                  residuals=residuals, n_paths=n_paths, method=method,
+                                  noise_std=noise_std, seed=seed)
+    return quantile_bands(dates, paths, quantiles)
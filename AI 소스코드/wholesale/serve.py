@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 예측 API (Flutter 앱용, 표준 라이브러리 asyncio HTTP/1.1)
+- 시작 시 저장 산출물(models/)을 품목별로 로드 → 09/13~12/31 순차 예측을 미리 계산해 메모리에 보관
+- 응답 본문은 LRU 캐시 (경로+쿼리 키) + ETag → If-None-Match 일치 시 304 (본문 없음)
+- 요청 처리는 이벤트 루프에서 비동기, 예측 재계산(/reload)은 스레드 풀에서 실행 → 조회 요청이 막히지 않음
+
+    python -m wholesale.serve                         # http://127.0.0.1:8765
+    python -m wholesale.serve --host 0.0.0.0 --port 8000 --model-dir models
+
+    GET  /health
+    GET  /commodities                                   품목 목록 (예측 가능 여부, 데이터 끝 일자, 버전)
+    GET  /forecast/{품목}?start=2025-10-01&end=2025-10-31  일자별 pred / pred_ma7 (+ pred_p10/p50/p90)
+    POST /reload[?item=품목]                             가격 데이터/산출물 다시 읽고 예측 재계산
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .config import (ARCHIVE_DIR, CACHE_DIR, COMMODITIES, FORECAST_END, MODEL_DIR, STORE_DIR, TARGET_COL, USE_YOY,
+                     get_commodity)
+
+DEFAULT_HOST  = "127.0.0.1"
+DEFAULT_PORT  = 8765
+CACHE_SIZE    = 256        # 응답 LRU 항목 수
+MAX_HEADER    = 16 * 1024  # 요청 헤더 최대 바이트
+KEEPALIVE_SEC = 15
+
+_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def resolve_name(name: str) -> str:
+    """앱 표기(감자(수미), 감자_평균가 ...) → COMMODITIES 키."""
+    name = unquote(name).strip()
+    if name in COMMODITIES:
+        return name
+    for key, cfg in COMMODITIES.items():
+        if name == cfg.pref:
+            return key
+    base = re.sub(r"\(.*?\)", "", name).strip()
+    if base in COMMODITIES:
+        return base
+    raise HTTPError(404, f"알 수 없는 품목 '{name}' (가능: {', '.join(COMMODITIES)})")
+
+
+# =======================
+# 응답 캐시
+# =======================
+class ResponseCache:
+    """
+    (키 → (ETag, 본문)) LRU. 스레드 안전 (재계산 스레드가 무효화).
+    clear() 마다 세대(generation) 증가 → 무효화 전에 읽기 시작한 본문은 put 해도 저장하지 않음
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+        self.generation = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item
+
+    def put(self, key, body: bytes, generation=None):
+        """generation: 본문을 만들기 전에 읽은 세대 (그 사이 clear 됐으면 저장 생략, ETag/본문은 그대로 반환)."""
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return etag, body
+            self._items[key] = (etag, body)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return etag, body
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.generation += 1
+
+
+# =======================
+# 예측 보관소
+# =======================
+class ForecastStore:
+    """품목별 (산출물, 예측 DataFrame) 메모리 보관. load() 는 무거움 → 스레드에서 호출."""
+
+    def __init__(self, names=None, data_root=".", model_dir=MODEL_DIR, cache_dir=CACHE_DIR,
+                 archive_dir=ARCHIVE_DIR, store_dir=STORE_DIR):
+        self.names = list(names or COMMODITIES)
+        self.data_root, self.model_dir = data_root, model_dir
+        self.cache_dir, self.archive_dir, self.store_dir = cache_dir, archive_dir, store_dir
+        self.entries = {}   # 품목 → dict(forecast, meta, version, loaded_at) 또는 dict(error)
+        self._lock = threading.Lock()
+
+    def load(self, name):
+        """품목 1개 산출물 로드 + 순차 예측 (시나리오 밴드 없음)."""
+        from .archive import load_commodity_raw
+        from .artifacts import data_fingerprint, load_artifact
+        from .feature_store import materialize, store_path
+        from .pipeline import forecast_future
+
+        cfg = get_commodity(name)
+        t0 = time.perf_counter()
+        try:
+            art = load_artifact(self.model_dir, cfg)
+            raw = load_commodity_raw(cfg, self.data_root, self.archive_dir, FORECAST_END, TARGET_COL,
+                                     cache_dir=self.cache_dir)
+            fs = materialize(raw, TARGET_COL, store_path(self.store_dir, cfg) if self.store_dir else None,
+                             USE_YOY, cfg.ffill)
+            future_df, _ = forecast_future(art.model, raw, art.feature_cols, art.fill_values, cfg,
+                                           n_scenarios=0, quantile_model=art.quantile_model,
+                                           quantiles=art.quantiles, store=fs)
+            data_end = raw.loc[raw[TARGET_COL].notna(), "date"].max()
+            entry = {"forecast": future_df, "data_end": str(data_end.date()),
+                     "version": hashlib.blake2b(f"{data_fingerprint(raw, TARGET_COL)}:{art.fingerprint}:"
+                                                f"{art.meta.get('best_iteration')}".encode(), digest_size=8).hexdigest(),
+                     "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            print(f"[serve] {name}: 예측 {len(future_df)}일 적재 ({time.perf_counter() - t0:.2f}s)")
+        except (FileNotFoundError, ValueError) as e:
+            entry = {"error": str(e)}
+            print(f"[serve] {name}: 사용 불가 — {e}")
+        with self._lock:
+            self.entries[name] = entry
+        return entry
+
+    def load_all(self):
+        for name in self.names:
+            self.load(name)
+
+    def get(self, name):
+        with self._lock:
+            entry = self.entries.get(name)
+        if entry is None:
+            raise HTTPError(404, f"'{name}' 은(는) 이 서버에서 제공하지 않습니다.")
+        if "error" in entry:
+            raise HTTPError(503, entry["error"])
+        return entry
+
+
+# =======================
+# 요청 처리
+# =======================
+def _date_arg(query, key):
+    import pandas as pd
+
+    value = query.get(key, [None])[0]
+    if value in (None, ""):
+        return None
+    try:
+        return pd.Timestamp(value)
+    except ValueError:
+        raise HTTPError(400, f"{key} 날짜 형식 오류: {value} (YYYY-MM-DD)") from None
+
+
+def _json(doc) -> bytes:
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ForecastAPI:
+    """경로 → JSON 본문. GET 응답은 LRU + ETag."""
+
+    def __init__(self, store: ForecastStore, cache_size=CACHE_SIZE):
+        self.store = store
+        self.cache = ResponseCache(cache_size)
+
+    def forecast_body(self, name, query) -> bytes:
+        entry = self.store.get(name)
+        df = entry["forecast"]
+        start, end = _date_arg(query, "start"), _date_arg(query, "end")
+        if start is not None and end is not None and start > end:
+            raise HTTPError(400, "start 가 end 보다 늦습니다.")
+        mask = df["date"].notna()
+        if start is not None:
+            mask &= df["date"] >= start
+        if end is not None:
+            mask &= df["date"] <= end
+        part = df.loc[mask]
+        cols = [c for c in part.columns if c != "date"]
+        rows = [{"date": d.strftime("%Y-%m-%d"), **{c: round(float(v), 1) for c, v in zip(cols, vals)}}
+                for d, *vals in part[["date"] + cols].itertuples(index=False)]
+        return _json({"commodity": name, "unit": "원", "data_end": entry["data_end"], "version": entry["version"],
+                      "start": rows[0]["date"] if rows else None, "end": rows[-1]["date"] if rows else None,
+                      "columns": cols, "rows": rows})
+
+    def commodities_body(self) -> bytes:
+        items = []
+        for name in self.store.names:
+            entry = self.store.entries.get(name, {"error": "로드 전"})
+            items.append({"name": name, "pref": COMMODITIES[name].pref, "available": "error" not in entry,
+                          **({"error": entry["error"]} if "error" in entry else
+                             {"data_end": entry["data_end"], "version": entry["version"]})})
+        return _json({"commodities": items})
+
+    def get(self, path, query):
+        """GET 본문 (캐시 적중 시 재사용). 반환: (ETag, 본문)"""
+        key = path + "?" + "&".join(f"{k}={v[0]}" for k, v in sorted(query.items()))
+        generation = self.cache.generation   # 보관소를 읽기 전 → reload 와 겹치면 옛 본문을 캐시에 넣지 않음
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        parts = [p for p in path.split("/") if p]
+        if parts == ["health"]:
+            return None, _json({"status": "ok", "cache": {"size": len(self.cache._items), "hits": self.cache.hits,
+                                                          "misses": self.cache.misses}})
+        if parts == ["commodities"]:
+            body = self.commodities_body()
+        elif len(parts) == 2 and parts[0] == "forecast":
+            body = self.forecast_body(resolve_name(parts[1]), query)
+        else:
+            raise HTTPError(404, f"없는 경로: {path}")
+        return self.cache.put(key, body, generation)
+
+    def reload(self, query):
+        names = [resolve_name(query["item"][0])] if "item" in query else self.store.names
+        for name in names:
+            self.store.load(name)
+        self.cache.clear()
+        return _json({"reloaded": names})
+
+
+# =======================
+# asyncio HTTP 서버
+# =======================
+def _response(status, body=b"", headers=None, keep_alive=True, head_only=False) -> bytes:
+    """head_only: HEAD 응답 — 헤더(Content-Length/Type 포함)는 본문 기준, 본문은 보내지 않음."""
+    head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            f"Content-Length: {len(body)}",
+            "Access-Control-Allow-Origin: *",
+            "Access-Control-Expose-Headers: ETag",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if body:
+        head.append("Content-Type: application/json; charset=utf-8")
+    head += [f"{k}: {v}" for k, v in (headers or {}).items()]
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + (b"" if head_only else body)
+
+
+async def _handle(api: ForecastAPI, reader, writer):
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_SEC)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                break
+            except asyncio.LimitOverrunError:
+                writer.write(_response(400, _json({"error": "헤더가 너무 큽니다."}), keep_alive=False))
+                break
+            lines = raw.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(_response(400, _json({"error": "잘못된 요청 줄"}), keep_alive=False))
+                break
+            headers = {k.strip().lower(): v.strip() for k, _, v in (l.partition(":") for l in lines[1:] if l)}
+            try:
+                length = int(headers.get("content-length") or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                # 본문 경계를 알 수 없음 → 응답 후 연결 종료
+                writer.write(_response(400, _json({"error": "잘못된 Content-Length"}), keep_alive=False))
+                break
+            if length:
+                await reader.readexactly(length)   # 본문은 쓰지 않음
+            keep = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+            url = urlsplit(target)
+            query = parse_qs(url.query)
+            try:
+                if method in ("GET", "HEAD"):
+                    etag, body = api.get(url.path, query)
+                    if etag and etag in [t.strip() for t in headers.get("if-none-match", "").split(",")]:
+                        resp = _response(304, headers={"ETag": etag}, keep_alive=keep)
+                    else:
+                        extra = {"ETag": etag, "Cache-Control": "no-cache"} if etag else {}
+                        resp = _response(200, body, extra, keep, head_only=method == "HEAD")
+                elif method == "POST" and url.path.rstrip("/") == "/reload":
+                    # 무거운 재계산은 스레드 풀 → 다른 연결의 조회는 계속 응답
+                    resp = _response(200, await loop.run_in_executor(None, api.reload, query), keep_alive=keep)
+                elif method == "OPTIONS":
+                    resp = _response(200, headers={"Access-Control-Allow-Methods": "GET, HEAD, POST, OPTIONS",
+                                                   "Access-Control-Allow-Headers": "If-None-Match"}, keep_alive=keep)
+                else:
+                    raise HTTPError(405, f"지원하지 않는 메서드: {method}")
+            except HTTPError as e:
+                resp = _response(e.status, _json({"error": str(e)}), keep_alive=keep, head_only=method == "HEAD")
+            except Exception as e:   # noqa: BLE001 — 서버는 계속 살아 있어야 함
+                resp = _response(500, _json({"error": f"{type(e).__name__}: {e}"}), keep_alive=keep,
+                                 head_only=method == "HEAD")
+            writer.write(resp)
+            await writer.drain()
+            if not keep:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(api: ForecastAPI, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+    """이벤트 루프에서 API 서버 실행 (ready: 시작 후 set 할 asyncio.Event, 테스트용)."""
+    server = await asyncio.start_server(lambda r, w: _handle(api, r, w), host, port, limit=MAX_HEADER)
+    addr = server.sockets[0].getsockname()
+    print(f"[serve] http://{addr[0]}:{addr[1]}  (품목 {len(api.store.names)}개, LRU {api.cache.maxsize})")
+    if ready is not None:
+        ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale.serve", description="로컬 예측 API (Flutter 앱용)")
+    ap.add_argument("items", nargs="*", help=f"품목 (기본: 전체 — {', '.join(COMMODITIES)})")
+    ap.add_argument("--host", default=DEFAULT_HOST)
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--data-root", default=".")
+    ap.add_argument("--model-dir", default=str(MODEL_DIR))
+    ap.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="응답 LRU 항목 수")
+    args = ap.parse_args(argv)
+
+    store = ForecastStore([resolve_name(n) for n in args.items] or None, data_root=args.data_root,
+                          model_dir=args.model_dir)
+    store.load_all()
+    try:
+        asyncio.run(serve(ForecastAPI(store, args.cache_size), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
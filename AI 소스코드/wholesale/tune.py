@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+하이퍼파라미터 탐색 (품목별)
+- 학습/검증 분할은 파이프라인과 동일 (split_train_valid + 다운웨이트 가중치)
+- 피처도 파이프라인과 동일: 피처 저장소(materialize) + pruned 면 피처 사양의 컬럼만 (select_feature_cols)
+- QuantileDMatrix(학습) + 같은 분위 경계를 쓰는 검증 DMatrix 를 품목당 1회만 만들고
+  스레드 풀의 모든 시도가 공유 (xgb.train 은 GIL 을 놓으므로 스레드 병렬)
+- 가지치기: prune_every 라운드마다 지금까지의 최저 검증 RMSE 를 보고 →
+  같은 라운드에 보고된 다른 시도들의 중앙값보다 나쁘면 중단 (median pruning)
+- 결과: 시도별 파라미터/RMSE/best_iteration/중단 여부/소요 시간 CSV + 최적 파라미터 JSON
+  → run_commodity(tuned=True) / python -m wholesale --tuned 가 사용 (artifacts.tuned_params)
+
+    python -m wholesale.tune                     # 5개 품목 × 40회
+    python -m wholesale.tune 양파 --trials 100 --workers 2 --threads 2
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from .archive import load_commodity_raw
+from .config import (ARCHIVE_DIR, CACHE_DIR, COMMODITIES, EARLY_STOPPING_ROUNDS, FORECAST_END, SPEC_DIR,
+                     STORE_DIR, TARGET_COL, TUNE_DIR, USE_YOY, XGB_PARAMS, get_commodity)
+from .feature_store import materialize, store_path
+from .pipeline import sample_weights, select_feature_cols, split_train_valid
+
+N_TRIALS    = 40
+PRUNE_EVERY = 100   # 라운드
+MIN_REPORTS = 4     # 같은 라운드 보고가 이만큼 모여야 가지치기 시작
+MAX_BIN     = 256
+
+# (이름, 하한, 상한, 로그 스케일, 정수)
+SEARCH_SPACE = (
+    ("learning_rate",    0.005, 0.1,  True,  False),
+    ("max_depth",        3,     10,   False, True),
+    ("min_child_weight", 0.5,   20.0, True,  False),
+    ("subsample",        0.5,   1.0,  False, False),
+    ("colsample_bytree", 0.4,   1.0,  False, False),
+    ("reg_lambda",       0.1,   20.0, True,  False),
+    ("reg_alpha",        1e-3,  5.0,  True,  False),
+)
+TUNED_KEYS = [name for name, *_ in SEARCH_SPACE]
+
+
+def sample_params(rng) -> dict:
+    """SEARCH_SPACE 에서 파라미터 1세트 (1번째 시도는 호출 측에서 기본값 사용)."""
+    out = {}
+    for name, lo, hi, log, integer in SEARCH_SPACE:
+        if integer:
+            out[name] = int(rng.integers(lo, hi + 1))
+        elif log:
+            out[name] = float(np.exp(rng.uniform(np.log(lo), np.log(hi))))
+        else:
+            out[name] = float(rng.uniform(lo, hi))
+    return out
+
+
+class MedianPruner:
+    """시도 간 공유 보고판: 라운드별 '그 시점 최저 RMSE' 목록 (스레드 안전)."""
+
+    def __init__(self, every=PRUNE_EVERY, min_reports=MIN_REPORTS):
+        self.every, self.min_reports = every, min_reports
+        self._board = {}
+        self._lock = threading.Lock()
+
+    def report(self, step, value) -> bool:
+        """보고 후 중단 여부."""
+        with self._lock:
+            seen = self._board.setdefault(step, [])
+            prune = len(seen) >= self.min_reports and value > float(np.median(seen))
+            seen.append(value)
+        return prune
+
+
+class _PruneCallback(xgb.callback.TrainingCallback):
+    def __init__(self, pruner: MedianPruner):
+        self.pruner, self.pruned_at = pruner, None
+
+    def after_iteration(self, model, epoch, evals_log):
+        rounds = epoch + 1
+        if rounds % self.pruner.every:
+            return False
+        if self.pruner.report(rounds, min(evals_log["valid"]["rmse"])):
+            self.pruned_at = rounds
+            return True
+        return False
+
+
+def build_matrices(feat: pd.DataFrame, feature_cols, cfg):
+    """파이프라인과 같은 분할/가중치로 (학습, 검증) DMatrix 1회 생성."""
+    train, valid = split_train_valid(feat, feature_cols, cfg)
+    if len(valid) == 0:
+        raise ValueError(f"[{cfg.name}] 검증셋이 없어 탐색할 수 없습니다.")
+    w_tr = sample_weights(train["date"], cfg.dw_periods)
+    dtrain = xgb.QuantileDMatrix(train[feature_cols], train["y"], weight=w_tr, max_bin=MAX_BIN)
+    dvalid = xgb.QuantileDMatrix(valid[feature_cols], valid["y"], ref=dtrain)
+    return dtrain, dvalid
+
+
+def run_trial(trial_id, params, dtrain, dvalid, pruner, n_threads=1, max_rounds=None) -> dict:
+    """시도 1회 (공유 DMatrix 로 xgb.train). 반환: 기록 dict"""
+    base = dict(XGB_PARAMS)
+    rounds = int(max_rounds or base.pop("n_estimators"))
+    base.pop("n_estimators", None)
+    seed = base.pop("random_state", 42)
+    native = {**base, **params, "seed": seed, "nthread": n_threads, "max_bin": MAX_BIN,
+              "objective": "reg:squarederror"}
+    cb = _PruneCallback(pruner)
+    t0 = time.perf_counter()
+    bst = xgb.train(native, dtrain, num_boost_round=rounds, evals=[(dvalid, "valid")],
+                    early_stopping_rounds=EARLY_STOPPING_ROUNDS, callbacks=[cb], verbose_eval=False)
+    return {"trial": trial_id, **params,
+            "valid_rmse": float(bst.best_score), "best_iteration": int(bst.best_iteration),
+            "rounds": bst.num_boosted_rounds(), "pruned_at": cb.pruned_at,
+            "seconds": round(time.perf_counter() - t0, 3)}
+
+
+def tune_commodity(cfg, data_root=".", tune_dir=TUNE_DIR, n_trials=N_TRIALS, workers=1, threads=1,
+                   prune_every=PRUNE_EVERY, max_rounds=None, seed=42, cache_dir=CACHE_DIR,
+                   archive_dir=ARCHIVE_DIR, store_dir=STORE_DIR, pruned=False, spec_dir=SPEC_DIR) -> pd.DataFrame:
+    """
+    품목 1개 탐색. 반환: 시도 기록 DataFrame (valid_rmse 오름차순)
+    - 시도 0 은 현재 XGB_PARAMS (기준선), 나머지는 무작위 표본
+    - workers: 동시 시도 수 (스레드) / threads: 시도당 XGBoost 스레드
+    - pruned : 피처 사양의 컬럼만으로 탐색 (run_commodity(pruned=True) 와 같은 입력 → 함께 --tuned --pruned)
+    """
+    cfg = get_commodity(cfg)
+    tag = f"[{cfg.name}]"
+    t0 = time.perf_counter()
+    raw = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL, cache_dir=cache_dir)
+    feat = materialize(raw, TARGET_COL, store_path(store_dir, cfg) if store_dir else None, USE_YOY, cfg.ffill).feat
+    dtrain, dvalid = build_matrices(feat, select_feature_cols(feat, cfg, pruned, spec_dir), cfg)
+    t_build = time.perf_counter() - t0
+    print(f"{tag} 탐색 {n_trials}회 · 동시 {workers}개 × 스레드 {threads} · "
+          f"DMatrix {dtrain.num_row()}/{dvalid.num_row()}행 ({t_build:.2f}s, 1회)")
+
+    rng = np.random.default_rng(seed)
+    candidates = [{k: XGB_PARAMS[k] for k in TUNED_KEYS if k in XGB_PARAMS}]
+    candidates[0].setdefault("min_child_weight", 1.0)
+    candidates += [sample_params(rng) for _ in range(n_trials - 1)]
+    pruner = MedianPruner(every=prune_every)
+
+    def _one(i):
+        rec = run_trial(i, candidates[i], dtrain, dvalid, pruner, threads, max_rounds)
+        state = f"중단@{rec['pruned_at']}" if rec["pruned_at"] else f"best_it {rec['best_iteration']}"
+        print(f"{tag} #{i:03d} RMSE {rec['valid_rmse']:.1f} ({state}, {rec['seconds']:.1f}s)")
+        return rec
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        trials = pd.DataFrame(list(ex.map(_one, range(n_trials))))
+    trials = trials.sort_values("valid_rmse").reset_index(drop=True)
+
+    tune_dir = Path(tune_dir)
+    tune_dir.mkdir(parents=True, exist_ok=True)
+    trials.to_csv(tune_dir / f"{cfg.pref}_trials.csv", index=False, encoding="utf-8-sig")
+    best = {k: trials.at[0, k].item() for k in trials.columns if k in TUNED_KEYS}   # 열 dtype 유지 (max_depth 정수)
+    doc = {"commodity": cfg.name, "params": best,
+           "valid_rmse": float(trials.at[0, "valid_rmse"]), "best_iteration": int(trials.at[0, "best_iteration"]),
+           "baseline_rmse": float(trials.loc[trials["trial"] == 0, "valid_rmse"].iloc[0]),
+           "n_trials": n_trials, "n_pruned": int(trials["pruned_at"].notna().sum()),
+           "trial_seconds": float(trials["seconds"].sum()), "seconds": round(time.perf_counter() - t0, 2)}
+    (tune_dir / f"{cfg.pref}_best.json").write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+    print(f"{tag} 최적 RMSE {doc['valid_rmse']:.1f} (기준 {doc['baseline_rmse']:.1f}) · "
+          f"중단 {doc['n_pruned']}/{n_trials} · 시도 합 {doc['trial_seconds']:.0f}s / 전체 {doc['seconds']:.0f}s")
+    return trials
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m wholesale.tune", description="품목별 하이퍼파라미터 탐색")
+    ap.add_argument("items", nargs="*", help=f"품목 (기본: 전체 — {', '.join(COMMODITIES)})")
+    ap.add_argument("--trials", type=int, default=N_TRIALS)
+    ap.add_argument("--workers", type=int, default=1, help="동시 시도 수 (스레드)")
+    ap.add_argument("--threads", type=int, default=1, help="시도당 XGBoost 스레드")
+    ap.add_argument("--prune-every", type=int, default=PRUNE_EVERY, help="가지치기 판단 간격(라운드)")
+    ap.add_argument("--max-rounds", type=int, default=None, help="시도당 최대 라운드 (기본: XGB_PARAMS)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--data-root", default=".")
+    ap.add_argument("--tune-dir", default=str(TUNE_DIR))
+    ap.add_argument("--store-dir", default=str(STORE_DIR), help="품목별 피처 저장소 위치")
+    ap.add_argument("--pruned", action="store_true", help="피처 사양(가지치기된 컬럼)으로 탐색")
+    args = ap.parse_args(argv)
+
+    for name in args.items or COMMODITIES:
+        tune_commodity(name, data_root=args.data_root, tune_dir=args.tune_dir, n_trials=args.trials,
+                       workers=args.workers, threads=args.threads, prune_every=args.prune_every,
+                       max_rounds=args.max_rounds, seed=args.seed, store_dir=args.store_dir, pruned=args.pruned)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
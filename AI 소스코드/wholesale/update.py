@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+일일 증분 갱신 (저장 부스터에 라운드 이어 붙이기)
+- 새 레이블(학습 당시 마지막 일자 이후)로 드리프트 측정: 새 레이블 RMSE / 학습 당시 검증 RMSE
+- 드리프트 ≤ 임계 → 최근 UPDATE_WINDOW_DAYS 레이블로 UPDATE_ROUNDS 라운드만 추가 (xgb_model 이어 학습)
+- 드리프트 > 임계, 증분 횟수 초과, 산출물 없음/피처 불일치 → 전체 재학습 (run_commodity)
+- 드리프트 기준(검증 잔차)은 마지막 전체 재학습 때 값을 유지 → 증분이 쌓여도 기준이 흐려지지 않음
+- 이어 학습/재학습 모두 저장 모델의 학습 설정(탐색 파라미터, pruned, low_memory, engine)을 그대로 따름
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from .archive import load_commodity_raw
+from .artifacts import data_fingerprint, load_artifact, save_artifact
+from .config import (ARCHIVE_DIR, CACHE_DIR, DRIFT_THRESHOLD, FORECAST_END, MAX_UPDATES, MODEL_DIR,
+                     N_SCENARIOS, OUT_DIR, STORE_DIR, TARGET_COL, UPDATE_ROUNDS, UPDATE_WINDOW_DAYS, USE_YOY,
+                     XGB_PARAMS, get_commodity)
+from .feature_store import materialize, store_path
+from .features import feature_columns
+from .pipeline import forecast_future, run_commodity, sample_weights, save_future
+
+
+def _rmse(err) -> float:
+    err = np.asarray(err, dtype=float)
+    return float(np.sqrt(np.mean(err**2))) if len(err) else float("nan")
+
+
+def drift_ratio(model, X_new, y_new, base_residuals) -> float:
+    """새 레이블 RMSE / 기준(학습 당시 검증) RMSE. 기준이 없으면 NaN."""
+    base = _rmse(base_residuals)
+    if not np.isfinite(base) or base == 0 or len(X_new) == 0:
+        return float("nan")
+    return _rmse(np.asarray(y_new, dtype=float) - model.predict(X_new)) / base
+
+
+def continue_training(model, X, y, w, best_iteration=None, rounds=UPDATE_ROUNDS, n_jobs=None, params=None):
+    """
+    저장 부스터(best_iteration 까지) 위에 rounds 라운드를 이어 학습한 새 모델.
+    params: 저장 모델의 학습 파라미터(탐색 결과) — XGB_PARAMS 덮어쓰기 (fit_model 과 같음)
+    """
+    booster = model.get_booster()
+    if best_iteration is not None:
+        booster = booster[: int(best_iteration) + 1]   # 조기종료 이후 트리는 버림
+    params = {**XGB_PARAMS, **(params or {}), "n_estimators": rounds}
+    if n_jobs is not None:
+        params["n_jobs"] = n_jobs
+    m = xgb.XGBRegressor(**params)
+    m.fit(X, y, sample_weight=w, xgb_model=booster, verbose=False)
+    return m
+
+
+def update_commodity(cfg, data_root=".", out_dir=OUT_DIR, n_jobs=None, n_scenarios=N_SCENARIOS,
+                     cache_dir=CACHE_DIR, archive_dir=ARCHIVE_DIR, model_dir=MODEL_DIR,
+                     rounds=UPDATE_ROUNDS, drift_threshold=DRIFT_THRESHOLD, max_updates=MAX_UPDATES,
+                     store_dir=STORE_DIR) -> dict:
+    """
+    새 가격이 들어온 뒤의 갱신. 반환: 요약 dict (summary["update"]["action"]: none / boost / retrain)
+    - none   : 새 레이블 없음 → 저장 모델로 예측만
+    - boost  : 증분 라운드 추가 후 저장 + 예측
+    - retrain: 전체 재학습 (run_commodity, 백테스트 생략)
+    """
+    cfg = get_commodity(cfg)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    tag = f"[{cfg.name}]"
+    meta = {}   # 저장 모델의 학습 설정(pruned/tuned/low_memory/engine) → 재학습도 같은 설정
+
+    def _retrain(reason, drift=float("nan")):
+        print(f"{tag} 전체 재학습: {reason}")
+        summary = run_commodity(cfg, data_root=data_root, out_dir=out_dir, n_jobs=n_jobs, show=False,
+                                backtest=False, n_scenarios=n_scenarios, cache_dir=cache_dir,
+                                archive_dir=archive_dir, model_dir=model_dir, store_dir=store_dir,
+                                pruned=bool(meta.get("pruned")), tuned=bool(meta.get("tuned")),
+                                low_memory=bool(meta.get("low_memory")), engine=meta.get("engine"))
+        summary["update"] = {"action": "retrain", "reason": reason, "drift": drift}
+        return summary
+
+    try:
+        art = load_artifact(model_dir, cfg)
+    except (FileNotFoundError, ValueError) as e:
+        return _retrain(f"산출물 없음/불일치 ({e})")
+    meta = art.meta
+    pruned = bool(meta.get("pruned"))
+    if "data_end" not in art.meta:
+        return _retrain("산출물에 학습 데이터 끝 일자가 없음")
+
+    raw = load_commodity_raw(cfg, data_root, archive_dir, FORECAST_END, TARGET_COL,
+                             cache_dir=cache_dir, workers=n_jobs, engine=meta.get("engine"))
+    store = materialize(raw, TARGET_COL, store_path(store_dir, cfg) if store_dir else None, USE_YOY, cfg.ffill,
+                        backend="arrow" if meta.get("engine") == "arrow" else None)
+    feat = store.feat   # 저장소에서 새 일자 행만 계산
+    cols = feature_columns(feat, TARGET_COL)
+    if pruned:
+        cols = [c for c in cols if c in set(art.feature_cols)]
+    if cols != list(art.feature_cols):
+        return _retrain("피처 구성이 저장 모델과 다름")
+
+    data_end = pd.Timestamp(art.meta["data_end"])
+    labeled = feat[feat["y"].notna()].dropna(subset=art.feature_cols + ["y"])
+    new = labeled[labeled["date"] > data_end]
+    n_updates = int(art.meta.get("n_updates", 0))
+    model = art.model
+
+    if new.empty:
+        print(f"{tag} 새 레이블 없음 → 저장 모델로 예측만")
+        update = {"action": "none", "new_rows": 0}
+    else:
+        drift = drift_ratio(model, new[art.feature_cols], new["y"], art.residuals)
+        print(f"{tag} 새 레이블 {len(new)}행 · 드리프트 {drift:.2f} (임계 {drift_threshold})")
+        if not np.isfinite(drift):
+            return _retrain("드리프트 기준(검증 잔차) 없음")
+        if drift > drift_threshold:
+            return _retrain(f"드리프트 {drift:.2f} > {drift_threshold}", drift)
+        if n_updates >= max_updates:
+            return _retrain(f"증분 갱신 {n_updates}회 누적 (상한 {max_updates})", drift)
+
+        new_end = new["date"].max()
+        window = labeled[labeled["date"] > new_end - pd.Timedelta(days=UPDATE_WINDOW_DAYS)]
+        w = sample_weights(window["date"], cfg.dw_periods)
+        model = continue_training(model, window[art.feature_cols], window["y"], w,
+                                  best_iteration=art.meta.get("best_iteration"), rounds=rounds, n_jobs=n_jobs,
+                                  params=art.meta.get("tuned_params"))
+        # 분위 모델은 증분 대상이 아님 (전체 재학습 때 갱신) → 그대로 유지
+        save_artifact(model_dir, cfg, model, art.feature_cols, art.fill_values, data_fingerprint(raw, TARGET_COL),
+                      residuals=art.residuals, quantile_model=art.quantile_model, quantiles=art.quantiles,
+                      data_end=str(new_end.date()), train_end=str(new_end.date()),   # 이어 학습 → 새 레이블까지 표본 내
+                      valid_start=meta.get("valid_start"), valid_end=meta.get("valid_end"),
+                      n_updates=n_updates + 1, pruned=pruned, tuned=bool(meta.get("tuned")),
+                      tuned_params=meta.get("tuned_params"), low_memory=bool(meta.get("low_memory")),
+                      engine=meta.get("engine"),
+                      trained_rows=art.meta.get("trained_rows"), valid_rows=art.meta.get("valid_rows"))
+        print(f"{tag} 증분 갱신: 최근 {len(window)}행으로 +{rounds} 라운드 (누적 {n_updates + 1}회)")
+        update = {"action": "boost", "new_rows": len(new), "drift": drift, "rounds": rounds,
+                  "n_updates": n_updates + 1}
+
+    future_df, bands_df = forecast_future(model, raw, art.feature_cols, art.fill_values, cfg,
+                                          residuals=art.residuals, n_scenarios=n_scenarios,
+                                          quantile_model=art.quantile_model, quantiles=art.quantiles, store=store)
+    paths = save_future(cfg, future_df, bands_df, out_dir)
+    for label, path in zip(("예측", "밴드"), paths):
+        print(f"[저장] {label} CSV : {path}")
+    return {"name": cfg.name, "outputs": [str(p) for p in paths], "update": update,
+            "seconds": round(time.perf_counter() - t0, 2)}
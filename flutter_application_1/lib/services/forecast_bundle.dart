@@ -0,0 +1,72 @@
+import 'dart:convert';
+import 'dart:typed_data';
+
+/// 예측 번들 디코더 (`python -m wholesale.bundle` 이 만든 forecast_bundle.bin).
+/// 형식(리틀 엔디언): 헤더 24바이트 + 품목별 [이름, 열 이름들, 열마다 int32 델타 × 일수].
+/// 값 복원은 열마다 누적합 1회 → 저사양 폰에서도 CSV 파싱보다 가볍다.
+class ForecastBundle {
+  ForecastBundle({required this.version, required this.dates, required this.items});
+
+  static const magic = 'WSFB';
+  static const supportedVersion = 1;
+  static const headerSize = 24;
+
+  final int version;
+  final List<DateTime> dates;
+  /// 품목명 → 열 이름 → 일자별 값 (dates 와 같은 길이)
+  final Map<String, Map<String, List<double>>> items;
+
+  factory ForecastBundle.decode(Uint8List bytes) {
+    if (bytes.length < headerSize) {
+      throw const FormatException('bundle: 헤더보다 짧습니다.');
+    }
+    final bd = ByteData.sublistView(bytes);
+    if (ascii.decode(bytes.sublist(0, 4)) != magic) {
+      throw const FormatException('bundle: 매직 불일치');
+    }
+    final version = bd.getUint16(4, Endian.little);
+    if (version != supportedVersion) {
+      throw FormatException('bundle: 지원하지 않는 버전 $version (지원: $supportedVersion)');
+    }
+    final startDays = bd.getInt32(8, Endian.little);
+    final stride = bd.getUint16(12, Endian.little);
+    final nDays = bd.getUint16(14, Endian.little);
+    final nItems = bd.getUint16(16, Endian.little);
+    final scale = bd.getUint16(18, Endian.little);
+    final bodyLen = bd.getUint32(20, Endian.little);
+    if (bytes.length < headerSize + bodyLen) {
+      throw const FormatException('bundle: 본문이 잘렸습니다.');
+    }
+
+    final start = DateTime.utc(1970, 1, 1).add(Duration(days: startDays));
+    final dates = [for (var i = 0; i < nDays; i++) start.add(Duration(days: i * stride))];
+
+    var pos = headerSize;
+    String readStr() {
+      final n = bytes[pos];
+      final s = utf8.decode(bytes.sublist(pos + 1, pos + 1 + n));
+      pos += 1 + n;
+      return s;
+    }
+
+    final items = <String, Map<String, List<double>>>{};
+    for (var k = 0; k < nItems; k++) {
+      final name = readStr();
+      final nCols = bytes[pos++];
+      final cols = [for (var j = 0; j < nCols; j++) readStr()];
+      final series = <String, List<double>>{};
+      for (final c in cols) {
+        final values = List<double>.filled(nDays, 0);
+        var acc = 0;
+        for (var i = 0; i < nDays; i++) {
+          acc += bd.getInt32(pos, Endian.little);
+          pos += 4;
+          values[i] = acc / scale;
+        }
+        series[c] = values;
+      }
+      items[name] = series;
+    }
+    return ForecastBundle(version: version, dates: dates, items: items);
+  }
+}
@@ -1 +1,111 @@
-// (deleted)
\ No newline at end of file
+import 'dart:convert';
+import 'package:http/http.dart' as http;
+
+/// 로컬 예측 API(`python -m wholesale.serve`) 클라이언트.
+/// 서버 주소(dart-define)
+///   FORECAST_API_URL : 기본 http://127.0.0.1:8765 (안드로이드 에뮬레이터는 http://10.0.2.2:8765)
+/// 사용 예)
+/// flutter run --dart-define=FORECAST_API_URL=http://10.0.2.2:8765
+class MarketApiService {
+  MarketApiService({http.Client? client, String? baseUrl})
+      : _client = client ?? http.Client(),
+        baseUrl = baseUrl ?? (_baseEnv.isNotEmpty ? _baseEnv : 'http://127.0.0.1:8765');
+  final http.Client _client;
+  final String baseUrl;
+
+  static const _baseEnv = String.fromEnvironment('FORECAST_API_URL');
+
+  // 요청 URL → (ETag, 응답). 서버가 304 를 주면 저장본 재사용.
+  final Map<String, _Cached> _cache = {};
+
+  /// 서버가 제공하는 품목 목록 (예측 가능한 것만).
+  Future<List<String>> commodities() async {
+    final json = await _getJson(Uri.parse('$baseUrl/commodities'));
+    return [
+      for (final c in (json['commodities'] as List).cast<Map<String, dynamic>>())
+        if (c['available'] == true) c['name'] as String,
+    ];
+  }
+
+  /// 품목 일별 예측. item 은 앱 표기('감자(수미)')도 그대로 사용 가능.
+  Future<CommodityForecast> forecast(String item, {DateTime? start, DateTime? end}) async {
+    final qp = <String, String>{
+      if (start != null) 'start': _ymd(start),
+      if (end != null) 'end': _ymd(end),
+    };
+    final uri = Uri.parse('$baseUrl/forecast/${Uri.encodeComponent(item)}')
+        .replace(queryParameters: qp.isEmpty ? null : qp);
+    return CommodityForecast.fromJson(await _getJson(uri));
+  }
+
+  Future<Map<String, dynamic>> _getJson(Uri uri) async {
+    final key = uri.toString();
+    final cached = _cache[key];
+    final res = await _client.get(uri, headers: {
+      if (cached != null) 'If-None-Match': cached.etag,
+    }).timeout(const Duration(seconds: 10));
+    if (res.statusCode == 304 && cached != null) return cached.json;
+    final body = utf8.decode(res.bodyBytes);
+    if (res.statusCode != 200) {
+      String msg = body;
+      try {
+        msg = (jsonDecode(body) as Map<String, dynamic>)['error']?.toString() ?? body;
+      } catch (_) {}
+      throw Exception('예측 API 오류 ${res.statusCode}: $msg');
+    }
+    final json = jsonDecode(body) as Map<String, dynamic>;
+    final etag = res.headers['etag'];
+    if (etag != null) _cache[key] = _Cached(etag, json);
+    return json;
+  }
+
+  static String _ymd(DateTime d) =>
+      '${d.year.toString().padLeft(4, '0')}-${d.month.toString().padLeft(2, '0')}-${d.day.toString().padLeft(2, '0')}';
+
+  void close() => _client.close();
+}
+
+class _Cached {
+  _Cached(this.etag, this.json);
+  final String etag;
+  final Map<String, dynamic> json;
+}
+
+/// 예측 1일치 (p10/p50/p90 은 분위 모델이 있을 때만).
+class ForecastPoint {
+  ForecastPoint({required this.date, required this.pred, this.predMa7, this.p10, this.p50, this.p90});
+  final DateTime date;
+  final double pred;
+  final double? predMa7;
+  final double? p10;
+  final double? p50;
+  final double? p90;
+
+  static double? _num(dynamic v) => v == null ? null : (v as num).toDouble();
+
+  factory ForecastPoint.fromJson(Map<String, dynamic> j) => ForecastPoint(
+        date: DateTime.parse(j['date'] as String),
+        pred: (j['pred'] as num).toDouble(),
+        predMa7: _num(j['pred_ma7']),
+        p10: _num(j['pred_p10']),
+        p50: _num(j['pred_p50']),
+        p90: _num(j['pred_p90']),
+      );
+}
+
+class CommodityForecast {
+  CommodityForecast({required this.commodity, required this.dataEnd, required this.version, required this.points});
+  final String commodity;
+  final DateTime dataEnd;   // 마지막 실측일
+  final String version;     // 모델/데이터가 바뀌면 달라짐
+  final List<ForecastPoint> points;
+
+  factory CommodityForecast.fromJson(Map<String, dynamic> j) => CommodityForecast(
+        commodity: j['commodity'] as String,
+        dataEnd: DateTime.parse(j['data_end'] as String),
+        version: j['version'] as String,
+        points: [
+          for (final r in (j['rows'] as List).cast<Map<String, dynamic>>()) ForecastPoint.fromJson(r),
+        ],
+      );
+}
@@ -0,0 +1,34 @@
+import 'dart:convert';
+
+import 'package:flutter_application_1/services/forecast_bundle.dart';
+import 'package:flutter_test/flutter_test.dart';
+
+// wholesale.bundle.encode_bundle 로 만든 참조 번들 (2025-09-13부터 4일, 양파 3열 + 감자 1열)
+const _golden =
+    'V1NGQgEAAAB4TwAAAQAEAAIAAQBsAAAABuyWke2MjAMEcHJlZAhwcmVkX21hNwhwcmVkX3AxMJg6AADt////5QAAAEb7//+YOgAA9v///0oAAAD2/v//KCMAAGQAAAA4////nP///wbqsJDsnpABBHByZWQHmwAAXf7//9wCAACg+P//';
+
+void main() {
+  test('decodes reference bundle', () {
+    final b = ForecastBundle.decode(base64Decode(_golden));
+    expect(b.version, 1);
+    expect(b.dates.first, DateTime.utc(2025, 9, 13));
+    expect(b.dates.last, DateTime.utc(2025, 9, 16));
+    expect(b.items.keys, ['양파', '감자']);
+    expect(b.items['양파']!.keys, ['pred', 'pred_ma7', 'pred_p10']);
+    expect(b.items['양파']!['pred'], [15000, 14981, 15210, 14000]);
+    expect(b.items['양파']!['pred_ma7'], [15000, 14990, 15064, 14798]);
+    expect(b.items['양파']!['pred_p10'], [9000, 9100, 8900, 8800]);
+    expect(b.items['감자']!['pred'], [39687, 39268, 40000, 38112]);
+  });
+
+  test('rejects unknown version', () {
+    final bytes = base64Decode(_golden);
+    bytes[4] = 2;
+    expect(() => ForecastBundle.decode(bytes), throwsFormatException);
+  });
+
+  test('rejects truncated body', () {
+    final bytes = base64Decode(_golden);
+    expect(() => ForecastBundle.decode(bytes.sublist(0, bytes.length - 4)), throwsFormatException);
+  });
+}